@@ -1,15 +1,27 @@
+import copy
+from collections import defaultdict
+from datetime import timedelta
+
 from django import forms
 from django.apps import apps
+from django.conf import settings
 from django.contrib import admin, messages
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.templatetags import admin_list
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
 from django.core.exceptions import PermissionDenied
+from django.core.paginator import InvalidPage
 from django.db import transaction
-from django.http import Http404, HttpResponseRedirect
+from django.db.models import OuterRef, Q
+from django.http import Http404, HttpResponseBadRequest, HttpResponseRedirect, JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.template.loader import render_to_string
 from django.urls import re_path, reverse
 from django.utils.html import format_html, format_html_join
+from django.utils.http import urlencode
 from django.utils.translation import gettext, gettext_lazy as _, ngettext
 
 from cms.toolbar.utils import get_object_preview_url
@@ -29,6 +41,7 @@ from .admin_actions import (
     resubmit_selected,
 )
 from .emails import notify_collection_author, notify_collection_moderators
+from .exceptions import AlreadyActioned
 from .filters import ModeratorFilter, ReviewerFilter
 from .forms import (
     CollectionCommentForm,
@@ -36,7 +49,8 @@ from .forms import (
     RequestCommentForm,
     WorkflowStepInlineFormSet,
 )
-from .helpers import get_form_submission_for_step
+from .helpers import annotate_comment_stats, get_form_submission_for_step
+from .instrumentation import instrument
 from .models import (
     CollectionComment,
     ConfirmationFormSubmission,
@@ -48,8 +62,11 @@ from .models import (
     RequestComment,
     Role,
     Workflow,
+    WorkflowRollup,
     WorkflowStep,
+    WorkflowStepRollup,
 )
+from .templatetags.moderation_treebeard import TREEBEARD_NEW_ADMIN_TREE
 
 
 from . import conf  # isort:skip
@@ -59,6 +76,295 @@ from . import views  # isort:skip
 User = get_user_model()
 
 
+def _get_tree_nodes(ids):
+    # Without the root nodes of the collections, which have no request
+    return ModerationRequestTreeNode.objects.filter(
+        pk__in=ids, moderation_request__isnull=False
+    )
+
+
+def _iter_selected_tree_nodes(request):
+    """
+    Yields the tree nodes selected for a bulk view in the order of their ids,
+    loading them from the database in chunks so large selections don't end
+    up in one huge query
+    """
+    selected_ids = utils.get_selected_ids(request)
+    for ids in utils.chunked(selected_ids, conf.SELECTION_CHUNK_SIZE):
+        yield from _get_tree_nodes(ids).select_related(
+            "moderation_request__version"
+        ).order_by("pk")
+
+
+class SelectedModerationRequests:
+    """
+    The moderation requests of the tree nodes selected for a bulk view.
+    Unlike a generator it can be iterated more than once, like a queryset,
+    and each iteration loads the nodes in chunks again
+    """
+
+    def __init__(self, request):
+        self.request = request
+
+    def __iter__(self):
+        for node in _iter_selected_tree_nodes(self.request):
+            yield node.moderation_request
+
+    def __len__(self):
+        selected_ids = utils.get_selected_ids(self.request)
+        return sum(
+            _get_tree_nodes(ids).count()
+            for ids in utils.chunked(selected_ids, conf.SELECTION_CHUNK_SIZE)
+        )
+
+
+def _message_already_actioned(request, count):
+    """
+    Tells the user about the requests which were actioned, by another user or
+    through another selected node, since the bulk view checked them
+    """
+    if count:
+        messages.warning(
+            request,
+            ngettext(
+                "%(count)d request was already actioned",
+                "%(count)d requests were already actioned",
+                count,
+            )
+            % {"count": count},
+        )
+
+
+CURSOR_VAR = "after"
+
+
+class CursorChangeList(ChangeList):
+    """
+    Change list paginated on the primary key (keyset pagination) instead of
+    page numbers, so long lists neither count their rows nor skip over them
+    with OFFSET. The results are in the order they were created.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        try:
+            self.cursor = int(request.GET.get(CURSOR_VAR, 0))
+        except ValueError:
+            self.cursor = 0
+        super().__init__(request, *args, **kwargs)
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_results(self, request):
+        per_page = self.list_per_page
+        results = list(
+            self.queryset.filter(pk__gt=self.cursor).order_by("pk")[:per_page + 1]
+        )
+        self.result_list = results[:per_page]
+        self.result_count = self.full_result_count = len(self.result_list)
+        self.show_full_result_count = False
+        self.show_admin_actions = bool(self.result_list)
+        self.can_show_all = False
+        self.multi_page = len(results) > per_page or bool(self.cursor)
+        self.paginator = None
+        self.next_url = None
+        if len(results) > per_page:
+            self.next_url = self.get_query_string({CURSOR_VAR: self.result_list[-1].pk})
+        self.first_url = self.get_query_string(remove=[CURSOR_VAR]) if self.cursor else None
+
+
+PARENT_VAR = "parent"
+COLLECTION_VAR = "moderation_request__collection__id"
+
+
+class TreeChangeList(ChangeList):
+    """
+    Change list of the tree of a collection. It lists the first
+    ``CMS_MODERATION_TREE_LEVELS`` levels of the tree, paginated by the
+    requests at the top of the tree, or, with the path of a node as
+    `parent`, the children of that node, whose rows are loaded when the node
+    is expanded. Searched or filtered by more than the collection, it lists
+    the matching nodes flat, wherever they are in the tree. The queryset of
+    the actions is the whole tree.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.parent_node = None
+        self.flat = False
+        parent_path = request.GET.get(PARENT_VAR)
+        if parent_path:
+            self.parent_node = get_object_or_404(ModerationRequestTreeNode, path=parent_path)
+        super().__init__(request, *args, **kwargs)
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(PARENT_VAR, None)
+        return lookup_params
+
+    def is_filtered(self):
+        """
+        Whether the tree is searched or filtered by more than the collection
+        """
+        return bool(self.query) or set(self.get_filters_params()) != {COLLECTION_VAR}
+
+    def get_results(self, request):
+        if self.parent_node is not None:
+            self.loaded_depth = self.parent_node.depth + 1
+            self.result_list = list(
+                self.queryset.filter(
+                    depth=self.loaded_depth, path__startswith=self.parent_node.path
+                )
+            )
+            self.result_count = self.full_result_count = len(self.result_list)
+            self.show_full_result_count = False
+            self.show_admin_actions = bool(self.result_list)
+            self.can_show_all = False
+            self.multi_page = False
+            self.paginator = None
+            return
+
+        # The requests at the top of the tree are one level below the root
+        # node of the collection. The changelist of treebeard < 4.8 can't
+        # load children.
+        self.loaded_depth = None
+        if conf.TREE_LEVELS is not None and TREEBEARD_NEW_ADMIN_TREE:
+            self.loaded_depth = conf.TREE_LEVELS + 1
+
+        # Pages hold whole subtrees: the requests at the top of the tree are
+        # paginated, and the descendants of a page are fetched at once. In
+        # the order of the tree, their paths sort between the path of the
+        # first request of the page and the paths below its last one. The
+        # nodes matching a search or a filter are paginated flat, as their
+        # parents may not match.
+        self.flat = self.is_filtered()
+        if self.flat:
+            self.loaded_depth = None
+            roots = self.queryset
+        else:
+            roots = self.queryset.filter(depth=2)
+        paginator = self.model_admin.get_paginator(request, roots, self.list_per_page)
+        paginator.count = self.get_root_count(request, roots)
+        can_show_all = paginator.count <= self.list_max_show_all
+        multi_page = paginator.count > self.list_per_page
+        if (self.show_all and can_show_all) or not multi_page:
+            result_list = list(roots)
+        else:
+            try:
+                result_list = list(paginator.page(self.page_num).object_list)
+            except InvalidPage:
+                raise IncorrectLookupParameters
+        if result_list and not self.flat and (self.loaded_depth is None or self.loaded_depth > 2):
+            if self.queryset.query.order_by[:1] == ("path",):
+                max_length = ModerationRequestTreeNode._meta.get_field("path").max_length
+                last_path = result_list[-1].path
+                lookup = Q(path__range=(
+                    result_list[0].path,
+                    last_path + ModerationRequestTreeNode.alphabet[-1] * (max_length - len(last_path)),
+                ))
+            else:
+                # Sorted by a column, the requests of the page are spread
+                # over the tree
+                lookup = Q()
+                for root in result_list:
+                    lookup |= Q(path__startswith=root.path)
+            descendants = self.queryset.filter(lookup, depth__gt=2).order_by("path")
+            if self.loaded_depth is not None:
+                descendants = descendants.filter(depth__lte=self.loaded_depth)
+            subtrees = defaultdict(list)
+            for node in descendants:
+                subtrees[node.path[:2 * node.steplen]].append(node)
+            result_list = [node for root in result_list for node in (root, *subtrees[root.path])]
+
+        self.result_count = paginator.count
+        # The unfiltered count would count the nodes of every collection
+        self.show_full_result_count = False
+        self.full_result_count = None
+        self.show_admin_actions = True
+        self.result_list = result_list
+        self.can_show_all = can_show_all
+        self.multi_page = multi_page
+        self.paginator = paginator
+
+    def get_root_count(self, request, roots):
+        """
+        Number of the requests at the top of the tree, or of the nodes listed
+        flat. Without other filters
+        than the collection, it is cached under the generation of the
+        collection, which is bumped when requests are added or removed.
+        """
+        collection = getattr(request, "_collection", None)
+        if collection is None or self.is_filtered():
+            return roots.count()
+        key = f"djangocms_moderation:tree_roots:{collection.pk}:{collection.generation}"
+        cache = caches[conf.TREE_COUNT_CACHE]
+        count = cache.get(key)
+        if count is None:
+            count = roots.count()
+            cache.set(key, count, conf.TREE_COUNT_CACHE_TIMEOUT)
+        return count
+
+    def get_tree_context(self):
+        """
+        Version of treebeard's ``tree_context`` for the tree of a collection:
+        the requests at the top of the tree are shown as roots, one level
+        above their depth below the root node of the collection, and the
+        parents are found among the listed nodes rather than with a query
+        per node. The rows tell whether their children are listed, and
+        their paths to load the children which are not. The nodes listed
+        flat are all shown as roots without children.
+        """
+        node_ids = {obj.path: obj.pk for obj in self.result_list}
+        if self.parent_node is not None:
+            node_ids[self.parent_node.path] = self.parent_node.pk
+        context = []
+        for obj in self.result_list:
+            if self.flat:
+                context.append({
+                    "node-id": str(obj.pk),
+                    "parent-id": 0,
+                    "level": 1,
+                    "has-children": 0,
+                    "children-loaded": 1,
+                    "path": obj.path,
+                })
+                continue
+            parent_path = obj.path[:-obj.steplen]
+            if obj.depth <= 2:
+                parent_id = 0
+            elif parent_path in node_ids:
+                parent_id = node_ids[parent_path]
+            else:
+                parent_id = obj.get_parent().pk
+            context.append({
+                "node-id": str(obj.pk),
+                "parent-id": parent_id,
+                "level": obj.get_depth() - 1,
+                "has-children": int(not obj.is_leaf()),
+                "children-loaded": int(self.loaded_depth is None or obj.depth < self.loaded_depth),
+                "path": obj.path,
+            })
+        return context
+
+
+class SettingsChoicesMixin:
+    """
+    Gives the form fields of the model fields named in `get_settings_choices`
+    their choices. These come from the settings, so they are not part of the
+    model fields and their migrations.
+    """
+    def get_settings_choices(self):
+        return {}
+
+    def formfield_for_dbfield(self, db_field, request, **kwargs):
+        choices = self.get_settings_choices().get(db_field.name)
+        if choices is not None:
+            db_field = copy.copy(db_field)
+            db_field.choices = choices
+        return super().formfield_for_dbfield(db_field, request, **kwargs)
+
+
 class ModerationRequestActionInline(admin.TabularInline):
     model = ModerationRequestAction
     form = ModerationRequestActionInlineForm
@@ -66,12 +372,27 @@ class ModerationRequestActionInline(admin.TabularInline):
     verbose_name = _("Action")
     verbose_name_plural = _("Actions")
 
-    def has_add_permission(self, request):
+    def has_add_permission(self, request, obj=None):
         return False
 
     def has_delete_permission(self, request, obj=None):
         return False
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            "by_user", "to_user", "step_approved__role"
+        )
+
+    def get_formset(self, request, obj=None, **kwargs):
+        # Load the form submissions of all the steps at once, rather than
+        # one query per action in `form_submission`
+        self._form_submissions = {}
+        if obj is not None:
+            self._form_submissions = {
+                submission.for_step_id: submission for submission in obj.form_submissions.all()
+            }
+        return super().get_formset(request, obj, **kwargs)
+
     @admin.display(
         description=_("Status")
     )
@@ -83,9 +404,14 @@ class ModerationRequestActionInline(admin.TabularInline):
         description=_("Form Submission")
     )
     def form_submission(self, obj):
-        instance = get_form_submission_for_step(
-            obj.moderation_request, obj.step_approved
-        )
+        if not obj.step_approved_id:
+            return ""
+        if hasattr(self, "_form_submissions"):
+            instance = self._form_submissions.get(obj.step_approved_id)
+        else:
+            instance = get_form_submission_for_step(
+                obj.moderation_request, obj.step_approved
+            )
 
         if not instance:
             return ""
@@ -100,7 +426,15 @@ class ModerationRequestActionInline(admin.TabularInline):
         )
 
     def get_readonly_fields(self, request, obj=None):
-        if obj.user_can_moderate(request.user) or obj.user_is_author(request.user):
+        # The admin asks for the readonly fields several times per request,
+        # and checking the reviewers takes a query per workflow step
+        can_edit_messages = getattr(request, "_moderation_can_edit_messages", {})
+        if obj.pk not in can_edit_messages:
+            can_edit_messages[obj.pk] = (
+                obj.user_can_moderate(request.user) or obj.user_is_author(request.user)
+            )
+            request._moderation_can_edit_messages = can_edit_messages
+        if can_edit_messages[obj.pk]:
             # Omit 'message' from readonly_fields when current user is a reviewer
             # or an author. This disallows a non-participant from
             # adding or editing comments on action objects
@@ -120,11 +454,15 @@ class ModerationRequestTreeAdmin(TreeAdmin):
             "admin/js/jquery.init.js",
             "djangocms_moderation/js/actions.js",
             "djangocms_moderation/js/burger.js",
+            "djangocms_moderation/js/tree.js",
         )
         css = {
             "all": ("djangocms_moderation/css/actions.css", "djangocms_moderation/css/burger.css")
         }
 
+    # Parents before their children
+    ordering = ("path",)
+    search_fields = ("moderation_request__title",)
     actions = [  # filtered out in `self.get_actions`
         delete_selected,
         publish_selected,
@@ -148,6 +486,16 @@ class ModerationRequestTreeAdmin(TreeAdmin):
         """
         return False
 
+    def get_queryset(self, request):
+        # Without the root nodes of the collections, which have no request
+        queryset = super().get_queryset(request).filter(depth__gt=1)
+        if conf.REQUEST_COMMENTS_ENABLED:
+            queryset = annotate_comment_stats(
+                queryset,
+                RequestComment.objects.filter(moderation_request=OuterRef("moderation_request")),
+            )
+        return queryset
+
     def lookup_allowed(self, lookup, value, request=None):
         if lookup in ('moderation_request__collection__id',):
             return True
@@ -162,8 +510,16 @@ class ModerationRequestTreeAdmin(TreeAdmin):
                 self.admin_site.admin_view(self.delete_selected_view),
                 name='{}_{}_delete'.format(*info),
             ),
+            re_path(
+                r'^children/$',
+                self.admin_site.admin_view(self.children_view),
+                name='{}_{}_children'.format(*info),
+            ),
         ] + super().get_urls()
 
+    def get_changelist(self, request, **kwargs):
+        return TreeChangeList
+
     def get_list_display(self, request):
         additional_fields = self._get_configured_fields(request)
         list_display = [
@@ -227,18 +583,18 @@ class ModerationRequestTreeAdmin(TreeAdmin):
         )
 
     @admin.display(
-        description=_('Content type')
+        description=_('Content type'),
+        ordering='moderation_request__content_type',
     )
     def get_content_type(self, obj):
-        return ContentType.objects.get_for_model(
-            obj.moderation_request.version.versionable.grouper_model
-        )
+        return ContentType.objects.get_for_id(obj.moderation_request.content_type_id)
 
     @admin.display(
-        description=_('Title')
+        description=_('Title'),
+        ordering='moderation_request__title',
     )
     def get_title(self, obj):
-        return obj.moderation_request.version.content
+        return obj.moderation_request.title
 
     @admin.display(
         description=_('Author')
@@ -251,7 +607,12 @@ class ModerationRequestTreeAdmin(TreeAdmin):
     )
     def get_preview_link(self, obj):
         content = obj.moderation_request.version.content
-        if is_editable_model(content.__class__):
+        if is_editable_model(content.__class__) and conf.PREVIEW_SNAPSHOTS:
+            object_preview_url = reverse(
+                "admin:cms_moderation_preview_snapshot",
+                args=(obj.moderation_request.version_id,),
+            )
+        elif is_editable_model(content.__class__):
             object_preview_url = get_object_preview_url(content)
         else:
             object_preview_url = reverse(
@@ -311,10 +672,15 @@ class ModerationRequestTreeAdmin(TreeAdmin):
         comments_endpoint = format_html(
             "{}?moderation_request__id__exact={}",
             reverse("admin:djangocms_moderation_requestcomment_changelist"),
-            obj.moderation_request.id,
+            obj.moderation_request_id,
         )
         return render_to_string(
-            "djangocms_moderation/comment_icon.html", {"url": comments_endpoint}
+            "djangocms_moderation/comment_icon.html",
+            {
+                "url": comments_endpoint,
+                "count": getattr(obj, "comment_count", None),
+                "last_comment_date": getattr(obj, "last_comment_date", None),
+            },
         )
 
     def get_actions(self, request):
@@ -375,6 +741,7 @@ class ModerationRequestTreeAdmin(TreeAdmin):
 
         return {key: value for key, value in actions.items() if key in actions_to_keep}
 
+    @instrument("ModerationRequestTreeAdmin.changelist_view")
     def changelist_view(self, request, extra_context=None):
         # If we filter by a specific collection, we want to add this collection
         # to the context
@@ -389,7 +756,13 @@ class ModerationRequestTreeAdmin(TreeAdmin):
         except (ValueError, ModerationCollection.DoesNotExist):
             pass
         else:
-            extra_context = dict(collection=collection)
+            extra_context = dict(
+                collection=collection,
+                tree_children_url="{}?{}".format(
+                    reverse('admin:djangocms_moderation_moderationrequesttreenode_children'),
+                    urlencode({'moderation_request__collection__id': collection.pk}),
+                ),
+            )
             if collection.is_cancellable(request.user):
                 cancel_collection_url = reverse(
                     'admin:cms_moderation_cancel_collection',
@@ -406,6 +779,33 @@ class ModerationRequestTreeAdmin(TreeAdmin):
 
         return super().changelist_view(request, extra_context)
 
+    @instrument("ModerationRequestTreeAdmin.children_view")
+    def children_view(self, request):
+        """
+        Rows of the children of the node `parent` in the tree of the
+        collection, with their tree context, for the nodes expanded in the
+        changelist
+        """
+        if not self.has_view_or_change_permission(request):
+            raise PermissionDenied
+        if not request.GET.get(PARENT_VAR):
+            return HttpResponseBadRequest("Pass the path of the parent node")
+        request._collection = get_object_or_404(
+            ModerationCollection, pk=request.GET.get('moderation_request__collection__id', '')
+        )
+        try:
+            cl = self.get_changelist_instance(request)
+        except IncorrectLookupParameters:
+            return HttpResponseBadRequest("Invalid filters")
+        # The tree is not editable in the changelist
+        cl.formset = None
+        rows = [
+            {**context, "html": format_html("<tr>{}</tr>", format_html_join("", "{}", ((item,) for item in items)))}
+            for context, items in zip(cl.get_tree_context(), admin_list.results(cl))
+        ]
+        return JsonResponse({"rows": rows})
+
+    @instrument("ModerationRequestTreeAdmin.delete_selected_view")
     @transaction.atomic
     def delete_selected_view(self, request):
         if not self.has_delete_permission(request):
@@ -422,17 +822,15 @@ class ModerationRequestTreeAdmin(TreeAdmin):
 
         # For each moderation request id, if one has a tree structure attached go through each one and remove that!
         # Get all of the nodes selected to delete
-        queryset = ModerationRequestTreeNode.objects.filter(pk__in=request.GET.get('ids', '').split(','))
-
         def _traverse_moderation_nodes(node_item):
-            moderation_requests_affected.append(node_item.moderation_request.pk)
+            moderation_requests_affected.append(node_item.moderation_request_id)
 
             # Recurse over children if they exist
             children = node_item.get_children()
             for child in children:
                 _traverse_moderation_nodes(child)
 
-        for node in queryset.all():
+        for node in _iter_selected_tree_nodes(request):
             _traverse_moderation_nodes(node)
 
         queryset = ModerationRequest.objects.filter(pk__in=moderation_requests_affected)
@@ -444,7 +842,6 @@ class ModerationRequestTreeAdmin(TreeAdmin):
 
         if request.method != 'POST':
             context = dict(
-                ids=request.GET.getlist('ids'),
                 back_url=redirect_url,
                 queryset=queryset,
             )
@@ -465,6 +862,7 @@ class ModerationRequestTreeAdmin(TreeAdmin):
                 )
 
             queryset.delete()
+            ModerationCollection.objects.filter(pk=collection.pk).touch()
             messages.success(
                 request,
                 ngettext(
@@ -481,12 +879,15 @@ class ModerationRequestTreeAdmin(TreeAdmin):
 
 
 @admin.register(ModerationRequest)
-class ModerationRequestAdmin(admin.ModelAdmin):
+class ModerationRequestAdmin(SettingsChoicesMixin, admin.ModelAdmin):
     class Media:
         js = ('admin/js/jquery.init.js', 'djangocms_moderation/js/actions.js',)
 
     inlines = [ModerationRequestActionInline]
 
+    def get_settings_choices(self):
+        return {"language": settings.LANGUAGES}
+
     def _redirect_to_changeview_url(self, collection_id):
         """
         An internal private helper that generates a return url to this models changeview.
@@ -545,21 +946,17 @@ class ModerationRequestAdmin(admin.ModelAdmin):
         ] + super().get_urls()
 
     def _get_selected_tree_nodes(self, request):
-        treenodes = ModerationRequestTreeNode.objects.filter(
-            pk__in=request.GET.get('ids', '').split(',')
-        ).select_related('moderation_request')
-        return treenodes
+        return _iter_selected_tree_nodes(request)
 
     def _custom_view_context(self, request):
-        treenodes = self._get_selected_tree_nodes(request)
         collection_id = request.GET.get('collection_id')
         redirect_url = self._redirect_to_changeview_url(collection_id)
         return dict(
-            ids=request.GET.getlist("ids"),
             back_url=redirect_url,
-            queryset=[n.moderation_request for n in treenodes]
+            queryset=SelectedModerationRequests(request),
         )
 
+    @instrument("ModerationRequestAdmin.resubmit_view")
     def resubmit_view(self, request):
         collection_id = request.GET.get('collection_id')
         treenodes = self._get_selected_tree_nodes(request)
@@ -582,14 +979,19 @@ class ModerationRequestAdmin(admin.ModelAdmin):
             )
         else:
             resubmitted_requests = []
+            lost_races = 0
 
-            for node in treenodes.all():
+            for node in treenodes:
                 mr = node.moderation_request
                 if mr.user_can_resubmit(request.user):
-                    resubmitted_requests.append(mr)
-                    mr.update_status(
-                        action=constants.ACTION_RESUBMITTED, by_user=request.user
-                    )
+                    try:
+                        mr.update_status(
+                            action=constants.ACTION_RESUBMITTED, by_user=request.user
+                        )
+                    except AlreadyActioned:
+                        lost_races += 1
+                    else:
+                        resubmitted_requests.append(mr)
 
             if resubmitted_requests:
                 # Lets notify reviewers. TODO task queue?
@@ -617,8 +1019,10 @@ class ModerationRequestAdmin(admin.ModelAdmin):
                 )
                 % {"count": len(resubmitted_requests)},
             )
+            _message_already_actioned(request, lost_races)
         return HttpResponseRedirect(redirect_url)
 
+    @instrument("ModerationRequestAdmin.published_view")
     @transaction.atomic
     def published_view(self, request):
         collection_id = request.GET.get('collection_id')
@@ -643,8 +1047,11 @@ class ModerationRequestAdmin(admin.ModelAdmin):
             treenodes = self._get_selected_tree_nodes(request)
 
             published_moderation_requests = []
-            for node in treenodes.all():
+            for node in treenodes:
                 mr = node.moderation_request
+                # Held until the end of the view, in the order of the
+                # selected ids, so the same version can't be published twice
+                mr.lock()
                 if mr.version_can_be_published():
                     if publish_version(mr.version, request.user):
                         published_moderation_requests.append(mr)
@@ -676,6 +1083,7 @@ class ModerationRequestAdmin(admin.ModelAdmin):
 
         return HttpResponseRedirect(redirect_url)
 
+    @instrument("ModerationRequestAdmin.rework_view")
     def rework_view(self, request):
         collection_id = request.GET.get('collection_id')
         treenodes = self._get_selected_tree_nodes(request)
@@ -695,14 +1103,19 @@ class ModerationRequestAdmin(admin.ModelAdmin):
                 raise Http404
 
             rejected_requests = []
+            lost_races = 0
 
-            for node in treenodes.all():
+            for node in treenodes:
                 moderation_request = node.moderation_request
                 if moderation_request.user_can_take_moderation_action(request.user):
-                    rejected_requests.append(moderation_request)
-                    moderation_request.update_status(
-                        action=constants.ACTION_REJECTED, by_user=request.user
-                    )
+                    try:
+                        moderation_request.update_status(
+                            action=constants.ACTION_REJECTED, by_user=request.user
+                        )
+                    except AlreadyActioned:
+                        lost_races += 1
+                    else:
+                        rejected_requests.append(moderation_request)
 
             # Now we need to notify collection reviewers and moderator. TODO task queue?
             # https://github.com/divio/djangocms-moderation/pull/46#discussion_r211569629
@@ -723,8 +1136,10 @@ class ModerationRequestAdmin(admin.ModelAdmin):
                 )
                 % {"count": len(rejected_requests)},
             )
+            _message_already_actioned(request, lost_races)
         return HttpResponseRedirect(redirect_url)
 
+    @instrument("ModerationRequestAdmin.approved_view")
     def approved_view(self, request):
         collection_id = request.GET.get('collection_id')
         treenodes = self._get_selected_tree_nodes(request)
@@ -767,13 +1182,19 @@ class ModerationRequestAdmin(admin.ModelAdmin):
             # Variable we are using to group the requests by action.step_approved
             request_action_mapping = dict()
 
-            for node in treenodes.all():
+            lost_races = 0
+
+            for node in treenodes:
                 mr = node.moderation_request
                 if mr.user_can_take_moderation_action(request.user):
+                    try:
+                        mr.update_status(
+                            action=constants.ACTION_APPROVED, by_user=request.user
+                        )
+                    except AlreadyActioned:
+                        lost_races += 1
+                        continue
                     approved_requests.append(mr)
-                    mr.update_status(
-                        action=constants.ACTION_APPROVED, by_user=request.user
-                    )
                     action = mr.get_last_action()
                     if action.to_user_id or action.to_role_id:
                         # We group the moderation requests by step_approved.pk.
@@ -882,6 +1303,7 @@ class ModerationRequestAdmin(admin.ModelAdmin):
                     % {"count": len(rejected_requests)},
                 )
 
+            _message_already_actioned(request, lost_races)
             post_bulk_actions(collection)
 
         return HttpResponseRedirect(redirect_url)
@@ -904,6 +1326,9 @@ class RoleAdmin(admin.ModelAdmin):
 class CollectionCommentAdmin(admin.ModelAdmin):
     list_display = ["date_created", "message", "author"]
     fields = ["collection", "message", "author"]
+    list_select_related = ["author"]
+    # Comments are listed in the order they were written, see `CursorChangeList`
+    sortable_by = ()
 
     class Media:
         css = {"all": ("djangocms_moderation/css/comments_changelist.css",)}
@@ -925,6 +1350,9 @@ class CollectionCommentAdmin(admin.ModelAdmin):
     def get_form(self, request, obj=None, **kwargs):
         return CollectionCommentForm
 
+    def get_changelist(self, request, **kwargs):
+        return CursorChangeList
+
     def has_module_permission(self, request):
         """
         Hide the model from admin index as it depends on foreighKey
@@ -987,6 +1415,9 @@ class CollectionCommentAdmin(admin.ModelAdmin):
 class RequestCommentAdmin(admin.ModelAdmin):
     list_display = ["date_created", "message", "get_author"]
     fields = ["moderation_request", "message", "author"]
+    list_select_related = ["author"]
+    # Comments are listed in the order they were written, see `CursorChangeList`
+    sortable_by = ()
 
     class Media:
         css = {"all": ("djangocms_moderation/css/comments_changelist.css",)}
@@ -1009,6 +1440,9 @@ class RequestCommentAdmin(admin.ModelAdmin):
     def get_form(self, request, obj=None, **kwargs):
         return RequestCommentForm
 
+    def get_changelist(self, request, **kwargs):
+        return CursorChangeList
+
     def has_module_permission(self, request):
         """
         Hide the model from admin index as it depends on foreighKey
@@ -1076,7 +1510,7 @@ class WorkflowStepInline(SortableInlineAdminMixin, admin.TabularInline):
 
 
 @admin.register(Workflow)
-class WorkflowAdmin(SortableAdminBase, admin.ModelAdmin):
+class WorkflowAdmin(SettingsChoicesMixin, SortableAdminBase, admin.ModelAdmin):
     inlines = [WorkflowStepInline]
     list_display = ["name", "is_default"]
     fields = [
@@ -1087,6 +1521,9 @@ class WorkflowAdmin(SortableAdminBase, admin.ModelAdmin):
         "compliance_number_backend",
     ]
 
+    def get_settings_choices(self):
+        return {"compliance_number_backend": conf.COMPLIANCE_NUMBER_BACKENDS}
+
 
 @admin.register(ModerationCollection)
 class ModerationCollectionAdmin(admin.ModelAdmin):
@@ -1096,14 +1533,23 @@ class ModerationCollectionAdmin(admin.ModelAdmin):
 
     actions = None  # remove `delete_selected` for now, it will be handled later
     list_filter = [ModeratorFilter, "status", "date_created", ReviewerFilter]
+    search_fields = ["name", "moderation_requests__title"]
     list_display_links = None
     list_per_page = 100
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         qs = qs.prefetch_reviewers()
+        if conf.COLLECTION_COMMENTS_ENABLED:
+            qs = annotate_comment_stats(
+                qs, CollectionComment.objects.filter(collection=OuterRef("pk"))
+            )
         return qs
 
+    @instrument("ModerationCollectionAdmin.changelist_view")
+    def changelist_view(self, request, extra_context=None):
+        return super().changelist_view(request, extra_context)
+
     def get_list_display(self, request):
         list_display = [
             "job_id",
@@ -1176,7 +1622,12 @@ class ModerationCollectionAdmin(admin.ModelAdmin):
             obj.pk,
         )
         return render_to_string(
-            "djangocms_moderation/comment_icon.html", {"url": edit_url}
+            "djangocms_moderation/comment_icon.html",
+            {
+                "url": edit_url,
+                "count": getattr(obj, "comment_count", None),
+                "last_comment_date": getattr(obj, "last_comment_date", None),
+            },
         )
 
     def get_urls(self):
@@ -1199,6 +1650,41 @@ class ModerationCollectionAdmin(admin.ModelAdmin):
                 views.add_items_to_collection,
                 name="cms_moderation_items_to_collection",
             ),
+            _url(
+                r"^stats/$",
+                views.moderation_stats,
+                name="cms_moderation_stats",
+            ),
+            _url(
+                r"^inbox/$",
+                views.reviewer_inbox,
+                name="cms_moderation_reviewer_inbox",
+            ),
+            _url(
+                r"^audit/$",
+                views.audit_trail,
+                name="cms_moderation_audit_trail",
+            ),
+            _url(
+                r"^(?P<collection_id>\d+)/audit/$",
+                views.audit_trail,
+                name="cms_moderation_collection_audit_trail",
+            ),
+            _url(
+                r"^state/$",
+                views.moderation_state,
+                name="cms_moderation_state",
+            ),
+            _url(
+                r"^diff/(?P<version_id>\d+)/$",
+                views.version_diff,
+                name="cms_moderation_version_diff",
+            ),
+            _url(
+                r"^preview/(?P<version_id>\d+)/$",
+                views.preview_snapshot,
+                name="cms_moderation_preview_snapshot",
+            ),
         ]
         return url_patterns + super().get_urls()
 
@@ -1227,9 +1713,12 @@ class ModerationCollectionAdmin(admin.ModelAdmin):
 
 
 @admin.register(ConfirmationPage)
-class ConfirmationPageAdmin(admin.ModelAdmin):
+class ConfirmationPageAdmin(SettingsChoicesMixin, admin.ModelAdmin):
     view_on_site = True
 
+    def get_settings_choices(self):
+        return {"template": conf.CONFIRMATION_PAGE_TEMPLATES}
+
     def get_urls(self):
         def _url(regex, fn, name, **kwargs):
             return re_path(regex, self.admin_site.admin_view(fn), kwargs=kwargs, name=name)
@@ -1295,3 +1784,71 @@ class ConfirmationFormSubmissionAdmin(admin.ModelAdmin):
                 for d in data
             ),
         )
+
+
+class RollupAdmin(admin.ModelAdmin):
+    """
+    Read only report of the rollups filled by the `moderation_rollups`
+    command, which never reads the actions themselves
+    """
+    date_hierarchy = "month"
+    list_display_links = None
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description=_("month"), ordering="month")
+    def get_month(self, obj):
+        return obj.month.strftime("%Y-%m")
+
+    def _format_duration(self, duration):
+        if duration is None:
+            return "-"
+        return str(timedelta(seconds=int(duration.total_seconds())))
+
+
+@admin.register(WorkflowRollup)
+class WorkflowRollupAdmin(RollupAdmin):
+    list_display = [
+        "get_month",
+        "workflow",
+        "submitted",
+        "first_reviews",
+        "get_average_first_review",
+        "rejected",
+        "resubmitted",
+        "get_rework_rate",
+    ]
+    list_filter = ["workflow"]
+    list_select_related = ["workflow"]
+
+    @admin.display(description=_("average time to first review"))
+    def get_average_first_review(self, obj):
+        return self._format_duration(obj.average_first_review)
+
+    @admin.display(description=_("rework rate"))
+    def get_rework_rate(self, obj):
+        if obj.rework_rate is None:
+            return "-"
+        return f"{obj.rework_rate:.0%}"
+
+
+@admin.register(WorkflowStepRollup)
+class WorkflowStepRollupAdmin(RollupAdmin):
+    list_display = ["get_month", "get_workflow", "step", "approvals", "get_average_time"]
+    list_filter = ["step__workflow"]
+    list_select_related = ["step__workflow", "step__role"]
+
+    @admin.display(description=_("workflow"), ordering="step__workflow")
+    def get_workflow(self, obj):
+        return obj.step.workflow
+
+    @admin.display(description=_("average time in step"))
+    def get_average_time(self, obj):
+        return self._format_duration(obj.average_time)
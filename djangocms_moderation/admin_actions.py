@@ -1,10 +1,9 @@
-from collections import defaultdict
-from functools import partial
+from functools import lru_cache, partial
 
 from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
-from django.db.models import Q
+from django.db.models.base import Model, ModelBase
 from django.http import HttpResponseRedirect
 from django.shortcuts import reverse
 from django.utils.translation import gettext_lazy as _
@@ -14,9 +13,28 @@ from cms.utils.urlutils import add_url_parameters
 from django_fsm import TransitionNotAllowed
 from djangocms_versioning.models import Version
 
-from djangocms_moderation import constants
+from djangocms_moderation import conf, constants, metrics
 
-from .utils import get_admin_url
+from .utils import get_admin_url, store_selection
+
+
+try:
+    from polymorphic.base import PolymorphicModelBase
+
+    _MODEL_BASES = (ModelBase, Model, PolymorphicModelBase)
+except ImportError:
+    _MODEL_BASES = (ModelBase, Model)
+
+
+def _get_selection_url(request, url_name):
+    """
+    Stores the selected tree nodes server-side and returns the url of the
+    confirmation view `url_name` pointing to that selection
+    """
+    token = store_selection(
+        request.user, request.POST.getlist(ACTION_CHECKBOX_NAME)
+    )
+    return f"{reverse(url_name)}?selection={token}&collection_id={request._collection.id}"
 
 
 def resubmit_selected(modeladmin, request, queryset):
@@ -24,13 +42,9 @@ def resubmit_selected(modeladmin, request, queryset):
     Validate and re-submit all the selected moderation requests for
     moderation and notify reviewers via email.
     """
-    selected = request.POST.getlist(ACTION_CHECKBOX_NAME)
-    url = "{}?ids={}&collection_id={}".format(
-        reverse("admin:djangocms_moderation_moderationrequest_resubmit"),
-        ",".join(selected),
-        request._collection.id,
+    return HttpResponseRedirect(
+        _get_selection_url(request, "admin:djangocms_moderation_moderationrequest_resubmit")
     )
-    return HttpResponseRedirect(url)
 
 
 resubmit_selected.short_description = _("Resubmit changes for review")
@@ -41,26 +55,18 @@ def reject_selected(modeladmin, request, queryset):
     Validate and reject all the selected moderation requests and notify
     the author about these requests
     """
-    selected = request.POST.getlist(ACTION_CHECKBOX_NAME)
-    url = "{}?ids={}&collection_id={}".format(
-        reverse("admin:djangocms_moderation_moderationrequest_rework"),
-        ",".join(selected),
-        request._collection.id,
+    return HttpResponseRedirect(
+        _get_selection_url(request, "admin:djangocms_moderation_moderationrequest_rework")
     )
-    return HttpResponseRedirect(url)
 
 
 reject_selected.short_description = _("Submit for rework")
 
 
 def approve_selected(modeladmin, request, queryset):
-    selected = request.POST.getlist(ACTION_CHECKBOX_NAME)
-    url = "{}?ids={}&collection_id={}".format(
-        reverse("admin:djangocms_moderation_moderationrequest_approve"),
-        ",".join(selected),
-        request._collection.id,
+    return HttpResponseRedirect(
+        _get_selection_url(request, "admin:djangocms_moderation_moderationrequest_approve")
     )
-    return HttpResponseRedirect(url)
 
 
 approve_selected.short_description = _("Approve")
@@ -70,13 +76,9 @@ def delete_selected(modeladmin, request, queryset):
     if not modeladmin.has_delete_permission(request):
         raise PermissionDenied
 
-    selected = request.POST.getlist(ACTION_CHECKBOX_NAME)
-    url = "{}?ids={}&collection_id={}".format(
-        reverse('admin:djangocms_moderation_moderationrequesttreenode_delete'),
-        ",".join(selected),
-        request._collection.id,
+    return HttpResponseRedirect(
+        _get_selection_url(request, "admin:djangocms_moderation_moderationrequesttreenode_delete")
     )
-    return HttpResponseRedirect(url)
 
 
 delete_selected.short_description = _("Remove selected")
@@ -87,59 +89,50 @@ def publish_selected(modeladmin, request, queryset):
     if request.user != request._collection.author:
         raise PermissionDenied
 
-    selected = request.POST.getlist(ACTION_CHECKBOX_NAME)
-    url = "{}?ids={}&collection_id={}".format(
-        reverse("admin:djangocms_moderation_moderationrequest_publish"),
-        ",".join(selected),
-        request._collection.id,
+    return HttpResponseRedirect(
+        _get_selection_url(request, "admin:djangocms_moderation_moderationrequest_publish")
     )
-    return HttpResponseRedirect(url)
 
 
 publish_selected.short_description = _("Publish selected requests")
 
 
-def convert_queryset_to_version_queryset(queryset):
-    if not queryset:
-        return Version.objects.none()
-
-    id_map = defaultdict(list)
-    for obj in queryset:
-        model = getattr(obj, "model", None)
-        if model is None:
-            model = obj._meta.model
-
-        from django.db.models.base import Model, ModelBase
-
-        model_bases = [ModelBase, Model]
-        if hasattr(model, "polymorphic_ctype_id"):
-            from polymorphic.base import PolymorphicModelBase
-
-            model_bases.append(PolymorphicModelBase)
-        model = next(
-            m
-            for m in reversed(model.mro())
-            if (
-                isinstance(m, tuple(model_bases))
-                and m not in model_bases
-                and not m._meta.abstract
-            )
+@lru_cache(maxsize=None)
+def _get_versioned_model(model):
+    """
+    Versions point to the top-most concrete model of a (multi-table or
+    polymorphic) inheritance chain, so resolve it once per model class
+    """
+    return next(
+        m
+        for m in reversed(model.mro())
+        if (
+            isinstance(m, _MODEL_BASES)
+            and m not in _MODEL_BASES
+            and not m._meta.abstract
         )
+    )
+
 
-        id_map[model].append(obj.pk)
-    q = Q()
-    for obj_model, ids in id_map.items():
-        ctype = ContentType.objects.get_for_model(obj_model).pk
-        q |= Q(content_type_id=ctype, object_id__in=ids)
-    return Version.objects.filter(q)
+def convert_queryset_to_version_queryset(queryset):
+    """
+    Returns the versions of the content objects in `queryset`. The selected
+    objects are never loaded: their primary keys are used as a subquery.
+    """
+    model = _get_versioned_model(queryset.model)
+    ctype = ContentType.objects.get_for_model(model)
+    return Version.objects.filter(
+        content_type=ctype, object_id__in=queryset.values("pk")
+    )
 
 
 def add_items_to_collection(modeladmin, request, queryset):
     """Action to add queryset to moderation collection."""
-    version_ids = convert_queryset_to_version_queryset(queryset).values_list(
-        "pk", flat=True
+    version_ids = list(
+        convert_queryset_to_version_queryset(queryset)
+        .values_list("pk", flat=True)
+        .iterator(chunk_size=conf.SELECTION_CHUNK_SIZE)
     )
-    version_ids = [str(x) for x in version_ids]
     if version_ids:
         admin_url = add_url_parameters(
             get_admin_url(
@@ -147,7 +140,7 @@ def add_items_to_collection(modeladmin, request, queryset):
                 language=request.GET.get("language"),
                 args=(),
             ),
-            version_ids=",".join(version_ids),
+            selection=store_selection(request.user, version_ids),
             return_to_url=request.headers.get("referer", ""),
         )
         return HttpResponseRedirect(admin_url)
@@ -172,8 +165,11 @@ def post_bulk_actions(collection):
 
 
 def publish_version(version, user):
-    try:
-        version.publish(user)
-    except TransitionNotAllowed:
-        return False
+    with metrics.timer("moderation.publish_version", content_type=version.content_type_id) as tags:
+        try:
+            version.publish(user)
+        except TransitionNotAllowed:
+            tags["published"] = False
+            return False
+        tags["published"] = True
     return True
@@ -0,0 +1,145 @@
+"""
+Audit trail of the moderation: one row per action with its collection,
+request, version, users, steps, compliance number and form submission.
+
+The rows are read with a single query with joins, streamed from the
+database `chunk_size` rows at a time and written out one by one, so an
+export runs in constant memory whatever its size.
+"""
+import csv
+import json
+from datetime import datetime, time
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import ConfirmationFormSubmission, ModerationRequestAction
+
+
+AUDIT_COLUMNS = (
+    "collection_id",
+    "collection",
+    "collection_status",
+    "workflow",
+    "request_id",
+    "version_id",
+    "content_type",
+    "object_id",
+    "language",
+    "compliance_number",
+    "action_id",
+    "action",
+    "date_taken",
+    "by_user_name",
+    "to_user_name",
+    "to_role_name",
+    "step_approved_role",
+    "is_archived",
+    "message",
+    "form_submission",
+)
+
+
+def parse_audit_date(value):
+    """
+    Parses a date or a datetime in ISO format, a date meaning its midnight
+    in the current time zone. Raises ValueError if `value` is invalid.
+    """
+    moment = parse_datetime(value)
+    if moment is None:
+        date = parse_date(value)
+        if date is None:
+            raise ValueError(f"Invalid date: {value}")
+        moment = datetime.combine(date, time())
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def get_audit_rows(collection_id=None, start=None, end=None):
+    """
+    The audit trail of the collection `collection_id`, or of all the
+    collections, limited to the actions taken from `start` until `end`
+    when given, as a queryset of dicts with the `AUDIT_COLUMNS` keys
+    """
+    username = get_user_model().USERNAME_FIELD
+    request = "moderation_request__"
+    version = f"{request}version__"
+    form_submissions = ConfirmationFormSubmission.objects.filter(
+        moderation_request=OuterRef("moderation_request"),
+        for_step=OuterRef("step_approved"),
+    )
+    actions = ModerationRequestAction.objects.all()
+    if collection_id is not None:
+        actions = actions.filter(moderation_request__collection=collection_id)
+    if start is not None:
+        actions = actions.filter(date_taken__gte=start)
+    if end is not None:
+        actions = actions.filter(date_taken__lt=end)
+    return actions.order_by("moderation_request", "date_taken", "pk").values(
+        "action",
+        "date_taken",
+        "is_archived",
+        "message",
+        collection_id=F(f"{request}collection"),
+        collection=F(f"{request}collection__name"),
+        collection_status=F(f"{request}collection__status"),
+        workflow=F(f"{request}collection__workflow__name"),
+        request_id=F("moderation_request"),
+        version_id=F(f"{request}version"),
+        content_type=Concat(
+            F(f"{version}content_type__app_label"), Value("."), F(f"{version}content_type__model")
+        ),
+        object_id=F(f"{version}object_id"),
+        language=F(f"{request}language"),
+        compliance_number=F(f"{request}compliance_number"),
+        action_id=F("pk"),
+        by_user_name=F(f"by_user__{username}"),
+        to_user_name=F(f"to_user__{username}"),
+        to_role_name=F("to_role__name"),
+        step_approved_role=F("step_approved__role__name"),
+        form_submission=Subquery(form_submissions.values("data")[:1]),
+    )
+
+
+class _Echo:
+    """
+    File-like object returning what is written, for `csv.writer`
+    """
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(AUDIT_COLUMNS)
+    for row in rows:
+        yield writer.writerow(
+            row[column].isoformat() if column == "date_taken" else row[column]
+            for column in AUDIT_COLUMNS
+        )
+
+
+def jsonl_lines(rows):
+    for row in rows:
+        yield json.dumps({column: row[column] for column in AUDIT_COLUMNS}, cls=DjangoJSONEncoder) + "\n"
+
+
+# Line writers and content types of the export formats
+FORMATS = {
+    "csv": (csv_lines, "text/csv"),
+    "jsonl": (jsonl_lines, "application/x-ndjson"),
+}
+
+
+def export_audit_trail(rows, output_format="csv", chunk_size=2000):
+    """
+    Lines of the audit trail `rows` in `output_format`, streamed from the
+    database `chunk_size` rows at a time
+    """
+    write_lines = FORMATS[output_format][0]
+    return write_lines(rows.iterator(chunk_size=chunk_size))
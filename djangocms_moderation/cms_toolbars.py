@@ -63,6 +63,16 @@ class ModerationToolbar(VersioningToolbar):
                 self.toolbar.add_sideframe_button(
                     name=title, url=url, side=self.toolbar.RIGHT
                 )
+                self.toolbar.add_button(
+                    name=_("View diff"),
+                    url=get_admin_url(
+                        name="cms_moderation_version_diff",
+                        language=self.current_lang,
+                        args=(moderation_request.version_id,),
+                    ),
+                    extra_classes=["js-cms-moderation-view-diff"],
+                    side=self.toolbar.RIGHT,
+                )
             # Check if the object is not version locked to someone else
             elif helpers.is_obj_version_unlocked(self.toolbar.obj, self.request.user):
                 opts = ModerationRequest._meta
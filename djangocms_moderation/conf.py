@@ -62,3 +62,71 @@ COLLECTION_NAME_LENGTH_LIMIT = getattr(
 EMAIL_NOTIFICATIONS_FAIL_SILENTLY = getattr(
     settings, "EMAIL_NOTIFICATIONS_FAIL_SILENTLY", False
 )
+
+# Selections made in the admin changelists (bulk actions, "add to collection")
+# are stored server-side under a short token instead of being passed as a
+# comma-separated list of ids in the URL. The timeout is in seconds.
+SELECTION_CACHE = getattr(settings, "CMS_MODERATION_SELECTION_CACHE", "default")
+
+SELECTION_TIMEOUT = getattr(settings, "CMS_MODERATION_SELECTION_TIMEOUT", 60 * 60)
+
+# Number of objects loaded per query when processing a stored selection
+SELECTION_CHUNK_SIZE = getattr(settings, "CMS_MODERATION_SELECTION_CHUNK_SIZE", 500)
+
+# Log the number of queries, the duplicated queries and the database time
+# of the moderation admin views and the main model methods
+QUERY_LOGGING = getattr(settings, "CMS_MODERATION_QUERY_LOGGING", False)
+
+# Dotted path of the callable receiving the timers and counters of the
+# moderation operations, see `djangocms_moderation.metrics`
+METRICS_BACKEND = getattr(
+    settings, "CMS_MODERATION_METRICS_BACKEND", "djangocms_moderation.metrics.null_backend"
+)
+
+# Number of seconds the moderation backlog statistics served to monitoring
+# are cached for
+STATS_CACHE_TIMEOUT = getattr(settings, "CMS_MODERATION_STATS_CACHE_TIMEOUT", 60)
+
+# Number of days after which archived and cancelled collections are exported
+# and deleted by the `moderation_archive` command. `None` keeps them forever
+RETENTION_DAYS = getattr(settings, "CMS_MODERATION_RETENTION_DAYS", None)
+
+# Number of rows fetched from the database at a time by the audit trail
+# exports
+AUDIT_EXPORT_CHUNK_SIZE = getattr(settings, "CMS_MODERATION_AUDIT_EXPORT_CHUNK_SIZE", 2000)
+
+# Maximum number of versions and content objects of a request to the
+# moderation state endpoint
+STATE_MAX_ITEMS = getattr(settings, "CMS_MODERATION_STATE_MAX_ITEMS", 200)
+
+# Cache alias, timeout in seconds and maximum size in characters of the
+# cached visual diffs between the versions under moderation and the
+# published versions. Larger diffs are computed for every request.
+DIFF_CACHE = getattr(settings, "CMS_MODERATION_DIFF_CACHE", "default")
+
+DIFF_CACHE_TIMEOUT = getattr(settings, "CMS_MODERATION_DIFF_CACHE_TIMEOUT", 60 * 60 * 24)
+
+DIFF_MAX_SIZE = getattr(settings, "CMS_MODERATION_DIFF_MAX_SIZE", 2 * 1024 * 1024)
+
+# Render the previews of the versions once when they are submitted or
+# resubmitted for review, and serve these snapshots to the reviewers. The
+# snapshots are stored in the given cache alias for the given number of
+# seconds; a file based cache keeps them on the local disk.
+PREVIEW_SNAPSHOTS = getattr(settings, "CMS_MODERATION_PREVIEW_SNAPSHOTS", False)
+
+PREVIEW_SNAPSHOT_CACHE = getattr(settings, "CMS_MODERATION_PREVIEW_SNAPSHOT_CACHE", "default")
+
+PREVIEW_SNAPSHOT_TIMEOUT = getattr(
+    settings, "CMS_MODERATION_PREVIEW_SNAPSHOT_TIMEOUT", 60 * 60 * 24 * 7
+)
+
+# Number of levels of the tree of a collection rendered by its changelist.
+# The children of the last level are loaded when their parent is expanded.
+# None renders the whole tree.
+TREE_LEVELS = getattr(settings, "CMS_MODERATION_TREE_LEVELS", 1)
+
+# Cache alias and timeout in seconds of the number of requests at the top of
+# the tree of a collection, which the changelist of the collection paginates
+TREE_COUNT_CACHE = getattr(settings, "CMS_MODERATION_TREE_COUNT_CACHE", "default")
+
+TREE_COUNT_CACHE_TIMEOUT = getattr(settings, "CMS_MODERATION_TREE_COUNT_CACHE_TIMEOUT", 60 * 60)
@@ -0,0 +1,269 @@
+"""
+Consistency checks for the moderation data.
+
+Each check describes one kind of drift between moderation requests,
+collections, actions and tree nodes. The objects affected by a check are
+found with a single streamed query, and repaired in bounded batches with
+set-based queries, so that the checks stay usable on large databases.
+"""
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q, Subquery, prefetch_related_objects
+from django.db.models.functions import Left
+
+from djangocms_versioning import constants as versioning_constants
+
+from . import constants
+from .helpers import get_pending_required_steps
+from .models import (
+    ModerationCollection,
+    ModerationRequest,
+    ModerationRequestAction,
+    ModerationRequestTreeNode,
+    WorkflowStep,
+)
+from .utils import chunked
+
+
+def _deactivate_requests(ids):
+    ModerationCollection.objects.filter(moderation_requests__in=ids).touch()
+    return ModerationRequest.objects.filter(pk__in=ids).update(is_active=False)
+
+
+def _approved_requests():
+    """
+    Requests which are approved, mirrors `ModerationRequest.is_approved`
+    """
+    return ModerationRequest.objects.filter(is_active=True).exclude(
+        Exists(get_pending_required_steps())
+    )
+
+
+class ConsistencyCheck:
+    name = None
+    description = None
+    model = None
+    # Whether the check runs when no check is selected
+    default = False
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def repair(self, ids):
+        """
+        Repairs the objects with the primary keys `ids`
+        :return: <int> number of objects repaired
+        """
+        raise NotImplementedError
+
+    def run(self, perform_fix=False, chunk_size=2000, batch_size=500):
+        """
+        Streams the primary keys of the inconsistent objects, repairing
+        them batch by batch, each batch in its own transaction.
+        Yields a `(ids, repaired)` tuple for each batch.
+        """
+        ids = (
+            self.get_queryset()
+            .order_by("pk")
+            .values_list("pk", flat=True)
+            .iterator(chunk_size=chunk_size)
+        )
+        for batch in chunked(ids, batch_size):
+            repaired = 0
+            if perform_fix:
+                with transaction.atomic():
+                    repaired = self.repair(batch)
+            yield batch, repaired
+
+
+class ActiveRequestsOfPublishedVersions(ConsistencyCheck):
+    name = "published_active_requests"
+    description = "Active requests in archived collections whose version is published"
+    model = ModerationRequest
+    default = True
+
+    def get_queryset(self):
+        return ModerationRequest.objects.filter(
+            is_active=True,
+            collection__status=constants.ARCHIVED,
+            version__state=versioning_constants.PUBLISHED,
+        )
+
+    def repair(self, ids):
+        return _deactivate_requests(ids)
+
+
+class MultipleActiveRequests(ConsistencyCheck):
+    """
+    Only possible on databases ignoring the partial unique constraint
+    `moderation_one_active_request`, such as MySQL
+    """
+    name = "multiple_active_requests"
+    description = "Active requests superseded by a newer active request for the same version"
+    model = ModerationRequest
+
+    def get_queryset(self):
+        newer = ModerationRequest.objects.filter(
+            version=OuterRef("version"), is_active=True, pk__gt=OuterRef("pk"),
+        )
+        return ModerationRequest.objects.filter(is_active=True).filter(Exists(newer))
+
+    def repair(self, ids):
+        return _deactivate_requests(ids)
+
+
+class OrphanTreeNodes(ConsistencyCheck):
+    name = "orphan_tree_nodes"
+    description = "Tree nodes whose parent node no longer exists"
+    model = ModerationRequestTreeNode
+
+    def get_queryset(self):
+        steplen = ModerationRequestTreeNode.steplen
+        parent = ModerationRequestTreeNode.objects.filter(path=OuterRef("parent_path"))
+        return (
+            ModerationRequestTreeNode.objects.filter(depth__gt=1)
+            .annotate(parent_path=Left("path", (F("depth") - 1) * steplen))
+            .exclude(Exists(parent))
+        )
+
+    def repair(self, ids):
+        # Deleting through the treebeard queryset removes the descendants
+        # of the orphans too
+        nodes = ModerationRequestTreeNode.objects.filter(pk__in=ids)
+        ModerationCollection.objects.filter(pk__in=nodes.values("collection")).touch()
+        repaired = nodes.count()
+        nodes.delete()
+        return repaired
+
+
+class RequestsWithoutTreeNode(ConsistencyCheck):
+    name = "requests_without_tree_node"
+    description = "Requests which are not listed in the tree of their collection"
+    model = ModerationRequest
+
+    def get_queryset(self):
+        return ModerationRequest.objects.exclude(
+            Exists(ModerationRequestTreeNode.objects.filter(moderation_request=OuterRef("pk")))
+        )
+
+    def repair(self, ids):
+        moderation_requests = ModerationRequest.objects.filter(pk__in=ids).order_by("pk")
+        ModerationCollection.objects.filter(moderation_requests__in=ids).touch()
+        return len(ModerationRequestTreeNode.add_roots(list(moderation_requests)))
+
+
+class RequestsWithoutContentFields(ConsistencyCheck):
+    name = "requests_without_content_fields"
+    description = "Requests without the title, content type and number of their version"
+    model = ModerationRequest
+
+    def get_queryset(self):
+        return ModerationRequest.objects.filter(content_type__isnull=True)
+
+    def repair(self, ids):
+        moderation_requests = list(ModerationRequest.objects.filter(pk__in=ids).select_related("version"))
+        prefetch_related_objects([mr.version for mr in moderation_requests], "content")
+        for moderation_request in moderation_requests:
+            moderation_request.set_content_fields()
+        return ModerationRequest.objects.bulk_update(
+            moderation_requests, ["title", "content_type", "version_number"]
+        )
+
+
+class MissingStartedActions(ConsistencyCheck):
+    name = "missing_started_actions"
+    description = "Requests in collections in review without a STARTED action"
+    model = ModerationRequest
+
+    def get_queryset(self):
+        started = ModerationRequestAction.objects.filter(
+            moderation_request=OuterRef("pk"), action=constants.ACTION_STARTED,
+        )
+        return ModerationRequest.objects.filter(
+            collection__status=constants.IN_REVIEW,
+        ).exclude(Exists(started))
+
+    def repair(self, ids):
+        moderation_requests = ModerationRequest.objects.filter(pk__in=ids).values_list(
+            "pk", "collection__author_id", "collection__workflow_id",
+        )
+        moderation_requests = list(moderation_requests)
+        first_roles = {}
+        steps = WorkflowStep.objects.filter(
+            workflow_id__in={workflow_id for _, _, workflow_id in moderation_requests}
+        ).order_by("-order")
+        for workflow_id, role_id in steps.values_list("workflow_id", "role_id"):
+            first_roles[workflow_id] = role_id
+        ModerationRequestAction.objects.bulk_create(
+            ModerationRequestAction(
+                moderation_request_id=pk,
+                by_user_id=author_id,
+                to_role_id=first_roles.get(workflow_id),
+                action=constants.ACTION_STARTED,
+            )
+            for pk, author_id, workflow_id in moderation_requests
+        )
+        # `date_taken` is set to now on creation, move the actions to the
+        # moment the requests were sent so they stay the first action
+        date_sent = ModerationRequest.objects.filter(
+            pk=OuterRef("moderation_request_id")
+        ).values("date_sent")[:1]
+        ModerationRequestAction.objects.filter(
+            moderation_request_id__in=ids, action=constants.ACTION_STARTED,
+        ).update(date_taken=Subquery(date_sent))
+        return len(moderation_requests)
+
+
+class CollectionsToArchive(ConsistencyCheck):
+    name = "collections_to_archive"
+    description = "Collections in review whose requests are all approved"
+    model = ModerationCollection
+
+    def get_queryset(self):
+        not_approved = ModerationRequest.objects.filter(collection=OuterRef("pk")).filter(
+            Q(is_active=False) | Exists(get_pending_required_steps())
+        )
+        return ModerationCollection.objects.filter(
+            status=constants.IN_REVIEW,
+        ).exclude(Exists(not_approved))
+
+    def repair(self, ids):
+        collections = ModerationCollection.objects.filter(pk__in=ids)
+        repaired = collections.update(status=constants.ARCHIVED)
+        collections.touch()
+        return repaired
+
+
+class MissingComplianceNumbers(ConsistencyCheck):
+    name = "missing_compliance_numbers"
+    description = "Approved requests without the compliance number their workflow requires"
+    model = ModerationRequest
+
+    def get_queryset(self):
+        return _approved_requests().filter(
+            Q(compliance_number__isnull=True) | Q(compliance_number=""),
+            collection__workflow__requires_compliance_number=True,
+        )
+
+    def repair(self, ids):
+        # Compliance numbers come from a pluggable backend which works on
+        # one request at a time
+        moderation_requests = ModerationRequest.objects.filter(
+            pk__in=ids
+        ).select_related("collection__workflow")
+        repaired = 0
+        for moderation_request in moderation_requests:
+            moderation_request.set_compliance_number()
+            repaired += 1
+        return repaired
+
+
+CHECKS = (
+    ActiveRequestsOfPublishedVersions(),
+    MultipleActiveRequests(),
+    OrphanTreeNodes(),
+    RequestsWithoutTreeNode(),
+    RequestsWithoutContentFields(),
+    MissingStartedActions(),
+    CollectionsToArchive(),
+    MissingComplianceNumbers(),
+)
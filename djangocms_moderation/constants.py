@@ -38,6 +38,10 @@ ACTION_CHOICES = (
     (ACTION_FINISHED, _("Finished")),
 )
 
+# Actions which depend on the last action of the request: approving and
+# rejecting need a request which isn't rejected, resubmitting a rejected one
+REVIEW_ACTIONS = (ACTION_APPROVED, ACTION_REJECTED, ACTION_RESUBMITTED)
+
 CONTENT_TYPE_PLAIN = "plain"
 CONTENT_TYPE_FORM = "form"
 
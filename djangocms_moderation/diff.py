@@ -0,0 +1,148 @@
+"""
+Visual diff between a version under moderation and the published version of
+the same content.
+
+Both versions are rendered once, without the toolbar, and the diff is
+cached under the ids and modification dates of the two versions, so the
+reviewers of a collection share it. A version is only edited in moderation
+after it has been rejected, so its last resubmission is part of the cache
+key as well, and the actions taken on the other requests of the collection
+keep the diff.
+"""
+import copy
+import difflib
+import re
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.db.models import Max
+from django.http import Http404, QueryDict
+
+from cms.utils.conf import get_cms_setting
+
+from djangocms_versioning.constants import PUBLISHED
+from djangocms_versioning.models import Version
+
+from . import conf, constants
+
+
+# Markup which is kept as a whole: the head, scripts, styles, comments and
+# tags, then the words and the white space of the text
+_TOKEN_RE = re.compile(
+    r"<head\b.*?</head>|<script\b.*?</script>|<style\b.*?</style>|<!--.*?-->|<[^>]*>|\s+|[^<\s]+",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def _is_text(token):
+    return not token.startswith("<")
+
+
+def _mark(tokens, tag, keep_markup):
+    """
+    Wraps the runs of text of `tokens` in `tag`, keeping the markup between
+    them if `keep_markup`, else dropping it
+    """
+    output, text = [], []
+    for token in tokens:
+        if _is_text(token):
+            text.append(token)
+            continue
+        if text:
+            output.append(f'<{tag} class="cms-diff">{"".join(text)}</{tag}>')
+            text = []
+        if keep_markup:
+            output.append(token)
+    if text:
+        output.append(f'<{tag} class="cms-diff">{"".join(text)}</{tag}>')
+    return output
+
+
+def diff_html(old, new):
+    """
+    Markup of `new` with the text removed since `old` in <del> and the text
+    added in <ins> elements, word by word. The markup of `old` which is not
+    in `new` is dropped.
+    """
+    old_tokens = _TOKEN_RE.findall(old)
+    new_tokens = _TOKEN_RE.findall(new)
+    matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    output = []
+    for opcode, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if opcode == "equal":
+            output += new_tokens[new_start:new_end]
+            continue
+        output += _mark(old_tokens[old_start:old_end], "del", keep_markup=False)
+        output += _mark(new_tokens[new_start:new_end], "ins", keep_markup=True)
+    return "".join(output)
+
+
+def render_content(request, content):
+    """
+    Markup of the preview of `content` as seen by the user of `request`,
+    without the toolbar
+    """
+    # The toolbar needs the cms app to be ready, which it isn't when the
+    # admin is loaded
+    from cms.toolbar.toolbar import CMSToolbar
+    from cms.views import render_object_preview
+
+    render_request = copy.copy(request)
+    render_request.GET = QueryDict(get_cms_setting("CMS_TOOLBAR_URL__DISABLE"))
+    render_request.__dict__.pop("current_page", None)
+    render_request.toolbar = CMSToolbar(render_request)
+    content_type = ContentType.objects.get_for_model(content)
+    response = render_object_preview(render_request, content_type.pk, content.pk)
+    if response.status_code != 200:
+        raise Http404(f"The preview of {content!r} can't be rendered")
+    if hasattr(response, "render"):
+        response.render()
+    return response.content.decode(response.charset)
+
+
+def get_published_version(version):
+    """
+    The published version of the content of `version`, if any
+    """
+    return (
+        Version.objects.filter_by_content_grouping_values(version.content)
+        .filter(state=PUBLISHED)
+        .exclude(pk=version.pk)
+        .first()
+    )
+
+
+def _get_diff_cache_key(moderation_request, published_version):
+    version = moderation_request.version
+    published = (
+        f"{published_version.pk}:{published_version.modified.timestamp()}"
+        if published_version
+        else "none"
+    )
+    resubmitted = moderation_request.actions.filter(
+        action=constants.ACTION_RESUBMITTED
+    ).aggregate(last=Max("pk"))["last"]
+    return (
+        f"djangocms_moderation:diff:{version.pk}:{version.modified.timestamp()}:{published}:"
+        f"{resubmitted or 0}"
+    )
+
+
+def get_version_diff(request, moderation_request):
+    """
+    Visual diff of the version of `moderation_request` against the published
+    version of its content, or against nothing if it has never been
+    published. Diffs larger than ``CMS_MODERATION_DIFF_MAX_SIZE`` are not
+    cached.
+    """
+    version = moderation_request.version
+    published_version = get_published_version(version)
+    cache = caches[conf.DIFF_CACHE]
+    key = _get_diff_cache_key(moderation_request, published_version)
+    diff = cache.get(key)
+    if diff is None:
+        published = render_content(request, published_version.content) if published_version else ""
+        diff = diff_html(published, render_content(request, version.content))
+        if len(diff) <= conf.DIFF_MAX_SIZE:
+            cache.set(key, diff, conf.DIFF_CACHE_TIMEOUT)
+    return diff
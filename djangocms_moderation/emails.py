@@ -9,7 +9,7 @@ from .conf import EMAIL_NOTIFICATIONS_FAIL_SILENTLY
 from .utils import get_absolute_url
 
 
-from . import constants  # isort:skip
+from . import constants, metrics  # isort:skip
 
 
 email_subjects = {
@@ -47,9 +47,15 @@ def _send_email(
         from_email=settings.DEFAULT_FROM_EMAIL,
         to=recipients,
     )
-    return message.send(
-        fail_silently=EMAIL_NOTIFICATIONS_FAIL_SILENTLY
-    )
+    with metrics.timer(
+        "moderation.send_email",
+        template=template,
+        workflow=collection.workflow_id,
+        items=len(message.to),
+    ):
+        return message.send(
+            fail_silently=EMAIL_NOTIFICATIONS_FAIL_SILENTLY
+        )
 
 
 def notify_collection_author(collection, moderation_requests, action, by_user):
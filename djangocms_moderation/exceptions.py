@@ -4,3 +4,7 @@ class ObjectAlreadyInCollection(Exception):
 
 class CollectionIsLocked(Exception):
     pass
+
+
+class AlreadyActioned(Exception):
+    pass
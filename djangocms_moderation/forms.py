@@ -9,11 +9,7 @@ from adminsortable2.admin import CustomInlineFormSet
 from djangocms_versioning.models import Version
 
 from .constants import ACTION_CANCELLED, ACTION_REJECTED, ACTION_RESUBMITTED, COLLECTING
-from .helpers import (
-    get_active_moderation_request,
-    is_obj_version_unlocked,
-    is_registered_for_moderation,
-)
+from .helpers import get_versions_ineligibility_reasons
 from .models import (
     CollectionComment,
     ModerationCollection,
@@ -127,6 +123,9 @@ class CollectionItemsForm(forms.Form):
     def __init__(self, user, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.user = user
+        # List of (version, reason) tuples for the versions which were
+        # left out during validation, so they can be shown to the user
+        self.ineligible_versions = []
         self.fields["collection"].queryset = ModerationCollection.objects.filter(
             status=COLLECTING, author=user
         )
@@ -154,16 +153,14 @@ class CollectionItemsForm(forms.Form):
         Other objects are ignored.
         """
         versions = self.cleaned_data["versions"]
+        reasons = get_versions_ineligibility_reasons(versions, self.user)
 
         eligible_versions = []
+        self.ineligible_versions = []
         for version in versions:
-            if all(
-                [
-                    is_registered_for_moderation(version.content),
-                    not get_active_moderation_request(version.content),
-                    is_obj_version_unlocked(version.content, self.user),
-                ]
-            ):
+            if version.pk in reasons:
+                self.ineligible_versions.append((version, reasons[version.pk]))
+            else:
                 eligible_versions.append(version.pk)
 
         if not eligible_versions:
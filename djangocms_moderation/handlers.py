@@ -1,9 +1,15 @@
 import json
+from functools import partial
 
+from django.db import transaction
 from django.dispatch import receiver
 
+from djangocms_versioning.models import Version
+
+from . import conf
 from .models import ConfirmationFormSubmission
-from .signals import confirmation_form_submission
+from .signals import confirmation_form_submission, submitted_for_review
+from .snapshots import store_preview_snapshots
 
 
 @receiver(confirmation_form_submission)
@@ -26,3 +32,15 @@ def moderation_confirmation_form_submission(
             data=json.dumps(form_data),
             confirmation_page=next_step.role.confirmation_page,
         )
+
+
+@receiver(submitted_for_review)
+def store_submitted_preview_snapshots(sender, collection, moderation_requests, user, **kwargs):
+    if not conf.PREVIEW_SNAPSHOTS:
+        return
+    versions = Version.objects.filter(
+        pk__in=[moderation_request.version_id for moderation_request in moderation_requests]
+    ).prefetch_related("content")
+    # Rendered once the submission is committed, as the previews would
+    # otherwise hold its transaction open
+    transaction.on_commit(partial(store_preview_snapshots, versions, user))
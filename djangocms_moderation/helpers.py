@@ -1,7 +1,8 @@
 from django.apps import apps
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
+from django.db.models import Exists, F, Func, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.template.defaultfilters import truncatechars
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
@@ -14,8 +15,14 @@ from djangocms_versioning.constants import DRAFT
 from djangocms_versioning.models import Version
 
 from .conf import COLLECTION_NAME_LENGTH_LIMIT
-from .constants import COLLECTING
-from .models import ConfirmationFormSubmission
+from .constants import ACTION_REJECTED, COLLECTING, IN_REVIEW
+from .models import (
+    ConfirmationFormSubmission,
+    ModerationRequest,
+    ModerationRequestAction,
+    Role,
+    WorkflowStep,
+)
 
 
 User = get_user_model()
@@ -79,8 +86,6 @@ def get_active_moderation_request(content_object):
     If this returns None, it means there is no active_moderation request for this
     object, and it means it can be submitted for new moderation
     """
-    from djangocms_moderation.models import ModerationRequest
-
     version = Version.objects.get_for_content(content_object)
 
     try:
@@ -100,6 +105,61 @@ def is_registered_for_moderation(content_object):
     return content_object.__class__ in moderated_models
 
 
+def get_unlocked_version_ids(versions, user):
+    """
+    Bulk version of `is_obj_version_unlocked`, working with the lock
+    information stored on the version rows instead of loading each
+    content object
+    :param versions: list of <Version>
+    :param user: <obj>
+    :return: <set> of ids of the versions which are not locked for `user`
+    """
+    if content_is_unlocked_for_user is None:
+        return {version.pk for version in versions}
+    if hasattr(Version, "locked_by"):
+        return {
+            version.pk for version in versions
+            if version.locked_by_id in (None, user.pk)
+        }
+    # djangocms_version_locking keeps the lock outside the version table
+    return {
+        version.pk for version in versions
+        if content_is_unlocked_for_user(version.content, user)
+    }
+
+
+def get_versions_ineligibility_reasons(versions, user):
+    """
+    Works out, in bulk, which versions can't be added to a moderation
+    collection by `user` and why.
+    :param versions: <QuerySet> or list of <Version>
+    :param user: <obj>
+    :return: <dict> of version id -> reason, for ineligible versions only
+    """
+    moderation_config = apps.get_app_config("djangocms_moderation")
+    moderated_models = set(moderation_config.cms_extension.moderated_models)
+    version_list = list(versions)
+    active_version_ids = set(
+        ModerationRequest.objects.filter(
+            version__in=versions, is_active=True
+        ).values_list("version_id", flat=True)
+    )
+    unlocked_version_ids = get_unlocked_version_ids(version_list, user)
+
+    reasons = {}
+    for version in version_list:
+        content_model = ContentType.objects.get_for_id(
+            version.content_type_id
+        ).model_class()
+        if content_model not in moderated_models:
+            reasons[version.pk] = _("Not enabled for moderation")
+        elif version.pk in active_version_ids:
+            reasons[version.pk] = _("Part of another active moderation request")
+        elif version.pk not in unlocked_version_ids:
+            reasons[version.pk] = _("Locked by another user")
+    return reasons
+
+
 def get_moderation_button_title_and_url(moderation_request):
     """
     Helper to get the moderation button title and url for an
@@ -140,6 +200,74 @@ def get_all_moderators():
     return User.objects.filter(moderationcollection__author__isnull=False).distinct()
 
 
+def get_pending_required_steps():
+    """
+    Required steps of the request's workflow that have not been approved
+    yet, to be used as a subquery against `ModerationRequest`.
+    Mirrors `ModerationRequest.get_pending_required_steps`.
+    """
+    step_approved = ModerationRequestAction.objects.filter(
+        moderation_request=OuterRef(OuterRef("pk")),
+        step_approved=OuterRef("pk"),
+        is_archived=False,
+    )
+    return WorkflowStep.objects.filter(
+        workflow=OuterRef("collection__workflow"), is_required=True,
+    ).exclude(Exists(step_approved))
+
+
+def get_requests_awaiting_review(user):
+    """
+    Requests of all the collections in review which currently await a step
+    assigned to one of `user`'s roles, as a single query.
+    Mirrors `ModerationRequest.user_can_take_moderation_action`: the user
+    can act on a pending step up to the first required pending step.
+    """
+    step_approved = ModerationRequestAction.objects.filter(
+        moderation_request=OuterRef(OuterRef("pk")),
+        step_approved=OuterRef("pk"),
+        is_archived=False,
+    )
+    pending_steps = WorkflowStep.objects.filter(
+        workflow=OuterRef("collection__workflow"),
+    ).exclude(Exists(step_approved))
+    first_required_order = pending_steps.filter(is_required=True).order_by("order").values("order")[:1]
+    user_roles = Role.objects.filter(Q(user=user) | Q(group__user=user))
+    user_steps = pending_steps.filter(
+        role__in=user_roles, order__lte=OuterRef("first_required_order"),
+    )
+    last_action = ModerationRequestAction.objects.filter(
+        moderation_request=OuterRef("pk")
+    ).order_by("-date_taken", "-pk").values("action")[:1]
+    return (
+        ModerationRequest.objects.filter(is_active=True, collection__status=IN_REVIEW)
+        .annotate(
+            first_required_order=Coalesce(Subquery(first_required_order), Value(2 ** 31 - 1)),
+            last_action=Subquery(last_action),
+        )
+        .filter(Exists(user_steps))
+        .exclude(last_action=ACTION_REJECTED)
+    )
+
+
+def annotate_comment_stats(queryset, comments):
+    """
+    Annotates `queryset` with the number of `comments` as `comment_count`
+    and the date of the latest one as `last_comment_date`. `comments` is a
+    queryset of comments filtered on an `OuterRef` to the annotated object.
+    """
+    comments = comments.order_by()
+    comment_count = comments.annotate(
+        count=Func(F("pk"), function="COUNT", output_field=IntegerField())
+    ).values("count")
+    return queryset.annotate(
+        comment_count=Coalesce(Subquery(comment_count), Value(0)),
+        last_comment_date=Subquery(
+            comments.order_by("-date_created").values("date_created")[:1]
+        ),
+    )
+
+
 def _get_moderatable_version(versionable, grouper, parent_version_filters):
     """
     Private helper to get a specific version from a field instance
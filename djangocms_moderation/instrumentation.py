@@ -0,0 +1,119 @@
+"""
+Query instrumentation of the moderation views and model methods.
+
+`track_queries` records the queries run in a block of code. The `instrument`
+decorator logs these statistics for the wrapped function when the
+``CMS_MODERATION_QUERY_LOGGING`` setting is on, and costs nothing otherwise.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+
+from django.db import connections
+
+from . import conf
+
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+_whitespace_re = re.compile(r"\s+")
+_in_list_re = re.compile(r"\bIN \((?:%s, )*%s\)", re.IGNORECASE)
+
+
+def fingerprint(sql):
+    """
+    Normalises `sql` so the same query run with different parameters, or
+    with IN lists of different lengths, gets the same fingerprint
+    """
+    sql = _whitespace_re.sub(" ", sql).strip()
+    return _in_list_re.sub("IN (...)", sql)
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duplicates(self):
+        """
+        Fingerprints of the queries run more than once, with their count
+        """
+        return {sql: count for sql, count in self.fingerprints.items() if count > 1}
+
+    @property
+    def duplicate_count(self):
+        """
+        Number of queries which repeat an earlier query
+        """
+        return sum(count - 1 for count in self.duplicates.values())
+
+    def __str__(self):
+        return f"{self.count} queries, {self.duplicate_count} duplicates, {self.time * 1000:.1f} ms"
+
+
+@contextmanager
+def track_queries():
+    """
+    Records the queries run on any database inside the block:
+
+        with track_queries() as stats:
+            collection.submit_for_review(user)
+        stats.count, stats.duplicates, stats.time
+    """
+    stats = QueryStats()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        yield stats
+
+
+def instrument(name):
+    """
+    Decorator logging the query statistics of each call of the decorated
+    function when ``CMS_MODERATION_QUERY_LOGGING`` is on. Recursive calls
+    are accounted to the outermost call.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            active = getattr(_local, "active", None)
+            if active is None:
+                active = _local.active = set()
+            if not conf.QUERY_LOGGING or name in active:
+                return func(*args, **kwargs)
+
+            active.add(name)
+            try:
+                with track_queries() as stats:
+                    return func(*args, **kwargs)
+            finally:
+                active.discard(name)
+                logger.info(
+                    "%s: %s", name, stats,
+                    extra={
+                        "query_count": stats.count,
+                        "query_time": stats.time,
+                        "duplicate_queries": stats.duplicates,
+                    },
+                )
+                for sql, count in sorted(stats.duplicates.items(), key=lambda item: -item[1]):
+                    logger.debug("%s: %d x %s", name, count, sql)
+        return wrapper
+    return decorator
@@ -0,0 +1,82 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from djangocms_moderation import conf
+from djangocms_moderation.retention import (
+    archive_collections,
+    get_expired_collections,
+    restore_collections,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Export archived and cancelled collections older than the retention "
+        "period to a compressed file and delete them, or restore such a file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            help=(
+                "Archive the collections which have not changed for this many days "
+                "(default: the CMS_MODERATION_RETENTION_DAYS setting)"
+            ),
+        )
+        parser.add_argument(
+            "--output",
+            help="File the collections are exported to (default: moderation-archive-<timestamp>.jsonl.gz)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of collections exported and deleted at a time",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the collections which would be archived",
+        )
+        parser.add_argument(
+            "--restore",
+            metavar="FILE",
+            help="Restore the collections of a file written by this command",
+        )
+
+    def handle(self, *args, **options):
+        if options["restore"]:
+            return self.restore(options["restore"])
+
+        days = options["days"] if options["days"] is not None else conf.RETENTION_DAYS
+        if days is None:
+            raise CommandError(
+                "Pass --days or set CMS_MODERATION_RETENTION_DAYS to archive collections."
+            )
+        collections = get_expired_collections(days)
+        if options["dry_run"]:
+            self.stdout.write(f"{collections.count()} collections would be archived")
+            return
+
+        path = options["output"] or timezone.now().strftime("moderation-archive-%Y%m%d%H%M%S.jsonl.gz")
+        try:
+            ids = archive_collections(collections, path, batch_size=options["batch_size"])
+        except FileExistsError:
+            raise CommandError(f"{path} exists already.")
+        self.stdout.write(self.style.SUCCESS(f"Archived {len(ids)} collections to {path}"))
+
+    def restore(self, path):
+        try:
+            result = restore_collections(path)
+        except FileNotFoundError:
+            raise CommandError(f"{path} does not exist.")
+        self.stdout.write(self.style.SUCCESS(f"Restored {len(result['restored'])} collections"))
+        if result["skipped"]:
+            self.stdout.write(f"Skipped the existing collections: {json.dumps(result['skipped'])}")
+        if result["failed"]:
+            self.stdout.write(self.style.WARNING(
+                f"Could not restore the collections: {json.dumps(result['failed'])}"
+            ))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from djangocms_moderation.audit import (
+    FORMATS,
+    export_audit_trail,
+    get_audit_rows,
+    parse_audit_date,
+)
+
+
+class Command(BaseCommand):
+    help = "Export the audit trail of a collection, or of the actions taken in a date range."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--collection", type=int, help="Only export this collection")
+        parser.add_argument(
+            "--start", help="Only export the actions taken from this date or datetime, in ISO format"
+        )
+        parser.add_argument(
+            "--end", help="Only export the actions taken before this date or datetime, in ISO format"
+        )
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv", dest="output_format")
+        parser.add_argument("--output", help="Write the audit trail to this file instead of the standard output")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of rows fetched from the database at a time",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start, end = (
+                parse_audit_date(options[name]) if options[name] else None
+                for name in ("start", "end")
+            )
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        rows = get_audit_rows(collection_id=options["collection"], start=start, end=end)
+        lines = export_audit_trail(rows, options["output_format"], chunk_size=options["chunk_size"])
+        if not options["output"]:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+        with open(options["output"], "w", newline="", encoding="utf-8") as f:
+            f.writelines(lines)
@@ -1,9 +1,8 @@
-from django.core.management.base import BaseCommand
+import json
 
-from djangocms_versioning import constants as versioning_constants
+from django.core.management.base import BaseCommand
 
-from djangocms_moderation import constants as moderation_constants
-from djangocms_moderation.models import ModerationRequest
+from djangocms_moderation.consistency import CHECKS
 
 
 class Command(BaseCommand):
@@ -16,36 +15,112 @@ class Command(BaseCommand):
             action="store_true",
             help="Perform the fix and commit any changes",
         )
+        checks = parser.add_mutually_exclusive_group()
+        checks.add_argument(
+            "--check",
+            action="append",
+            dest="checks",
+            choices=[check.name for check in CHECKS],
+            help=(
+                "Run the given check, can be repeated. By default only the "
+                "published_active_requests check runs."
+            ),
+        )
+        checks.add_argument(
+            "--all",
+            action="store_true",
+            dest="all_checks",
+            help="Run all the checks",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Output a JSON report instead of text",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of rows fetched from the database at a time",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of objects repaired in each transaction",
+        )
+        parser.add_argument(
+            "--max-ids",
+            type=int,
+            default=100,
+            help="Maximum number of object ids listed per check in the JSON report",
+        )
 
     def handle(self, *args, **options):
-        self.stdout.write("Running Moderation Fix States command")
+        perform_fix = options["perform_fix"]
+        as_json = options["json"]
+        if options["all_checks"]:
+            checks = CHECKS
+        elif options["checks"]:
+            checks = [check for check in CHECKS if check.name in options["checks"]]
+        else:
+            checks = [check for check in CHECKS if check.default]
 
-        # Find all objects that are left in an inconsistent state
-        items = ModerationRequest.objects.filter(
-            is_active=True,
-            collection__status=moderation_constants.ARCHIVED,
-            version__state=versioning_constants.PUBLISHED,
-        )
+        if not as_json:
+            self.stdout.write("Running Moderation Fix States command")
 
-        items_found = items.count()
-        if not items_found:
-            self.stdout.write(self.style.SUCCESS("No inconsistent ModerationRequest objects found"))
-            return
+        report = {"perform_fix": perform_fix, "checks": {}}
+        for check in checks:
+            report["checks"][check.name] = self.run_check(check, options)
 
-        self.stdout.write(self.style.WARNING("Inconsistent ModerationRequest objects found: %s" % items.count()))
-        for request in items:
-            self.stdout.write("Found ModerationRequest id: %s" % request.id)
+        if as_json:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
 
-        if not options.get('perform_fix'):
-            self.stdout.write(self.style.SUCCESS(
-                "Finished without making any changes. To make changes run this command with: --perform-fix"))
+        if not perform_fix:
+            if any(result["found"] for result in report["checks"].values()):
+                self.stdout.write(self.style.SUCCESS(
+                    "Finished without making any changes. To make changes run this command with: --perform-fix"))
             return
 
-        # Perform cleanup operations
-        self.stdout.write("Performing cleanup of inconsistent ModerationRequest object states")
-        for request in items:
-            request.is_active = False
-            request.save()
-            self.stdout.write("Repaired ModerationRequest id: %s" % request.id)
+        if any(result["repaired"] for result in report["checks"].values()):
+            self.stdout.write(self.style.SUCCESS("Finished and made the changes successfully."))
+
+    def run_check(self, check, options):
+        model_name = check.model.__name__
+        verbose = not options["json"]
+        result = {
+            "description": check.description,
+            "model": model_name,
+            "found": 0,
+            "repaired": 0,
+            "ids": [],
+        }
+        if verbose:
+            self.stdout.write(f"Checking: {check.description}")
+
+        batches = check.run(
+            perform_fix=options["perform_fix"],
+            chunk_size=options["chunk_size"],
+            batch_size=options["batch_size"],
+        )
+        for ids, repaired in batches:
+            result["found"] += len(ids)
+            result["repaired"] += repaired
+            result["ids"].extend(ids[:max(options["max_ids"] - len(result["ids"]), 0)])
+            if not verbose:
+                continue
+            for pk in ids:
+                self.stdout.write(f"Found {model_name} id: {pk}")
+            if repaired:
+                for pk in ids:
+                    self.stdout.write(f"Repaired {model_name} id: {pk}")
 
-        self.stdout.write(self.style.SUCCESS("Finished and made the changes successfully."))
+        if not verbose:
+            return result
+        if result["found"]:
+            self.stdout.write(self.style.WARNING(
+                f"Inconsistent {model_name} objects found: {result['found']}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"No inconsistent {model_name} objects found"))
+        return result
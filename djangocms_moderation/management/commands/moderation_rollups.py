@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from djangocms_moderation.rollups import rebuild_rollups, update_rollups
+
+
+class Command(BaseCommand):
+    help = "Add the moderation actions taken since the previous run to the monthly SLA rollups."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of actions added up in each transaction",
+        )
+        parser.add_argument(
+            "--settle-seconds",
+            type=int,
+            default=60,
+            help="Leave the actions taken in the last seconds to the next run",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Delete the rollups and add up all the actions again",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            rebuild_rollups()
+        added = update_rollups(
+            batch_size=options["batch_size"], settle_seconds=options["settle_seconds"]
+        )
+        self.stdout.write(f"Actions added to the rollups: {added}")
@@ -0,0 +1,48 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from djangocms_moderation.stats import get_moderation_stats
+
+
+class Command(BaseCommand):
+    help = "Show statistics of the moderation backlog."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Output the statistics as JSON",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_moderation_stats()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(stats, indent=2))
+            return
+
+        self.stdout.write("Collections:")
+        for status, count in stats["collections"].items():
+            self.stdout.write(f"  {status}: {count}")
+
+        pending = stats["pending_requests"]
+        self.stdout.write(f"Pending requests: {pending['total']}")
+        self.stdout.write(f"  Rejected, awaiting resubmission: {pending['rejected']}")
+        self.stdout.write(f"  Approved, awaiting publishing: {pending['awaiting_publishing']}")
+        if pending["oldest_date_sent"]:
+            self.stdout.write(
+                f"  Oldest sent on {pending['oldest_date_sent']} "
+                f"({pending['oldest_age_seconds']} seconds ago)"
+            )
+
+        self.stdout.write("Pending requests per workflow step:")
+        for step in stats["steps"]:
+            self.stdout.write(
+                f"  {step['workflow']} / {step['order']}. {step['role']}: {step['pending']} "
+                f"({step['rejected']} rejected, oldest sent on {step['oldest_date_sent']})"
+            )
+
+        self.stdout.write("Actions in the last 24 hours:")
+        for action, count in stats["actions_last_24_hours"].items():
+            self.stdout.write(f"  {action}: {count}")
@@ -1,5 +1,6 @@
 from django.db import models
-from django.db.models import Manager, Q
+from django.db.models import F, Manager, Q
+from django.utils import timezone
 
 from .constants import (
     ACCESS_CHILDREN,
@@ -9,6 +10,7 @@ from .constants import (
     ACCESS_PAGE_AND_DESCENDANTS,
     COLLECTING,
 )
+from .instrumentation import instrument
 
 
 class PageModerationManager(Manager):
@@ -52,6 +54,15 @@ class CollectionQuerySet(models.QuerySet):
             'workflow__steps__role__group__user_set'
         )
 
+    def touch(self):
+        """
+        Bumps the generation of the collections when they or their trees of
+        requests change, telling the clients which poll the moderation state
+        and the caches of the trees that they have changed, see
+        `djangocms_moderation.state`.
+        """
+        return self.update(generation=F("generation") + 1, date_modified=timezone.now())
+
 
 class CollectionManager(Manager):
 
@@ -64,6 +75,7 @@ class CollectionManager(Manager):
         """
         return self.get_queryset().prefetch_reviewers()
 
+    @instrument("CollectionManager.reviewers")
     def reviewers(self, collection):
         """
         Returns a set of all reviewers assigned to any ModerationRequestAction
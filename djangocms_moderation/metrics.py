@@ -0,0 +1,104 @@
+"""
+Timers and counters of the moderation operations.
+
+The metrics are passed to the callable configured with the
+``CMS_MODERATION_METRICS_BACKEND`` setting, which forwards them to the
+metrics stack of the project:
+
+    def backend(kind, name, value, tags):
+        ...
+
+`kind` is either ``"timer"``, with `value` in milliseconds, or
+``"counter"``. `tags` is a dict, for example with the workflow, the action
+and the number of items the operation worked on.
+
+Errors of the backend are logged and never reach the moderation operation,
+so an outage of the metrics stack does not block moderation.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from . import conf
+from .utils import load_backend
+
+
+logger = logging.getLogger(__name__)
+
+TIMER = "timer"
+COUNTER = "counter"
+
+
+def null_backend(kind, name, value, tags):
+    """
+    Default backend, discards the metrics
+    """
+
+
+class MemoryBackend:
+    """
+    Backend keeping the metrics in memory, meant for tests
+    """
+
+    def __init__(self):
+        self.metrics = []
+
+    def __call__(self, kind, name, value, tags):
+        self.metrics.append((kind, name, value, tags))
+
+    def clear(self):
+        self.metrics = []
+
+    def filter(self, name, kind=None):
+        return [
+            metric for metric in self.metrics
+            if metric[1] == name and kind in (None, metric[0])
+        ]
+
+
+memory_backend = MemoryBackend()
+
+
+def get_backend():
+    return load_backend(conf.METRICS_BACKEND)
+
+
+def _emit(kind, name, value, tags):
+    try:
+        get_backend()(kind, name, value, tags)
+    except Exception:
+        logger.exception("Could not emit the %s %s", kind, name)
+
+
+def increment(name, value=1, **tags):
+    _emit(COUNTER, name, value, tags)
+
+
+@contextmanager
+def timer(name, **tags):
+    """
+    Times the block and emits the duration when it ends. The tags are
+    yielded so the block can add tags only known at the end, like the
+    number of items it processed.
+    """
+    start = time.perf_counter()
+    try:
+        yield tags
+    finally:
+        _emit(TIMER, name, (time.perf_counter() - start) * 1000, tags)
+
+
+def timed(name, get_tags=None):
+    """
+    Decorator timing each call of the decorated function. `get_tags` is
+    called with the arguments of the call and returns the tags.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            tags = get_tags(*args, **kwargs) if get_tags else {}
+            with timer(name, **tags):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
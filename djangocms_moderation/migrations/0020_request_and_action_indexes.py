@@ -0,0 +1,48 @@
+from django.db import migrations, models
+
+
+def _deactivate_superseded_requests(apps, schema_editor):
+    """Keep only the newest active request of each version, so the unique
+    constraint on active requests can be created."""
+    ModerationRequest = apps.get_model("djangocms_moderation", "ModerationRequest")
+
+    newer = ModerationRequest.objects.filter(
+        version=models.OuterRef("version"), is_active=True, pk__gt=models.OuterRef("pk"),
+    )
+    ModerationRequest.objects.filter(is_active=True).filter(
+        models.Exists(newer)
+    ).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("djangocms_moderation", "0019_remove_confirmationpage_content"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="moderationrequestaction",
+            index=models.Index(
+                fields=["moderation_request", "date_taken"],
+                name="moderation_action_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="moderationrequestaction",
+            index=models.Index(
+                condition=models.Q(("is_archived", False), ("step_approved__isnull", False)),
+                fields=["moderation_request", "step_approved"],
+                name="moderation_action_approved_idx",
+            ),
+        ),
+        migrations.RunPython(_deactivate_superseded_requests, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="moderationrequest",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_active", True)),
+                fields=("version",),
+                name="moderation_one_active_request",
+            ),
+        ),
+    ]
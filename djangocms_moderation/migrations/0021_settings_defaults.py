@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:43
+
+import djangocms_moderation.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_moderation', '0020_request_and_action_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='confirmationpage',
+            name='template',
+            field=models.CharField(default=djangocms_moderation.models.get_default_confirmation_page_template, max_length=100, verbose_name='Template'),
+        ),
+        migrations.AlterField(
+            model_name='workflow',
+            name='compliance_number_backend',
+            field=models.CharField(default=djangocms_moderation.models.get_default_compliance_number_backend, max_length=255, verbose_name='compliance number backend'),
+        ),
+    ]
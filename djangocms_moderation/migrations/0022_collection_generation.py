@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_moderation', '0021_settings_defaults'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moderationcollection',
+            name='generation',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
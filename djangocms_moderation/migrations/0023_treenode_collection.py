@@ -0,0 +1,35 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("djangocms_moderation", "0022_collection_generation"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="moderationrequesttreenode",
+            name="moderation_request",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="djangocms_moderation.moderationrequest",
+                verbose_name="moderation_request",
+            ),
+        ),
+        # Nullable until 0024_collection_trees has filled it in
+        migrations.AddField(
+            model_name="moderationrequesttreenode",
+            name="collection",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="djangocms_moderation.moderationcollection",
+                verbose_name="collection",
+            ),
+        ),
+    ]
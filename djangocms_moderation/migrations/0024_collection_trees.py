@@ -0,0 +1,62 @@
+from django.db import migrations, models
+from django.db.models.functions import Concat
+
+from treebeard.numconv import NumConv
+
+
+STEPLEN = 4
+ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def _partition_trees(apps, schema_editor):
+    """Move the root nodes of the requests of each collection, and their
+    descendants, below a new root node of the collection."""
+    ModerationRequestTreeNode = apps.get_model("djangocms_moderation", "ModerationRequestTreeNode")
+
+    numconv = NumConv(ALPHABET)
+    request_roots = list(
+        ModerationRequestTreeNode.objects.filter(depth=1)
+        .order_by("path")
+        .values_list("path", "moderation_request__collection")
+    )
+    position = numconv.str2int(request_roots[-1][0]) if request_roots else 0
+    collection_roots = {}
+    for path, collection_id in request_roots:
+        if collection_id not in collection_roots:
+            position += 1
+            collection_roots[collection_id] = ModerationRequestTreeNode.objects.create(
+                collection_id=collection_id,
+                depth=1,
+                numchild=0,
+                path=numconv.int2str(position).rjust(STEPLEN, ALPHABET[0]),
+            )
+        collection_root = collection_roots[collection_id]
+        # The old paths are unique and no old path starts with the path of a
+        # new root, so prefixing them keeps them unique and in order
+        ModerationRequestTreeNode.objects.filter(path__startswith=path).update(
+            path=Concat(models.Value(collection_root.path), "path"),
+            depth=models.F("depth") + 1,
+            collection=collection_id,
+        )
+        collection_root.numchild += 1
+
+    for collection_root in collection_roots.values():
+        collection_root.save(update_fields=["numchild"])
+    # Nodes without root node are not shown in any collection
+    ModerationRequestTreeNode.objects.filter(collection__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+    """
+    Only the data of the trees, as the deferred foreign key checks of the
+    updated nodes would prevent altering their table in the same
+    transaction on PostgreSQL.
+    """
+
+    dependencies = [
+        ("djangocms_moderation", "0023_treenode_collection"),
+    ]
+
+    operations = [
+        migrations.RunPython(_partition_trees, migrations.RunPython.noop),
+    ]
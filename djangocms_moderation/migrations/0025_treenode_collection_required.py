@@ -0,0 +1,38 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("djangocms_moderation", "0024_collection_trees"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="moderationrequesttreenode",
+            name="collection",
+            field=models.ForeignKey(
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="djangocms_moderation.moderationcollection",
+                verbose_name="collection",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="moderationrequesttreenode",
+            index=models.Index(
+                fields=["collection", "depth", "path"],
+                name="moderation_tree_level_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="moderationrequesttreenode",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("depth", 1)),
+                fields=("collection",),
+                name="moderation_one_tree_root",
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('djangocms_moderation', '0025_treenode_collection_required'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moderationrequest',
+            name='content_type',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype', verbose_name='content type'),
+        ),
+        migrations.AddField(
+            model_name='moderationrequest',
+            name='title',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, verbose_name='title'),
+        ),
+        migrations.AddField(
+            model_name='moderationrequest',
+            name='version_number',
+            field=models.CharField(blank=True, editable=False, max_length=11, verbose_name='version number'),
+        ),
+    ]
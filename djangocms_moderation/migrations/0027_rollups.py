@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_moderation', '0026_request_content_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_action_id', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WorkflowRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(verbose_name='month')),
+                ('submitted', models.PositiveIntegerField(default=0, verbose_name='submitted')),
+                ('resubmitted', models.PositiveIntegerField(default=0, verbose_name='resubmitted')),
+                ('rejected', models.PositiveIntegerField(default=0, verbose_name='rejected')),
+                ('first_reviews', models.PositiveIntegerField(default=0, verbose_name='first reviews')),
+                ('first_review_seconds', models.PositiveBigIntegerField(default=0)),
+                ('workflow', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='djangocms_moderation.workflow', verbose_name='workflow')),
+            ],
+            options={
+                'verbose_name': 'Workflow report',
+                'verbose_name_plural': 'Workflow reports',
+                'ordering': ('-month', 'workflow'),
+                'unique_together': {('workflow', 'month')},
+            },
+        ),
+        migrations.CreateModel(
+            name='WorkflowStepRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(verbose_name='month')),
+                ('approvals', models.PositiveIntegerField(default=0, verbose_name='approvals')),
+                ('seconds', models.PositiveBigIntegerField(default=0)),
+                ('step', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='djangocms_moderation.workflowstep', verbose_name='step')),
+            ],
+            options={
+                'verbose_name': 'Workflow step report',
+                'verbose_name_plural': 'Workflow step reports',
+                'ordering': ('-month', 'step'),
+                'unique_together': {('step', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_moderation', '0027_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moderationrequest',
+            name='generation',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,66 @@
+from collections import defaultdict
+
+from django.apps import apps as global_apps
+from django.db import migrations
+
+
+BATCH_SIZE = 1000
+
+
+def _get_contents(content_type, object_ids):
+    """The contents of the current model of `content_type`, by id, as their
+    titles are their `__str__`, which historical models don't have."""
+    try:
+        model = global_apps.get_model(content_type.app_label, content_type.model)
+    except LookupError:
+        return {}
+    return model._base_manager.in_bulk(object_ids)
+
+
+def _fill_content_fields(apps, schema_editor):
+    """Copy the title, content type and number of the version of the
+    existing requests, `BATCH_SIZE` requests at a time."""
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    ModerationRequest = apps.get_model("djangocms_moderation", "ModerationRequest")
+
+    last_id = 0
+    while True:
+        moderation_requests = list(
+            ModerationRequest.objects.filter(content_type__isnull=True, pk__gt=last_id)
+            .select_related("version")
+            .order_by("pk")[:BATCH_SIZE]
+        )
+        if not moderation_requests:
+            return
+        last_id = moderation_requests[-1].pk
+
+        object_ids = defaultdict(set)
+        for moderation_request in moderation_requests:
+            version = moderation_request.version
+            object_ids[version.content_type_id].add(version.object_id)
+        contents = {}
+        for content_type in ContentType.objects.filter(pk__in=object_ids):
+            for object_id, content in _get_contents(content_type, object_ids[content_type.pk]).items():
+                contents[content_type.pk, object_id] = content
+
+        for moderation_request in moderation_requests:
+            version = moderation_request.version
+            content = contents.get((version.content_type_id, version.object_id))
+            moderation_request.title = "" if content is None else str(content)[:255]
+            moderation_request.content_type_id = version.content_type_id
+            moderation_request.version_number = str(version.number)
+        ModerationRequest.objects.bulk_update(
+            moderation_requests, ["title", "content_type", "version_number"]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("djangocms_moderation", "0028_request_generation"),
+        ("djangocms_versioning", "0013_auto_20181005_1404"),
+    ]
+
+    operations = [
+        migrations.RunPython(_fill_content_fields, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,14 @@
 import json
+from collections import defaultdict
+from datetime import timedelta
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
+from django.db.models import prefetch_related_objects
 from django.urls import reverse
 from django.utils.functional import cached_property
 from django.utils.translation import gettext, gettext_lazy as _
@@ -16,11 +20,13 @@ from djangocms_versioning.models import Version
 from treebeard.mp_tree import MP_Node
 
 from .emails import notify_collection_moderators
+from .exceptions import AlreadyActioned
+from .instrumentation import instrument
 from .managers import CollectionManager
 from .utils import generate_compliance_number
 
 
-from . import conf, constants, signals  # isort:skip
+from . import conf, constants, metrics, signals, snapshots  # isort:skip
 
 
 try:
@@ -33,6 +39,17 @@ except ImportError:
         return version.created_by == user
 
 
+# The defaults and choices of some fields come from the settings. They are
+# resolved when needed, so that changing the settings needs no migration,
+# see also `admin.SettingsChoicesMixin`
+def get_default_confirmation_page_template():
+    return conf.DEFAULT_CONFIRMATION_PAGE_TEMPLATE
+
+
+def get_default_compliance_number_backend():
+    return conf.DEFAULT_COMPLIANCE_NUMBER_BACKEND
+
+
 class ConfirmationPage(models.Model):
     CONTENT_TYPES = (
         (constants.CONTENT_TYPE_PLAIN, _("Plain")),
@@ -50,6 +67,7 @@ class ConfirmationPage(models.Model):
     template = models.CharField(
         verbose_name=_("Template"),
         max_length=100,
+        default=get_default_confirmation_page_template,
     )
 
     class Meta:
@@ -59,11 +77,6 @@ class ConfirmationPage(models.Model):
     def __str__(self):
         return self.name
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._meta.get_field("template").choices = conf.CONFIRMATION_PAGE_TEMPLATES
-        self._meta.get_field("template").default = conf.DEFAULT_CONFIRMATION_PAGE_TEMPLATE
-
     def get_absolute_url(self):
         return reverse("admin:cms_moderation_confirmation_page", args=(self.pk,))
 
@@ -158,6 +171,7 @@ class Workflow(models.Model):
     compliance_number_backend = models.CharField(
         verbose_name=_("compliance number backend"),
         max_length=255,
+        default=get_default_compliance_number_backend,
     )
 
     class Meta:
@@ -168,13 +182,6 @@ class Workflow(models.Model):
     def __str__(self):
         return self.name
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._meta.get_field("compliance_number_backend").choices = conf.COMPLIANCE_NUMBER_BACKENDS
-        self._meta.get_field("compliance_number_backend").default = conf.DEFAULT_COMPLIANCE_NUMBER_BACKEND
-        if not self.compliance_number_backend:
-            self.compliance_number_backend = conf.DEFAULT_COMPLIANCE_NUMBER_BACKEND
-
     def clean(self):
         if not self.is_default:
             return
@@ -252,6 +259,9 @@ class ModerationCollection(models.Model):
     )
     date_created = models.DateTimeField(auto_now_add=True)
     date_modified = models.DateTimeField(auto_now=True)
+    # Bumped on every change of the collection and of its tree of requests,
+    # see `CollectionQuerySet.touch`
+    generation = models.PositiveIntegerField(default=0, editable=False)
 
     objects = CollectionManager()
 
@@ -265,6 +275,21 @@ class ModerationCollection(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, **kwargs):
+        if self._state.adding:
+            return super().save(**kwargs)
+        # The generation is only changed by `touch`, so that saving a
+        # collection loaded before another change doesn't take it back
+        update_fields = kwargs.pop("update_fields", None)
+        if update_fields is None:
+            update_fields = [
+                field.name for field in self._meta.concrete_fields if not field.primary_key
+            ]
+        super().save(
+            update_fields=[name for name in update_fields if name != "generation"], **kwargs
+        )
+        ModerationCollection.objects.filter(pk=self.pk).touch()
+
     @property
     def job_id(self):
         return f"{self.pk}"
@@ -298,12 +323,18 @@ class ModerationCollection(models.Model):
             ]
         )
 
+    @instrument("ModerationCollection.submit_for_review")
+    @metrics.timed(
+        "moderation.submit_for_review",
+        lambda collection, *args, **kwargs: {"workflow": collection.workflow_id},
+    )
     def submit_for_review(self, by_user, to_user=None):
         """
         Submit all the moderation requests belonging to this collection for
         review and mark the collection as locked
         """
-        for moderation_request in self.moderation_requests.all():
+        moderation_requests = list(self.moderation_requests.all())
+        for moderation_request in moderation_requests:
             action = moderation_request.actions.create(
                 by_user=by_user, to_user=to_user, action=constants.ACTION_STARTED
             )
@@ -324,6 +355,9 @@ class ModerationCollection(models.Model):
             user=by_user,
             rework=False,
         )
+        metrics.increment(
+            "moderation.requests_submitted", len(moderation_requests), workflow=self.workflow_id
+        )
 
     def is_cancellable(self, user):
         return all(
@@ -360,6 +394,14 @@ class ModerationCollection(models.Model):
                 return False
         return True
 
+    def get_root_nodes(self):
+        """
+        Tree nodes of the requests at the top of the tree of this collection,
+        the children of the root node of the collection
+        """
+        return ModerationRequestTreeNode.objects.filter(collection=self, depth=2).order_by("path")
+
+    @instrument("ModerationCollection.add_version")
     def add_version(self, version, parent=None, include_children=False):
         """
         Add version to the ModerationRequest in this collection.
@@ -373,29 +415,89 @@ class ModerationCollection(models.Model):
         if created:
             added_items += 1
 
-        # if no parent and a root node with that moderation request
-        # doesn't exist, it should be created
-        create_root_node = (
-            parent is None and
-            not ModerationRequestTreeNode.get_root_nodes().filter(moderation_request=moderation_request).exists()
-        )
-        # if parent passed and a child node with that moderation request
-        # doesn't exist under the parent, it should be created
-        create_child_node = (
-            parent is not None and
-            not parent.get_children().filter(moderation_request=moderation_request).exists()
-        )
-        node = ModerationRequestTreeNode(moderation_request=moderation_request)
-        if create_root_node:
-            ModerationRequestTreeNode.add_root(instance=node)
-        elif create_child_node:
-            parent.add_child(instance=node)
+        if parent is None:
+            # if no parent and a root node with that moderation request
+            # doesn't exist, it should be created
+            node = self.get_root_nodes().filter(moderation_request=moderation_request).first()
+            if node is None:
+                [node] = ModerationRequestTreeNode.add_roots([moderation_request])
+        else:
+            # if parent passed and a child node with that moderation request
+            # doesn't exist under the parent, it should be created
+            node = ModerationRequestTreeNode(moderation_request=moderation_request, collection=self)
+            if not parent.get_children().filter(moderation_request=moderation_request).exists():
+                parent.add_child(instance=node)
 
         if include_children:
             added_items += self._add_nested_children(version, node)
 
+        ModerationCollection.objects.filter(pk=self.pk).touch()
         return moderation_request, added_items
 
+    @instrument("ModerationCollection.add_versions")
+    @transaction.atomic
+    def add_versions(self, versions, include_children=False):
+        """
+        Bulk version of `add_version`: adds all `versions` to this collection
+        as root moderation requests, in the given order, creating the missing
+        ModerationRequest objects and tree nodes with one query each.
+        `include_children` is either a boolean or the ids of the versions
+        whose nested children are added too.
+        Requires validation from .forms.CollectionItemForm, the versions
+        which meanwhile got an active request elsewhere are skipped.
+        :return: <int> number of moderation requests added
+        """
+        # Without duplicates, which would get two root nodes
+        versions = list({version.pk: version for version in versions}.values())
+        existing_requests = self.moderation_requests.filter(version__in=versions)
+        existing_version_ids = set(existing_requests.values_list("version_id", flat=True))
+        new_requests = [
+            ModerationRequest(version=version, collection=self, author=self.author)
+            for version in versions
+            if version.pk not in existing_version_ids
+        ]
+        # The content of the versions gives the requests their title
+        prefetch_related_objects([mr.version for mr in new_requests], "content")
+        for moderation_request in new_requests:
+            moderation_request.set_content_fields()
+        ModerationRequest.objects.bulk_create(new_requests, ignore_conflicts=True)
+        moderation_requests = {
+            mr.version_id: mr
+            for mr in self.moderation_requests.filter(version__in=versions)
+        }
+        # The versions which got an active request in another collection
+        # since they were validated were left out by the unique constraint
+        versions = [version for version in versions if version.pk in moderation_requests]
+        added_items = len(moderation_requests) - len(existing_version_ids)
+
+        root_nodes = {
+            node.moderation_request_id: node
+            for node in self.get_root_nodes().filter(
+                moderation_request__in=moderation_requests.values()
+            )
+        }
+        new_root_nodes = ModerationRequestTreeNode.add_roots(
+            [
+                moderation_requests[version.pk]
+                for version in versions
+                if moderation_requests[version.pk].pk not in root_nodes
+            ]
+        )
+        root_nodes.update(
+            (node.moderation_request_id, node) for node in new_root_nodes
+        )
+
+        if include_children:
+            for version in versions:
+                if include_children is not True and version.pk not in include_children:
+                    continue
+                moderation_request = moderation_requests[version.pk]
+                added_items += self._add_nested_children(
+                    version, root_nodes[moderation_request.pk]
+                )
+        ModerationCollection.objects.filter(pk=self.pk).touch()
+        return added_items
+
     def _add_nested_children(self, version, parent_node):
         """Helper method which finds moderated children and adds them to the collection"""
         from .helpers import get_moderated_children_from_placeholder
@@ -405,9 +507,12 @@ class ModerationCollection(models.Model):
         if not getattr(parent, "get_placeholders", None):
             return added_items
         for placeholder in parent.get_placeholders():
-            for child_version in get_moderated_children_from_placeholder(
-                placeholder, version.versionable.grouping_values(parent)
-            ):
+            with metrics.timer("moderation.nested_children", workflow=self.workflow_id) as tags:
+                child_versions = list(get_moderated_children_from_placeholder(
+                    placeholder, version.versionable.grouping_values(parent)
+                ))
+                tags["items"] = len(child_versions)
+            for child_version in child_versions:
                 # Don't add the version if it's already part of the collection or locked by another user
                 if version_is_unlocked_for_moderation(child_version, version.created_by):
                     moderation_request, _added_items = self.add_version(
@@ -420,18 +525,114 @@ class ModerationCollection(models.Model):
 
 
 class ModerationRequestTreeNode(MP_Node):
+    """
+    The requests of each collection are organised in a tree of their own,
+    below a root node of the collection without request, so that adding
+    requests to a collection only reads and writes the paths of its tree.
+    """
     moderation_request = models.ForeignKey(
         to='ModerationRequest',
         verbose_name=_('moderation_request'),
         on_delete=models.CASCADE,
+        # None for the root node of a collection
+        null=True,
+    )
+    collection = models.ForeignKey(
+        to=ModerationCollection,
+        verbose_name=_('collection'),
+        related_name='+',
+        on_delete=models.CASCADE,
+        editable=False,
     )
 
     class Meta:
         ordering = ('id',)
+        indexes = [
+            # The levels of the tree of a collection in path order
+            models.Index(
+                fields=["collection", "depth", "path"],
+                name="moderation_tree_level_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["collection"],
+                condition=models.Q(depth=1),
+                name="moderation_one_tree_root",
+            ),
+        ]
 
     def __str__(self):
         return str(self.id)
 
+    def add_child(self, **kwargs):
+        """
+        Adds a child node in the tree of the collection of this node
+        """
+        if "instance" in kwargs:
+            kwargs["instance"].collection_id = self.collection_id
+        else:
+            kwargs["collection_id"] = self.collection_id
+        return super().add_child(**kwargs)
+
+    @classmethod
+    def get_collection_root(cls, collection_id):
+        """
+        The root node of the tree of the collection `collection_id`, created
+        on first use. Collections which create their root at the same time
+        may race for the same root path, the loser takes the next one.
+        """
+        attempts = 3
+        root = cls.objects.filter(collection=collection_id, depth=1).first()
+        while root is None:
+            try:
+                root = cls.add_root(collection_id=collection_id)
+            except IntegrityError:
+                attempts -= 1
+                if not attempts:
+                    raise
+                root = cls.objects.filter(collection=collection_id, depth=1).first()
+        return root
+
+    @classmethod
+    def add_roots(cls, moderation_requests):
+        """
+        Bulk version of `add_root`: adds a node for each of
+        `moderation_requests` at the top of the tree of its collection,
+        computing the paths in one pass per collection and saving all the
+        nodes with one query. The positions follow the last node of the
+        collection, whatever the number of children recorded on its root.
+        :return: list of <ModerationRequestTreeNode>
+        """
+        requests_by_collection = defaultdict(list)
+        for moderation_request in moderation_requests:
+            requests_by_collection[moderation_request.collection_id].append(moderation_request)
+
+        nodes = []
+        for collection_id, collection_requests in requests_by_collection.items():
+            root = cls.get_collection_root(collection_id)
+            last_path = (
+                cls.objects.filter(collection=collection_id, depth=2)
+                .order_by("-path")
+                .values_list("path", flat=True)
+                .first()
+            )
+            last_position = cls._str2int(last_path[-cls.steplen:]) if last_path else 0
+            nodes += [
+                cls(
+                    moderation_request=moderation_request,
+                    collection_id=collection_id,
+                    depth=2,
+                    numchild=0,
+                    path=cls._get_path(root.path, 2, position),
+                )
+                for position, moderation_request in enumerate(
+                    collection_requests, start=last_position + 1
+                )
+            ]
+            cls.objects.filter(pk=root.pk).update(numchild=models.F("numchild") + len(collection_requests))
+        return cls.objects.bulk_create(nodes)
+
 
 class ModerationRequest(models.Model):
     collection = models.ForeignKey(
@@ -449,6 +650,8 @@ class ModerationRequest(models.Model):
         verbose_name=_("is active"), default=True, db_index=True
     )
     date_sent = models.DateTimeField(verbose_name=_("date sent"), auto_now_add=True)
+    # Bumped by every action taken on the request, see `update_status`
+    generation = models.PositiveIntegerField(default=0, editable=False)
     compliance_number = models.CharField(
         verbose_name=_("compliance number"),
         max_length=32,
@@ -463,19 +666,54 @@ class ModerationRequest(models.Model):
         related_name="+",
         on_delete=models.CASCADE,
     )
+    # Copied from the version when the request is created and resubmitted,
+    # so that requests are searched and sorted without loading their content
+    title = models.CharField(
+        verbose_name=_("title"), max_length=255, blank=True, db_index=True, editable=False,
+    )
+    content_type = models.ForeignKey(
+        to=ContentType,
+        verbose_name=_("content type"),
+        related_name="+",
+        null=True,
+        on_delete=models.CASCADE,
+        editable=False,
+    )
+    version_number = models.CharField(
+        verbose_name=_("version number"), max_length=11, blank=True, editable=False,
+    )
 
     class Meta:
         verbose_name = _("Request")
         verbose_name_plural = _("Requests")
         unique_together = ("collection", "version")
         ordering = ["id"]
+        constraints = [
+            # A version is moderated by at most one active request, which
+            # `get_active_moderation_request` looks up
+            models.UniqueConstraint(
+                fields=["version"],
+                condition=models.Q(is_active=True),
+                name="moderation_one_active_request",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.pk} {self.version_id}"
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._meta.get_field("language").choices = settings.LANGUAGES
+    def save(self, **kwargs):
+        if self._state.adding and self.content_type_id is None:
+            self.set_content_fields()
+        super().save(**kwargs)
+
+    def set_content_fields(self):
+        """
+        Copies the title, content type and number of the version, which
+        the requests are searched and sorted by
+        """
+        self.title = str(self.version.content)[:255]
+        self.content_type_id = self.version.content_type_id
+        self.version_number = str(self.version.number)
 
     @cached_property
     def workflow(self):
@@ -497,13 +735,34 @@ class ModerationRequest(models.Model):
         last_action = self.get_last_action()
         return last_action and last_action.action == constants.ACTION_REJECTED
 
+    @instrument("ModerationRequest.update_status")
+    @metrics.timed(
+        "moderation.update_status",
+        lambda request, action, *args, **kwargs: {
+            "action": action, "workflow": request.collection.workflow_id,
+        },
+    )
     @transaction.atomic
     def update_status(self, action, by_user, message="", to_user=None):
+        """
+        Takes `action` on the request. The request is locked first, and
+        approvals, rejections and resubmissions are validated again under
+        the lock, raising AlreadyActioned when a concurrent action got there
+        first, for example when two reviewers approve the same step.
+        """
         is_approved = action == constants.ACTION_APPROVED
         is_rejected = action == constants.ACTION_REJECTED
 
+        self.lock()
+        if action in constants.REVIEW_ACTIONS:
+            was_rejected = bool(self.is_rejected())
+            if was_rejected != (action == constants.ACTION_RESUBMITTED):
+                raise AlreadyActioned
+
         if is_approved:
             step_approved = self.user_get_step(by_user)
+            if step_approved is None:
+                raise AlreadyActioned
         else:
             step_approved = None
 
@@ -512,6 +771,8 @@ class ModerationRequest(models.Model):
             # the content author, so lets mark all the actions taken
             # so far as archived. They need to be re-taken
             self.actions.all().update(is_archived=True)
+            # The author may change the version before resubmitting it
+            snapshots.delete_preview_snapshots([self.version_id])
 
         # If request is Rejected or Resubmitted, it still counts as active
         # as rejected means it is submitted back to the content author
@@ -521,7 +782,15 @@ class ModerationRequest(models.Model):
             constants.ACTION_REJECTED,
             constants.ACTION_RESUBMITTED,
         )
-        self.save(update_fields=["is_active"])
+        # Tells the clients which poll the moderation state that it has
+        # changed, see `djangocms_moderation.state`
+        self.generation += 1
+        update_fields = ["is_active", "generation"]
+        if action == constants.ACTION_RESUBMITTED:
+            # The version may have been changed since it was rejected
+            self.set_content_fields()
+            update_fields += ["title", "content_type", "version_number"]
+        self.save(update_fields=update_fields)
 
         self.actions.create(
             by_user=by_user,
@@ -533,6 +802,18 @@ class ModerationRequest(models.Model):
 
         if self.should_set_compliance_number():
             self.set_compliance_number()
+        metrics.increment("moderation.actions", action=action, workflow=self.collection.workflow_id)
+
+    def lock(self):
+        """
+        Locks the request until the end of the transaction, waiting for the
+        concurrent actions on it, and reloads its state
+        """
+        self.is_active, self.generation = (
+            ModerationRequest.objects.select_for_update()
+            .values_list("is_active", "generation")
+            .get(pk=self.pk)
+        )
 
     def should_set_compliance_number(self):
         """
@@ -637,7 +918,8 @@ class ModerationRequest(models.Model):
 
     def set_compliance_number(self):
         self.compliance_number = generate_compliance_number(
-            self.workflow.compliance_number_backend, moderation_request=self
+            self.workflow.compliance_number_backend or conf.DEFAULT_COMPLIANCE_NUMBER_BACKEND,
+            moderation_request=self,
         )
         self.save(update_fields=["compliance_number"])
 
@@ -698,6 +980,19 @@ class ModerationRequestAction(models.Model):
         ordering = ("date_taken",)
         verbose_name = _("Action")
         verbose_name_plural = _("Actions")
+        indexes = [
+            # The first and last actions of a request
+            models.Index(
+                fields=["moderation_request", "date_taken"],
+                name="moderation_action_date_idx",
+            ),
+            # The steps approved so far, see `get_pending_steps`
+            models.Index(
+                fields=["moderation_request", "step_approved"],
+                condition=models.Q(step_approved__isnull=False, is_archived=False),
+                name="moderation_action_approved_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.moderation_request_id} - {self.get_action_display()}"
@@ -805,3 +1100,83 @@ class ConfirmationFormSubmission(models.Model):
 
     def get_form_data(self):
         return json.loads(self.data)
+
+
+class WorkflowRollup(models.Model):
+    """
+    Monthly totals of the actions taken on the requests of a workflow, which
+    are added up by the `moderation_rollups` command, see
+    `djangocms_moderation.rollups`
+    """
+    workflow = models.ForeignKey(
+        to=Workflow, verbose_name=_("workflow"), related_name="+", on_delete=models.CASCADE,
+    )
+    month = models.DateField(verbose_name=_("month"))
+    submitted = models.PositiveIntegerField(verbose_name=_("submitted"), default=0)
+    resubmitted = models.PositiveIntegerField(verbose_name=_("resubmitted"), default=0)
+    rejected = models.PositiveIntegerField(verbose_name=_("rejected"), default=0)
+    # Requests reviewed for the first time, and the seconds from their
+    # submission to that review
+    first_reviews = models.PositiveIntegerField(verbose_name=_("first reviews"), default=0)
+    first_review_seconds = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = _("Workflow report")
+        verbose_name_plural = _("Workflow reports")
+        unique_together = ("workflow", "month")
+        ordering = ("-month", "workflow")
+
+    def __str__(self):
+        return f"{self.workflow_id} {self.month:%Y-%m}"
+
+    @property
+    def average_first_review(self):
+        if not self.first_reviews:
+            return None
+        return timedelta(seconds=self.first_review_seconds / self.first_reviews)
+
+    @property
+    def rework_rate(self):
+        """Rejections per submitted request"""
+        if not self.submitted:
+            return None
+        return self.rejected / self.submitted
+
+
+class WorkflowStepRollup(models.Model):
+    """
+    Monthly totals of the approvals of a workflow step, and the seconds the
+    requests waited for them since their previous action
+    """
+    step = models.ForeignKey(
+        to=WorkflowStep, verbose_name=_("step"), related_name="+", on_delete=models.CASCADE,
+    )
+    month = models.DateField(verbose_name=_("month"))
+    approvals = models.PositiveIntegerField(verbose_name=_("approvals"), default=0)
+    seconds = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = _("Workflow step report")
+        verbose_name_plural = _("Workflow step reports")
+        unique_together = ("step", "month")
+        ordering = ("-month", "step")
+
+    def __str__(self):
+        return f"{self.step_id} {self.month:%Y-%m}"
+
+    @property
+    def average_time(self):
+        if not self.approvals:
+            return None
+        return timedelta(seconds=self.seconds / self.approvals)
+
+
+class RollupWatermark(models.Model):
+    """
+    Id of the last action added up to the rollups named `name`
+    """
+    name = models.CharField(max_length=50, unique=True)
+    last_action_id = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.last_action_id}"
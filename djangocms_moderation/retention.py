@@ -0,0 +1,160 @@
+"""
+Archival of the history of finished moderation collections.
+
+Archived and cancelled collections are exported with their comments,
+requests, actions, form submissions and tree nodes to a gzipped JSON lines
+file, one collection per line, and then deleted. The objects are serialized
+with Django's serialization framework, so a file can be restored for an
+audit with the original primary keys.
+"""
+import gzip
+import json
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core import serializers
+from django.core.serializers.base import DeserializationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import constants
+from .models import (
+    CollectionComment,
+    ConfirmationFormSubmission,
+    ModerationCollection,
+    ModerationRequest,
+    ModerationRequestAction,
+    ModerationRequestTreeNode,
+    RequestComment,
+)
+from .utils import chunked
+
+
+FINISHED_STATUSES = (constants.ARCHIVED, constants.CANCELLED)
+
+# The archived models with the lookup of their collection, in an order they
+# can be restored in
+ARCHIVED_MODELS = (
+    (ModerationCollection, "pk"),
+    (CollectionComment, "collection"),
+    (ModerationRequest, "collection"),
+    (ModerationRequestAction, "moderation_request__collection"),
+    (RequestComment, "moderation_request__collection"),
+    (ConfirmationFormSubmission, "moderation_request__collection"),
+    (ModerationRequestTreeNode, "collection"),
+)
+
+
+def get_expired_collections(days):
+    """
+    Archived and cancelled collections which have not changed for `days` days
+    """
+    return ModerationCollection.objects.filter(
+        status__in=FINISHED_STATUSES,
+        date_modified__lt=timezone.now() - timedelta(days=days),
+    )
+
+
+def export_collections(collection_ids, fileobj):
+    """
+    Writes a JSON line per collection of `collection_ids` to `fileobj`,
+    holding the collection and all its objects. Runs a query per model.
+    """
+    objects = defaultdict(list)
+    for model, lookup in ARCHIVED_MODELS:
+        queryset = (
+            model._base_manager.filter(**{f"{lookup}__in": collection_ids})
+            .annotate(archived_collection_id=F(lookup))
+            # Tree nodes are restored parents first
+            .order_by("path" if model is ModerationRequestTreeNode else "pk")
+        )
+        for obj in queryset:
+            objects[obj.archived_collection_id].append(obj)
+
+    for collection_id in collection_ids:
+        line = {
+            "collection": collection_id,
+            "objects": serializers.serialize("python", objects[collection_id]),
+        }
+        fileobj.write(json.dumps(line, cls=DjangoJSONEncoder) + "\n")
+
+
+def archive_collections(collections, path, batch_size=100):
+    """
+    Exports `collections` to the gzipped JSON lines file `path`, which must
+    not exist, then deletes them `batch_size` collections per transaction.
+    Nothing is deleted until the file is complete.
+    :return: <list> ids of the archived collections
+    """
+    ids = list(collections.order_by("pk").values_list("pk", flat=True))
+    with gzip.open(path, "xt", encoding="utf-8") as fileobj:
+        for batch in chunked(ids, batch_size):
+            export_collections(batch, fileobj)
+
+    for batch in chunked(ids, batch_size):
+        with transaction.atomic():
+            ModerationCollection.objects.filter(pk__in=batch).delete()
+    return ids
+
+
+def _move_to_new_roots(nodes):
+    """
+    Gives the restored tree `nodes` new root positions after the existing
+    roots, as new collections may have taken their original paths
+    """
+    steplen = ModerationRequestTreeNode.steplen
+    last_root = ModerationRequestTreeNode.get_last_root_node()
+    position = last_root._get_lastpos_in_path() if last_root else 0
+    roots = {}
+    for node in nodes:
+        root = node.path[:steplen]
+        if root not in roots:
+            position += 1
+            roots[root] = ModerationRequestTreeNode._get_path(None, 1, position)
+        node.path = roots[root] + node.path[steplen:]
+
+
+def restore_collection(objects):
+    """
+    Saves the serialized `objects` of an archived collection. Like
+    `loaddata`, checks the foreign keys at once, so that objects related to
+    deleted objects raise an IntegrityError.
+    """
+    nodes = []
+    for deserialized in serializers.deserialize("python", objects):
+        if isinstance(deserialized.object, ModerationRequestTreeNode):
+            nodes.append(deserialized)
+        else:
+            deserialized.save()
+    _move_to_new_roots([node.object for node in nodes])
+    for node in nodes:
+        node.save()
+    connection.check_constraints(table_names=[model._meta.db_table for model, _ in ARCHIVED_MODELS])
+
+
+def restore_collections(path):
+    """
+    Restores the collections of the file `path` written by
+    `archive_collections`, each in its own transaction. Collections which
+    exist are skipped, and the ones which can't be restored, for example
+    because their versions have been deleted since, are left out.
+    :return: <dict> ids of the `restored`, `skipped` and `failed` collections
+    """
+    result = {"restored": [], "skipped": [], "failed": []}
+    with gzip.open(path, "rt", encoding="utf-8") as fileobj:
+        for line in fileobj:
+            data = json.loads(line)
+            collection_id = data["collection"]
+            if ModerationCollection.objects.filter(pk=collection_id).exists():
+                result["skipped"].append(collection_id)
+                continue
+            try:
+                with transaction.atomic():
+                    restore_collection(data["objects"])
+            except (DeserializationError, IntegrityError):
+                result["failed"].append(collection_id)
+            else:
+                result["restored"].append(collection_id)
+    return result
@@ -0,0 +1,190 @@
+"""
+Monthly rollups of the moderation actions, for the SLA reports.
+
+The `moderation_rollups` command adds the actions taken since its previous
+run, remembered as the id of the last action it added up, to the totals of
+their workflow and month (`WorkflowRollup`) and of their workflow step and
+month (`WorkflowStepRollup`). The durations need the earlier actions of the
+same requests, which are read with window functions on the databases which
+support them, and in one ordered pass in Python on the others. The reports
+of the admin only read the rollups.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Count, DateField, F, Q, RowRange, Window
+from django.db.models.functions import FirstValue, Lag, TruncMonth
+from django.utils import timezone
+
+from . import constants
+from .models import (
+    ModerationRequestAction,
+    RollupWatermark,
+    WorkflowRollup,
+    WorkflowStepRollup,
+)
+
+
+WATERMARK = "actions"
+
+REVIEW_ACTIONS = (constants.ACTION_APPROVED, constants.ACTION_REJECTED)
+
+
+def _with_earlier_actions_in_python(rows):
+    """
+    Gives the `rows` of the actions, ordered by request and date, the date
+    of the previous action and of the first action of their request, and
+    the number of reviews of their request before them
+    """
+    request_id = None
+    for row in rows:
+        if row["moderation_request"] != request_id:
+            request_id = row["moderation_request"]
+            previous_date = None
+            submitted_date = row["date_taken"]
+            reviews = 0
+        row.update(previous_date=previous_date, submitted_date=submitted_date, reviews_before=reviews)
+        yield row
+        previous_date = row["date_taken"]
+        reviews += row["action"] in REVIEW_ACTIONS
+
+
+def get_action_rows(moderation_requests):
+    """
+    All the actions of `moderation_requests`, as dicts with their workflow
+    and month, the date of the previous action and of the first action of
+    their request, and the number of reviews of their request before them
+    """
+    rows = ModerationRequestAction.objects.filter(
+        moderation_request__in=moderation_requests,
+    ).values(
+        "pk",
+        "moderation_request",
+        "action",
+        "step_approved",
+        "date_taken",
+        workflow=F("moderation_request__collection__workflow"),
+        month=TruncMonth("date_taken", output_field=DateField()),
+    ).order_by("moderation_request", "date_taken", "pk")
+    if not connection.features.supports_over_clause:
+        return _with_earlier_actions_in_python(rows.iterator())
+
+    window = {
+        "partition_by": [F("moderation_request")],
+        "order_by": [F("date_taken").asc(), F("pk").asc()],
+    }
+    return rows.annotate(
+        previous_date=Window(Lag("date_taken"), **window),
+        submitted_date=Window(FirstValue("date_taken"), **window),
+        reviews_before=Window(
+            Count("pk", filter=Q(action__in=REVIEW_ACTIONS)),
+            frame=RowRange(start=None, end=-1),
+            **window,
+        ),
+    ).iterator()
+
+
+def _seconds(duration):
+    return max(int(duration.total_seconds()), 0)
+
+
+def add_up(rows, after_id, last_id):
+    """
+    Totals of the actions of `rows` with an id in (`after_id`, `last_id`],
+    by workflow and month, and by workflow step and month
+    """
+    workflows = defaultdict(Counter)
+    steps = defaultdict(Counter)
+    for row in rows:
+        if not after_id < row["pk"] <= last_id:
+            continue
+        action = row["action"]
+        totals = workflows[row["workflow"], row["month"]]
+        if action == constants.ACTION_STARTED:
+            totals["submitted"] += 1
+        elif action == constants.ACTION_RESUBMITTED:
+            totals["resubmitted"] += 1
+        elif action == constants.ACTION_REJECTED:
+            totals["rejected"] += 1
+        if action in REVIEW_ACTIONS and not row["reviews_before"]:
+            totals["first_reviews"] += 1
+            totals["first_review_seconds"] += _seconds(row["date_taken"] - row["submitted_date"])
+        if action == constants.ACTION_APPROVED and row["step_approved"] and row["previous_date"]:
+            step_totals = steps[row["step_approved"], row["month"]]
+            step_totals["approvals"] += 1
+            step_totals["seconds"] += _seconds(row["date_taken"] - row["previous_date"])
+    return workflows, steps
+
+
+def _save(model, key, totals):
+    """
+    Adds `totals` by (`key` id, month) to the rollups of `model`
+    """
+    # Actions which are only counted in the other rollups leave empty totals
+    totals = {key_month: counts for key_month, counts in totals.items() if counts}
+    if not totals:
+        return
+    rollups = model.objects.order_by().filter(**{
+        f"{key}__in": {key_id for key_id, _month in totals},
+        "month__in": {month for _key_id, month in totals},
+    })
+    existing = {(getattr(rollup, f"{key}_id"), rollup.month): rollup for rollup in rollups}
+    new = []
+    fields = set()
+    for (key_id, month), counts in totals.items():
+        rollup = existing.get((key_id, month))
+        if rollup is None:
+            rollup = model(**{f"{key}_id": key_id, "month": month})
+            new.append(rollup)
+        for field, value in counts.items():
+            setattr(rollup, field, getattr(rollup, field) + value)
+            fields.add(field)
+    if existing:
+        model.objects.bulk_update(existing.values(), sorted(fields))
+    model.objects.bulk_create(new)
+
+
+def update_rollups(batch_size=5000, settle_seconds=0):
+    """
+    Adds the actions taken since the last update, and at least
+    `settle_seconds` ago, to the rollups, `batch_size` actions at a time,
+    each batch in its own transaction. Concurrent updates wait for each
+    other.
+    :return: <int> number of actions added up
+    """
+    cutoff = timezone.now() - timedelta(seconds=settle_seconds)
+    added = 0
+    while True:
+        with transaction.atomic():
+            watermark, _created = RollupWatermark.objects.select_for_update().get_or_create(name=WATERMARK)
+            action_ids = list(
+                ModerationRequestAction.objects.filter(
+                    pk__gt=watermark.last_action_id, date_taken__lte=cutoff,
+                ).order_by("pk").values_list("pk", flat=True)[:batch_size]
+            )
+            if not action_ids:
+                return added
+            new_actions = ModerationRequestAction.objects.filter(
+                pk__gt=watermark.last_action_id, pk__lte=action_ids[-1],
+            )
+            workflows, steps = add_up(
+                get_action_rows(new_actions.values("moderation_request")),
+                watermark.last_action_id,
+                action_ids[-1],
+            )
+            _save(WorkflowRollup, "workflow", workflows)
+            _save(WorkflowStepRollup, "step", steps)
+            watermark.last_action_id = action_ids[-1]
+            watermark.save(update_fields=["last_action_id"])
+        added += len(action_ids)
+
+
+@transaction.atomic
+def rebuild_rollups():
+    """
+    Deletes the rollups, so that the next update adds up all the actions
+    """
+    RollupWatermark.objects.filter(name=WATERMARK).delete()
+    WorkflowRollup.objects.all().delete()
+    WorkflowStepRollup.objects.all().delete()
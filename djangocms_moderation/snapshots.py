@@ -0,0 +1,69 @@
+"""
+Snapshots of the previews of the versions in review.
+
+With ``CMS_MODERATION_PREVIEW_SNAPSHOTS``, the versions submitted or
+resubmitted for review are rendered once, without the toolbar, after the
+submission is committed, and the preview links of the collection serve the
+snapshot instead of rendering the version again for every reviewer. A
+version is only edited in moderation after it has been rejected, so its
+snapshot is deleted on rejection and rendered again on resubmission.
+"""
+import logging
+
+from django.core.cache import caches
+from django.test import RequestFactory
+
+from cms.utils.helpers import is_editable_model
+
+from . import conf
+from .diff import render_content
+
+
+logger = logging.getLogger(__name__)
+
+
+def _get_snapshot_cache_key(version_id):
+    return f"djangocms_moderation:snapshot:{version_id}"
+
+
+def _get_render_request(user, language):
+    request = RequestFactory().get("/")
+    request.user = user
+    request.session = {}
+    request.LANGUAGE_CODE = language
+    return request
+
+
+def get_preview_snapshot(version_id):
+    """
+    The markup of the preview of the version `version_id`, or None if it
+    has no snapshot
+    """
+    return caches[conf.PREVIEW_SNAPSHOT_CACHE].get(_get_snapshot_cache_key(version_id))
+
+
+def delete_preview_snapshots(version_ids):
+    caches[conf.PREVIEW_SNAPSHOT_CACHE].delete_many(
+        [_get_snapshot_cache_key(version_id) for version_id in version_ids]
+    )
+
+
+def store_preview_snapshots(versions, user):
+    """
+    Renders the previews of `versions` of the models which have one as
+    `user` and stores them. A version which can't be rendered is logged and
+    left without a snapshot, so that its preview is rendered on request.
+    :return: <list> ids of the versions with a snapshot
+    """
+    snapshots = {}
+    for version in versions:
+        content = version.content
+        if not is_editable_model(content.__class__):
+            continue
+        request = _get_render_request(user, getattr(content, "language", None))
+        try:
+            snapshots[_get_snapshot_cache_key(version.pk)] = render_content(request, content)
+        except Exception:
+            logger.exception("Could not render the preview snapshot of version %s", version.pk)
+    caches[conf.PREVIEW_SNAPSHOT_CACHE].set_many(snapshots, conf.PREVIEW_SNAPSHOT_TIMEOUT)
+    return [version.pk for version in versions if _get_snapshot_cache_key(version.pk) in snapshots]
@@ -0,0 +1,86 @@
+"""
+Moderation state of content objects and versions, for clients which poll it.
+
+Every action taken on a request bumps the generation of the request, and
+every change of a collection the generation of the collection, see
+`CollectionQuerySet.touch`, so the state of a set of versions can be
+validated with a single query on the requests and their collections. The
+actions are only read when the state has changed.
+"""
+import hashlib
+
+from django.db.models import Exists, F, OuterRef, Q, Subquery
+
+from .helpers import get_pending_required_steps
+from .models import ModerationRequest, ModerationRequestAction
+
+
+def parse_object_key(value):
+    """
+    Parses an object key "<content_type_id>:<object_id>".
+    Raises ValueError if `value` is invalid.
+    """
+    content_type_id, separator, object_id = value.partition(":")
+    if not separator:
+        raise ValueError(f"Invalid object: {value}")
+    return int(content_type_id), int(object_id)
+
+
+def get_active_requests(version_ids=(), object_keys=()):
+    """
+    Active requests of the versions `version_ids` and of the versions of the
+    content objects `object_keys`, as (content_type_id, object_id) tuples
+    """
+    lookup = Q(version__in=version_ids)
+    for content_type_id, object_id in object_keys:
+        lookup |= Q(version__content_type=content_type_id, version__object_id=object_id)
+    return ModerationRequest.objects.filter(lookup, is_active=True).order_by("pk")
+
+
+def get_etag(requests):
+    """
+    ETag of the state of the active `requests`, changing with the
+    generation of the requests and of their collections. Runs one query
+    without reading the actions.
+    """
+    rows = requests.values_list(
+        "pk",
+        "version",
+        "version__content_type",
+        "version__object_id",
+        "generation",
+        "collection",
+        "collection__generation",
+    )
+    digest = hashlib.md5(usedforsecurity=False)
+    for row in rows:
+        digest.update(repr(row).encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def get_state(requests):
+    """
+    Moderation state of the active `requests` by version id, and the
+    version of each content object as "<content_type_id>:<object_id>"
+    """
+    last_action = ModerationRequestAction.objects.filter(
+        moderation_request=OuterRef("pk")
+    ).order_by("-date_taken", "-pk")
+    rows = requests.values(
+        "version",
+        "collection",
+        "compliance_number",
+        request=F("pk"),
+        version_content_type=F("version__content_type"),
+        object_id=F("version__object_id"),
+        collection_status=F("collection__status"),
+        last_action=Subquery(last_action.values("action")[:1]),
+        is_approved=~Exists(get_pending_required_steps()),
+    )
+    state = {"versions": {}, "objects": {}}
+    for row in rows:
+        version_id = row.pop("version")
+        key = f'{row.pop("version_content_type")}:{row.pop("object_id")}'
+        state["versions"][version_id] = row
+        state["objects"][key] = version_id
+    return state
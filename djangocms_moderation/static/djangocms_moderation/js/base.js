@@ -1,9 +1,5 @@
-import diff from 'htmldiff';
 import $ from 'jquery';
 import srcDoc from 'srcdoc-polyfill';
-import memoize from 'lodash.memoize';
-
-const memoizedDiff = memoize(diff);
 
 // eslint-disable-next-line
 __webpack_public_path__ = require('./get-dist-path')('bundle.moderation');
@@ -30,6 +26,14 @@ const getPublishedMarkup = () => {
     }).then(markup => markup);
 };
 
+// The visual diff is computed and cached server-side, and shared by the
+// reviewers of the collection
+const getDiffMarkup = () => {
+    return $.ajax({
+        url: $('.js-cms-moderation-view-diff').attr('href'),
+    }).then(markup => markup);
+};
+
 const getOrAddFrame = () => {
     let frame = $('.js-cms-moderation-diff-frame');
 
@@ -46,6 +50,7 @@ const getOrAddFrame = () => {
 
 
 let p;
+let diffPromise;
 let structureBoardToggle;
 
 const showControls = () => {
@@ -72,6 +77,7 @@ const closeFrame = e => {
     $('.js-cms-moderation-control-visual').addClass('cms-btn-active');
     $(getOrAddFrame()).remove();
     p = null;
+    diffPromise = null;
 };
 
 const loadMarkup = () => {
@@ -93,8 +99,14 @@ const loadMarkup = () => {
 
 const showVisual = () => {
     CMS.API.StructureBoard.hide();
-    loadMarkup().then(([current, published]) => {
-        const result = memoizedDiff(published, current, 'cms-diff');
+    if (!diffPromise) {
+        CMS.API.Toolbar.showLoader();
+        diffPromise = getDiffMarkup().then(markup => {
+            CMS.API.Toolbar.hideLoader();
+            return markup;
+        });
+    }
+    diffPromise.then(result => {
         const frame = getOrAddFrame();
 
         var newDoc = new DOMParser().parseFromString(result, 'text/html');
@@ -104,8 +116,6 @@ const showVisual = () => {
         showControls();
         preventScrolling();
         srcDoc.set(frame, newDoc.documentElement.outerHTML);
-
-        resetEditMode();
     });
 };
 
@@ -135,6 +145,8 @@ const showSource = () => {
         `);
 
         srcDoc.set(frame, newDoc.documentElement.outerHTML);
+
+        resetEditMode();
     });
 };
 
@@ -11,11 +11,10 @@
 
     $(function () {
       // INFO: it is not possible to put a form inside a form, so the moderation actions have to create their own form
-      // on click.
-        $(` .cms-moderation-action-btn,
+      // on click. The handler is delegated, so that it applies to the rows loaded when expanding the tree too.
+        $(document).on('click', ` .cms-moderation-action-btn,
             .js-moderation-action,
-            .cms-actions-dropdown-menu-item-anchor`)
-      .on('click', function (e) {
+            .cms-actions-dropdown-menu-item-anchor`, function (e) {
           e.preventDefault();
 
           // action currently being targeted
@@ -220,5 +219,11 @@
         $('#result_list').find('tr').each(function (index, item) {
             createBurgerMenu(item);
         });
+        // Rows loaded when expanding the tree, see tree.js
+        $(document).on('moderation:rows-added', function (e, rows) {
+            $(rows).each(function (index, item) {
+                createBurgerMenu(item);
+            });
+        });
     });
 })((typeof django !== 'undefined' && django.jQuery) || (typeof CMS !== 'undefined' && CMS.$) || false);
@@ -1,2 +1,2 @@
 /*! For license information please see bundle.moderation.min.js.LICENSE.txt */
-(()=>{var t,e,n={471(t,e){var n;(function(){"use strict";function r(t){return">"===t}function o(t){return"<"===t}function i(t){return/^\s+$/.test(t)}function a(t){var e=t.match(/^\s*<([^!>][^>]*)>\s*$/);return!!e&&e[1].trim().split(" ")[0]}function s(t){return/^<!--/.test(t)}function c(t){return/--\>$/.test(t)}function l(t){var e=/^(<(iframe|object|math|svg|script|video)|^<[\s\S]*?data-cms-diff-ignore[\s\S]*>$)/.exec(t);return e&&e[1]}function f(t,e){return t.substring(t.length-e.length-2)==="</"+e}function u(t){return/^\s*<[^>]+\/>\s*$/.test(t)}function d(t){return/^<img[\s>]/.test(t)||function(t){return!a(t)}(t)||l(t)||u(t)}function p(t){return{string:t,key:g(t)}}function m(t,e,n,r){this.segment=r,this.length=n,this.startInBefore=t+r.beforeIndex,this.startInAfter=e+r.afterIndex,this.endInBefore=this.startInBefore+this.length-1,this.endInAfter=this.startInAfter+this.length-1,this.segmentStartInBefore=t,this.segmentStartInAfter=e,this.segmentEndInBefore=this.segmentStartInBefore+this.length-1,this.segmentEndInAfter=this.segmentStartInAfter+this.length-1}function h(t){for(var e="char",n="",a="",u=[],d=0;d<t.length;d++){var m=t[d];switch(e){case"tag":var h=l(n);h?(e="atomic_tag",a=h,n+=m):s(n)?(e="html_comment",n+=m):r(m)?(n+=">",u.push(p(n)),n="",e=i(m)?"whitespace":"char"):n+=m;break;case"atomic_tag":r(m)&&f(n,a)?(n+=">",u.push(p(n)),n="",a="",e="char"):n+=m;break;case"html_comment":c(n+=m)&&(n="",e="char");break;case"char":o(m)?(n&&u.push(p(n)),n="<",e="tag"):/\s/.test(m)?(n&&u.push(p(n)),n=m,e="whitespace"):/[\w\d\#@]/.test(m)?n+=m:/&/.test(m)?(n&&u.push(p(n)),n=m):(n+=m,u.push(p(n)),n="");break;case"whitespace":o(m)?(n&&u.push(p(n)),n="<",e="tag"):i(m)?n+=m:(n&&u.push(p(n)),n=m,e="char");break;default:throw new Error("Unknown mode "+e)}}return n&&u.push(p(n)),u}function g(t){if(/^<[\s\S]*?data-cms-diff-ignore[\s\S]*>$/.exec(t))return"cms-diff-ignore";var e=/^<img.*src=['"]([^"']*)['"].*>$/.exec(t);if(e)return'<img src="'+e[1]+'">';var n=/^<object.*data=['"]([^"']*)['"]/.exec(t);if(n)return'<object src="'+n[1]+'"></object>';if(/^<(svg|math|video)[\s>]/.test(t)){var r=t.indexOf('data-uuid="');return-1!==r?t.slice(0,r)+t.slice(r+44):t}var o=/^<iframe.*src=['"]([^"']*)['"].*>/.exec(t);if(o)return'<iframe src="'+o[1]+'"></iframe>';var i=/<([^\s>]+)[\s>]/.exec(t);return i?"<"+i[1].toLowerCase()+">":t&&t.replace(/(\s+|&nbsp;|&#160;)/g," ")}function v(t){return t.reduce(function(t,e,n){return t[e.key]?t[e.key].push(n):t[e.key]=[n],t},Object.create(null))}function b(t,e){return e.endInBefore<t.startInBefore&&e.endInAfter<t.startInAfter?-1:e.startInBefore>t.endInBefore&&e.startInAfter>t.endInAfter?1:0}function y(){this._root=null}function w(t){for(var e=t.beforeTokens,n=t.afterMap,r=null,o=null,i=0;i<e.length;i++){var a=!1,s=e.length-i;if(o&&s<o.length)break;var c=e[i];if(" "!==c.key){r===i-1&&(a=!0);var l=n[c.key];l&&l.forEach(function(e){var n=o?o.length:0,r=I(t,i,e,n,a);r&&r.length>n&&(o=r)})}else r=i}return o}function I(t,e,n,r,o){var i=t.beforeTokens,a=t.afterTokens,s=e+r,c=n+r;if(!(s>=i.length||c>=a.length)){if(r&&i[s].key!==a[c].key)return;for(var l=!0,f=1,u=e+f,d=n+f;l&&u<i.length&&d<a.length;)i[u].key===a[d].key?(u=e+ ++f,d=n+f):l=!1;if(o&&e>0&&n>0){var p=i[e-1].key,h=a[n-1].key;" "===p&&" "===h&&(e--,n--,f++)}return new m(e,n,f,t)}}function _(t,e,n,r){return{beforeTokens:t,afterTokens:e,beforeMap:v(t),afterMap:v(e),beforeIndex:n,afterIndex:r}}function x(t){for(var e,n=new y,r=[t];r.length;)if((e=w(t=r.pop()))&&e.length){if(e.segmentStartInBefore>0&&e.segmentStartInAfter>0){var o=t.beforeTokens.slice(0,e.segmentStartInBefore),i=t.afterTokens.slice(0,e.segmentStartInAfter);r.push(_(o,i,t.beforeIndex,t.afterIndex))}var a=t.beforeTokens.slice(e.segmentEndInBefore+1),s=t.afterTokens.slice(e.segmentEndInAfter+1),c=t.beforeIndex+e.segmentEndInBefore+1,l=t.afterIndex+e.segmentEndInAfter+1;a.length&&s.length&&r.push(_(a,s,c,l)),n.add(e)}return n.toArray()}function k(t,e){if(!t)throw new Error("Missing beforeTokens");if(!e)throw new Error("Missing afterTokens");var n=0,r=0,o=[],i=_(t,e,0,0),a=x(i);a.push(new m(t.length,e.length,0,i));for(var s=0;s<a.length;s++){var c=a[s],l="none";n===c.startInBefore?r!==c.startInAfter&&(l="insert"):(l="delete",r!==c.startInAfter&&(l="replace")),"none"!==l&&o.push({action:l,startInBefore:n,endInBefore:"insert"!==l?c.startInBefore-1:null,startInAfter:r,endInAfter:"delete"!==l?c.startInAfter-1:null}),0!==c.length&&o.push({action:"equal",startInBefore:c.startInBefore,endInBefore:c.endInBefore,startInAfter:c.startInAfter,endInAfter:c.endInAfter}),n=c.endInBefore+1,r=c.endInAfter+1}var f=[],u={action:"none"};function d(e){return"equal"===e.action&&e.endInBefore-e.startInBefore===0&&/^\s$/.test(t.slice(e.startInBefore,e.endInBefore+1))}for(var p=0;p<o.length;p++){var h=o[p];d(h)&&"replace"===u.action||"replace"===h.action&&"replace"===u.action?(u.endInBefore=h.endInBefore,u.endInAfter=h.endInAfter):(f.push(h),u=h)}return f}function A(t){this.tokens=t,this.notes=t.reduce(function(t,e,n){t.notes.push({isWrappable:d(e),insertedTag:!1});var r=!u(e)&&a(e),o=t.tagStack[t.tagStack.length-1];return r&&(o&&"/"+o.tag===r?(t.notes[o.position].insertedTag=!0,t.tagStack.pop()):t.tagStack.push({tag:r,position:n})),t},{notes:[],tagStack:[]}).notes}function S(t,e,n,r,o){var i=new A(e),a=" data-"+(r=r?r+"-":"")+'operation-index="'+n+'"';return o&&(a+=' class="'+o+'"'),i.combine(function(e){if(!e.isWrappable)return e.tokens.join("");var n=e.tokens.join("");return n.trim()?"<"+t+a+">"+n+"</"+t+">":""},function(e){var o=' data-diff-node="'+t+'"';return o+=" data-"+r+'operation-index="'+n+'"',e.replace(/>\s*$/,o+"$&")})}y.prototype={add:function(t){var e={value:t,left:null,right:null},n=this._root;if(n)for(;;){var r=b(n.value,t);if(-1===r){if(!n.left){n.left=e;break}n=n.left}else{if(1!==r)break;if(!n.right){n.right=e;break}n=n.right}}else this._root=e},toArray:function(){return function t(e,n){return e&&(t(e.left,n),n.push(e.value),t(e.right,n)),n}(this._root,[])}},A.prototype.combine=function(t,e){var n=this.notes,r=this.tokens.slice();return r.reduce(function(t,o,i){n[i].insertedTag&&(r[i]=e(r[i])),null===t.status&&(t.status=n[i].isWrappable);var a=n[i].isWrappable;return a!==t.status&&(t.list.push({isWrappable:t.status,tokens:r.slice(t.lastIndex,i)}),t.lastIndex=i,t.status=a),i===r.length-1&&t.list.push({isWrappable:t.status,tokens:r.slice(t.lastIndex,i+1)}),t},{list:[],status:null,lastIndex:0}).list.map(t).join("")};var j={equal:function(t,e,n,r,o,i){return n.slice(t.startInAfter,t.endInAfter+1).reduce(function(t,e){return t+e.string},"")},insert:function(t,e,n,r,o,i){return S("ins",n.slice(t.startInAfter,t.endInAfter+1).map(function(t){return t.string}),r,o,i)},delete:function(t,e,n,r,o,i){return S("del",e.slice(t.startInBefore,t.endInBefore+1).map(function(t){return t.string}),r,o,i)},replace:function(){return j.delete.apply(null,arguments)+j.insert.apply(null,arguments)}};function B(t,e,n,r,o){return n.reduce(function(n,i,a){return n+j[i.action](i,t,e,a,r,o)},"")}function T(t,e,n,r){return t===e?t:B(t=h(t),e=h(e),k(t,e),r,n)}T.htmlToTokens=h,T.findMatchingBlocks=x,x.findBestMatch=w,x.createMap=v,x.createToken=p,x.createSegment=_,x.getKeyForToken=g,T.calculateOperations=k,T.renderOperations=B,void 0===(n=function(){return T}.apply(e,[]))||(t.exports=n)}).call(this)},601(t){t.exports=function(t){var e,n=new RegExp(t+".*$","gi");return document.currentScript?document.currentScript.src.replace(n,""):(e=function(t){for(var e,r=0;r<t.length;r++)if(e=null,void 0!==t[r].getAttribute.length&&(e=t[r].getAttribute("src",2)),e&&e.split("?")[0].split("/").pop().match(n))return e}(document.getElementsByTagName("script")))?e.replace(n,""):""}},654(t,e,n){var r,o="__lodash_hash_undefined__",i=/^\[object .+?Constructor\]$/,a="object"==typeof n.g&&n.g&&n.g.Object===Object&&n.g,s="object"==typeof self&&self&&self.Object===Object&&self,c=a||s||Function("return this")(),l=Array.prototype,f=Function.prototype,u=Object.prototype,d=c["__core-js_shared__"],p=(r=/[^.]+$/.exec(d&&d.keys&&d.keys.IE_PROTO||""))?"Symbol(src)_1."+r:"",m=f.toString,h=u.hasOwnProperty,g=u.toString,v=RegExp("^"+m.call(h).replace(/[\\^$.*+?()[\]{}|]/g,"\\$&").replace(/hasOwnProperty|(function).*?(?=\\\()| for .+?(?=\\\])/g,"$1.*?")+"$"),b=l.splice,y=S(c,"Map"),w=S(Object,"create");function I(t){var e=-1,n=t?t.length:0;for(this.clear();++e<n;){var r=t[e];this.set(r[0],r[1])}}function _(t){var e=-1,n=t?t.length:0;for(this.clear();++e<n;){var r=t[e];this.set(r[0],r[1])}}function x(t){var e=-1,n=t?t.length:0;for(this.clear();++e<n;){var r=t[e];this.set(r[0],r[1])}}function k(t,e){for(var n=t.length;n--;)if(B(t[n][0],e))return n;return-1}function A(t,e){var n,r,o=t.__data__;return("string"==(r=typeof(n=e))||"number"==r||"symbol"==r||"boolean"==r?"__proto__"!==n:null===n)?o["string"==typeof e?"string":"hash"]:o.map}function S(t,e){var n=function(t,e){return null==t?void 0:t[e]}(t,e);return function(t){if(!T(t)||p&&p in t)return!1;var e=function(t){var e=T(t)?g.call(t):"";return"[object Function]"==e||"[object GeneratorFunction]"==e}(t)||function(t){var e=!1;if(null!=t&&"function"!=typeof t.toString)try{e=!!(t+"")}catch(t){}return e}(t)?v:i;return e.test(function(t){if(null!=t){try{return m.call(t)}catch(t){}try{return t+""}catch(t){}}return""}(t))}(n)?n:void 0}function j(t,e){if("function"!=typeof t||e&&"function"!=typeof e)throw new TypeError("Expected a function");var n=function(){var r=arguments,o=e?e.apply(this,r):r[0],i=n.cache;if(i.has(o))return i.get(o);var a=t.apply(this,r);return n.cache=i.set(o,a),a};return n.cache=new(j.Cache||x),n}function B(t,e){return t===e||t!=t&&e!=e}function T(t){var e=typeof t;return!!t&&("object"==e||"function"==e)}I.prototype.clear=function(){this.__data__=w?w(null):{}},I.prototype.delete=function(t){return this.has(t)&&delete this.__data__[t]},I.prototype.get=function(t){var e=this.__data__;if(w){var n=e[t];return n===o?void 0:n}return h.call(e,t)?e[t]:void 0},I.prototype.has=function(t){var e=this.__data__;return w?void 0!==e[t]:h.call(e,t)},I.prototype.set=function(t,e){return this.__data__[t]=w&&void 0===e?o:e,this},_.prototype.clear=function(){this.__data__=[]},_.prototype.delete=function(t){var e=this.__data__,n=k(e,t);return!(n<0||(n==e.length-1?e.pop():b.call(e,n,1),0))},_.prototype.get=function(t){var e=this.__data__,n=k(e,t);return n<0?void 0:e[n][1]},_.prototype.has=function(t){return k(this.__data__,t)>-1},_.prototype.set=function(t,e){var n=this.__data__,r=k(n,t);return r<0?n.push([t,e]):n[r][1]=e,this},x.prototype.clear=function(){this.__data__={hash:new I,map:new(y||_),string:new I}},x.prototype.delete=function(t){return A(this,t).delete(t)},x.prototype.get=function(t){return A(this,t).get(t)},x.prototype.has=function(t){return A(this,t).has(t)},x.prototype.set=function(t,e){return A(this,t).set(t,e),this},j.Cache=x,t.exports=j},255(t,e){var n,r,o;r=this,o=window.srcDoc,n=function(t){!function(t,e){var n,r,o,i=!!("srcdoc"in document.createElement("iframe")),a="Polyfill may not function in the presence of the `sandbox` attribute. Consider using the `force` option.",s=/\ballow-same-origin\b/,c=function(t,e){var n=t.getAttribute("sandbox");"string"!=typeof n||s.test(n)||(e&&e.force?t.removeAttribute("sandbox"):e&&!1===e.force||(o(a),t.setAttribute("data-srcdoc-polyfill",a)))},l=function(t,e,n){e&&(c(t,n),t.setAttribute("srcdoc",e))},f=function(t,e,n){var r;t&&t.getAttribute&&(e?t.setAttribute("srcdoc",e):e=t.getAttribute("srcdoc"),e&&(c(t,n),r="javascript: window.frameElement.getAttribute('srcdoc');",t.contentWindow&&(t.contentWindow.location=r),t.setAttribute("src",r)))},u=t;if(o=window.console&&window.console.error?function(t){window.console.error("[srcdoc-polyfill] "+t)}:function(){},u.set=l,u.noConflict=function(){return window.srcDoc=e,u},!i)for(u.set=f,n=(r=document.getElementsByTagName("iframe")).length;n--;)u.set(r[n])}(t,o),r.srcDoc=t}.apply(e,[e]),void 0===n||(t.exports=n)},414(t){"use strict";t.exports="ins.cms-diff{background:#cdffd8!important;outline:1px solid green!important}del.cms-diff{background:#ffdce0!important;outline:1px solid red!important}[data-diff-node=ins]{background:#cdffd8!important;outline:1px solid green!important}[data-diff-node=ins] ins.cms-diff{outline:none!important}[data-diff-node=del]{background:#ffdce0!important;outline:1px solid red!important}[data-diff-node=del] del.cms-diff{outline:none!important}del.cms-diff img{opacity:.6;outline:5px solid red;outline-offset:-5px}ins.cms-diff img{opacity:.6;outline:5px solid green;outline-offset:-5px}.cms-moderation-diff-frame{background-color:#fff;border:none;bottom:0;height:100%;height:calc(100vh - 46px);left:0;position:fixed;right:0;top:46px;width:100%}.cms-moderation-controls{display:flex;flex-direction:row;justify-content:space-between;left:130px;position:fixed;right:130px;top:0;z-index:99999999999999}.cms-moderation-control-close{align-items:stretch;display:flex;height:46px!important;justify-content:stretch;position:fixed;right:0!important;top:0!important;width:46px!important}.cms-moderation-control-close a{align-items:center;border-left:1px solid #ddd!important;display:flex;justify-content:center;width:100%}.cms-moderation-controls .cms-toolbar-item-buttons{margin-left:auto!important;margin-right:auto!important}@media (max-width:440px){.cms-moderation-controls{left:0}.cms-moderation-controls .cms-toolbar-item-buttons{margin-left:15px!important}}.cms-moderation-controls .cms-btn-group{display:flex;flex-direction:row}.cms-moderation-controls .cms-btn{box-sizing:initial!important;flex-shrink:0!important;text-align:center!important;white-space:nowrap!important;width:100px!important}.cms-moderation-controls .cms-btn+.cms-btn{border-bottom-left-radius:0;border-top-left-radius:0;margin-left:-1px}.cms-moderation-controls .cms-btn .cms-icon:before{position:relative;top:3px}.cms-moderation-controls .cms-btn:not(:last-child){border-bottom-right-radius:0;border-top-right-radius:0}.cms-moderation-overflow{overflow:hidden!important}"}},r={};function o(t){var e=r[t];if(void 0!==e)return e.exports;var i=r[t]={exports:{}};return n[t].call(i.exports,i,i.exports,o),i.exports}o.m=n,o.n=t=>{var e=t&&t.__esModule?()=>t.default:()=>t;return o.d(e,{a:e}),e},o.d=(t,e)=>{for(var n in e)o.o(e,n)&&!o.o(t,n)&&Object.defineProperty(t,n,{enumerable:!0,get:e[n]})},o.f={},o.e=t=>Promise.all(Object.keys(o.f).reduce((e,n)=>(o.f[n](t,e),e),[])),o.u=t=>"bundle.prettydiff.min.js",o.g=function(){if("object"==typeof globalThis)return globalThis;try{return this||new Function("return this")()}catch(t){if("object"==typeof window)return window}}(),o.o=(t,e)=>Object.prototype.hasOwnProperty.call(t,e),t={},e="djangoCMS:",o.l=(n,r,i,a)=>{if(t[n])t[n].push(r);else{var s,c;if(void 0!==i)for(var l=document.getElementsByTagName("script"),f=0;f<l.length;f++){var u=l[f];if(u.getAttribute("src")==n||u.getAttribute("data-webpack")==e+i){s=u;break}}s||(c=!0,(s=document.createElement("script")).charset="utf-8",o.nc&&s.setAttribute("nonce",o.nc),s.setAttribute("data-webpack",e+i),s.src=n),t[n]=[r];var d=(e,r)=>{s.onerror=s.onload=null,clearTimeout(p);var o=t[n];if(delete t[n],s.parentNode&&s.parentNode.removeChild(s),o&&o.forEach(t=>t(r)),e)return e(r)},p=setTimeout(d.bind(null,void 0,{type:"timeout",target:s}),12e4);s.onerror=d.bind(null,s.onerror),s.onload=d.bind(null,s.onload),c&&document.head.appendChild(s)}},o.r=t=>{"undefined"!=typeof Symbol&&Symbol.toStringTag&&Object.defineProperty(t,Symbol.toStringTag,{value:"Module"}),Object.defineProperty(t,"__esModule",{value:!0})},(()=>{var t;o.g.importScripts&&(t=o.g.location+"");var e=o.g.document;if(!t&&e&&(e.currentScript&&"SCRIPT"===e.currentScript.tagName.toUpperCase()&&(t=e.currentScript.src),!t)){var n=e.getElementsByTagName("script");if(n.length)for(var r=n.length-1;r>-1&&(!t||!/^http(s?):/.test(t));)t=n[r--].src}if(!t)throw new Error("Automatic publicPath is not supported in this browser");t=t.replace(/^blob:/,"").replace(/#.*$/,"").replace(/\?.*$/,"").replace(/\/[^\/]+$/,"/"),o.p=t})(),(()=>{var t={479:0};o.f.j=(e,n)=>{var r=o.o(t,e)?t[e]:void 0;if(0!==r)if(r)n.push(r[2]);else{var i=new Promise((n,o)=>r=t[e]=[n,o]);n.push(r[2]=i);var a=o.p+o.u(e),s=new Error;o.l(a,n=>{if(o.o(t,e)&&(0!==(r=t[e])&&(t[e]=void 0),r)){var i=n&&("load"===n.type?"missing":n.type),a=n&&n.target&&n.target.src;s.message="Loading chunk "+e+" failed.\n("+i+": "+a+")",s.name="ChunkLoadError",s.type=i,s.request=a,r[1](s)}},"chunk-"+e,e)}};var e=(e,n)=>{var r,i,[a,s,c]=n,l=0;if(a.some(e=>0!==t[e])){for(r in s)o.o(s,r)&&(o.m[r]=s[r]);c&&c(o)}for(e&&e(n);l<a.length;l++)i=a[l],o.o(t,i)&&t[i]&&t[i][0](),t[i]=0},n=self.moderationWebpackJsonp=self.moderationWebpackJsonp||[];n.forEach(e.bind(null,0)),n.push=e.bind(null,n.push.bind(n))})(),(()=>{"use strict";var t=o(471),e=o.n(t);const n=CMS.$;var r=o.n(n),i=o(255),a=o.n(i),s=o(654);const c=o.n(s)()(e());o.p=o(601)("bundle.moderation");const l=()=>{let t=r()(".js-cms-moderation-diff-frame");return t.length||(t=r()('<iframe class="js-cms-moderation-diff-frame cms-moderation-diff-frame"></iframe>'),r()("#cms-top").append(t)),t[0]};let f,u;const d=t=>{t.preventDefault(),CMS.API.StructureBoard._toggleStructureBoard=u,r()(".cms-moderation-controls").hide(),r()(".cms-toolbar-right, .cms-toolbar-item-navigation").show(),CMS.API.StructureBoard._toggleStructureBoard=u,r()("html").removeClass("cms-moderation-overflow"),r()(".js-cms-moderation-control").removeClass("cms-btn-active"),r()(".js-cms-moderation-control-visual").addClass("cms-btn-active"),r()(l()).remove(),f=null},p=()=>(f||(CMS.API.Toolbar.showLoader(),f=r().ajax({url:window.location.pathname+"?toolbar_off"}).then(t=>t).then(t=>r().ajax({url:window.location.pathname+"?toolbar_off&preview"}).then(t=>t).then(e=>[t,e])).then(t=>(CMS.API.Toolbar.hideLoader(),t))),f),m=()=>{CMS.API.StructureBoard.hide(),p().then(([t,e])=>{const n=c(e,t,"cms-diff"),i=l();var s=(new DOMParser).parseFromString(n,"text/html");r()(s).find("body").append(`<style>${o(414)}</style>`),r()(".cms-moderation-controls").show(),r()(".cms-toolbar-right, .cms-toolbar-item-navigation").hide(),u=CMS.API.StructureBoard._toggleStructureBoard.bind(CMS.API.StructureBoard),CMS.API.StructureBoard._toggleStructureBoard=r().noop,r()("html").addClass("cms-moderation-overflow"),a().set(i,s.documentElement.outerHTML),r().ajax({url:window.location.pathname+"?edit&structure"})})};r()(function(){r()("#cms-top").append('\n        <div class="cms-moderation-controls" style="display: none">\n            <div class="cms-tooblar-item cms-toolbar-item-buttons">\n                <div class="cms-btn-group">\n                    <a href="#"\n                        class="cms-btn cms-btn-active js-cms-moderation-control js-cms-moderation-control-visual">\n                        Visual\n                    </a>\n                    <a href="#" class="cms-btn js-cms-moderation-control js-cms-moderation-control-source">\n                        Source\n                    </a>\n                </div>\n            </div>\n            <div class="cms-moderation-control-close">\n                <a href="#" class="js-cms-moderation-close">\n                    <span class="cms-icon cms-icon-close"></span>\n                </a>\n            </div>\n        </div>\n    '),r()(".js-cms-moderation-close").on("click",d),r()(".js-cms-moderation-control-visual").on("click",t=>{t.preventDefault();const e=r()(t.currentTarget);e.is(".cms-btn-active")||(r()(".js-cms-moderation-control").removeClass("cms-btn-active"),e.addClass("cms-btn-active"),m())}),r()(".js-cms-moderation-control-source").on("click",t=>{t.preventDefault();const e=r()(t.currentTarget);e.is(".cms-btn-active")||(r()(".js-cms-moderation-control").removeClass("cms-btn-active"),e.addClass("cms-btn-active"),Promise.all([o.e(646).then(o.bind(o,755)),p()]).then(([t,[e,n]])=>{const o=l(),i=t.default.diff(n,e);var s=(new DOMParser).parseFromString(i,"text/html");r()(s).find("head").append(`\n            <script>\n                ${t.default.js}\n            <\/script>\n            <style>\n                ${t.default.styles}\n            </style>\n        `),a().set(o,s.documentElement.outerHTML)}))}),r()(".js-cms-moderation-view-diff").on("click",t=>{t.preventDefault(),r()(t.target).closest(".cms-dropdown-open").find(".cms-dropdown-toggle").trigger("pointerup"),m()}),window.parent&&window.parent!==window&&(window.top.location.href=window.location.href)})})()})();
\ No newline at end of file
+(()=>{var t,e,n={601(t){t.exports=function(t){var e,n=new RegExp(t+".*$","gi");return document.currentScript?document.currentScript.src.replace(n,""):(e=function(t){for(var e,r=0;r<t.length;r++)if(e=null,void 0!==t[r].getAttribute.length&&(e=t[r].getAttribute("src",2)),e&&e.split("?")[0].split("/").pop().match(n))return e}(document.getElementsByTagName("script")))?e.replace(n,""):""}},255(t,e){var n,r,o;r=this,o=window.srcDoc,n=function(t){!function(t,e){var n,r,o,i=!!("srcdoc"in document.createElement("iframe")),a="Polyfill may not function in the presence of the `sandbox` attribute. Consider using the `force` option.",s=/\ballow-same-origin\b/,c=function(t,e){var n=t.getAttribute("sandbox");"string"!=typeof n||s.test(n)||(e&&e.force?t.removeAttribute("sandbox"):e&&!1===e.force||(o(a),t.setAttribute("data-srcdoc-polyfill",a)))},l=function(t,e,n){e&&(c(t,n),t.setAttribute("srcdoc",e))},f=function(t,e,n){var r;t&&t.getAttribute&&(e?t.setAttribute("srcdoc",e):e=t.getAttribute("srcdoc"),e&&(c(t,n),r="javascript: window.frameElement.getAttribute('srcdoc');",t.contentWindow&&(t.contentWindow.location=r),t.setAttribute("src",r)))},u=t;if(o=window.console&&window.console.error?function(t){window.console.error("[srcdoc-polyfill] "+t)}:function(){},u.set=l,u.noConflict=function(){return window.srcDoc=e,u},!i)for(u.set=f,n=(r=document.getElementsByTagName("iframe")).length;n--;)u.set(r[n])}(t,o),r.srcDoc=t}.apply(e,[e]),void 0===n||(t.exports=n)},414(t){"use strict";t.exports="ins.cms-diff{background:#cdffd8!important;outline:1px solid green!important}del.cms-diff{background:#ffdce0!important;outline:1px solid red!important}[data-diff-node=ins]{background:#cdffd8!important;outline:1px solid green!important}[data-diff-node=ins] ins.cms-diff{outline:none!important}[data-diff-node=del]{background:#ffdce0!important;outline:1px solid red!important}[data-diff-node=del] del.cms-diff{outline:none!important}del.cms-diff img{opacity:.6;outline:5px solid red;outline-offset:-5px}ins.cms-diff img{opacity:.6;outline:5px solid green;outline-offset:-5px}.cms-moderation-diff-frame{background-color:#fff;border:none;bottom:0;height:100%;height:calc(100vh - 46px);left:0;position:fixed;right:0;top:46px;width:100%}.cms-moderation-controls{display:flex;flex-direction:row;justify-content:space-between;left:130px;position:fixed;right:130px;top:0;z-index:99999999999999}.cms-moderation-control-close{align-items:stretch;display:flex;height:46px!important;justify-content:stretch;position:fixed;right:0!important;top:0!important;width:46px!important}.cms-moderation-control-close a{align-items:center;border-left:1px solid #ddd!important;display:flex;justify-content:center;width:100%}.cms-moderation-controls .cms-toolbar-item-buttons{margin-left:auto!important;margin-right:auto!important}@media (max-width:440px){.cms-moderation-controls{left:0}.cms-moderation-controls .cms-toolbar-item-buttons{margin-left:15px!important}}.cms-moderation-controls .cms-btn-group{display:flex;flex-direction:row}.cms-moderation-controls .cms-btn{box-sizing:initial!important;flex-shrink:0!important;text-align:center!important;white-space:nowrap!important;width:100px!important}.cms-moderation-controls .cms-btn+.cms-btn{border-bottom-left-radius:0;border-top-left-radius:0;margin-left:-1px}.cms-moderation-controls .cms-btn .cms-icon:before{position:relative;top:3px}.cms-moderation-controls .cms-btn:not(:last-child){border-bottom-right-radius:0;border-top-right-radius:0}.cms-moderation-overflow{overflow:hidden!important}"}},r={};function o(t){var e=r[t];if(void 0!==e)return e.exports;var i=r[t]={exports:{}};return n[t].call(i.exports,i,i.exports,o),i.exports}o.m=n,o.n=t=>{var e=t&&t.__esModule?()=>t.default:()=>t;return o.d(e,{a:e}),e},o.d=(t,e)=>{for(var n in e)o.o(e,n)&&!o.o(t,n)&&Object.defineProperty(t,n,{enumerable:!0,get:e[n]})},o.f={},o.e=t=>Promise.all(Object.keys(o.f).reduce((e,n)=>(o.f[n](t,e),e),[])),o.u=t=>"bundle.prettydiff.min.js",o.g=function(){if("object"==typeof globalThis)return globalThis;try{return this||new Function("return this")()}catch(t){if("object"==typeof window)return window}}(),o.o=(t,e)=>Object.prototype.hasOwnProperty.call(t,e),t={},e="djangoCMS:",o.l=(n,r,i,a)=>{if(t[n])t[n].push(r);else{var s,c;if(void 0!==i)for(var l=document.getElementsByTagName("script"),f=0;f<l.length;f++){var u=l[f];if(u.getAttribute("src")==n||u.getAttribute("data-webpack")==e+i){s=u;break}}s||(c=!0,(s=document.createElement("script")).charset="utf-8",o.nc&&s.setAttribute("nonce",o.nc),s.setAttribute("data-webpack",e+i),s.src=n),t[n]=[r];var d=(e,r)=>{s.onerror=s.onload=null,clearTimeout(p);var o=t[n];if(delete t[n],s.parentNode&&s.parentNode.removeChild(s),o&&o.forEach(t=>t(r)),e)return e(r)},p=setTimeout(d.bind(null,void 0,{type:"timeout",target:s}),12e4);s.onerror=d.bind(null,s.onerror),s.onload=d.bind(null,s.onload),c&&document.head.appendChild(s)}},o.r=t=>{"undefined"!=typeof Symbol&&Symbol.toStringTag&&Object.defineProperty(t,Symbol.toStringTag,{value:"Module"}),Object.defineProperty(t,"__esModule",{value:!0})},(()=>{var t;o.g.importScripts&&(t=o.g.location+"");var e=o.g.document;if(!t&&e&&(e.currentScript&&"SCRIPT"===e.currentScript.tagName.toUpperCase()&&(t=e.currentScript.src),!t)){var n=e.getElementsByTagName("script");if(n.length)for(var r=n.length-1;r>-1&&(!t||!/^http(s?):/.test(t));)t=n[r--].src}if(!t)throw new Error("Automatic publicPath is not supported in this browser");t=t.replace(/^blob:/,"").replace(/#.*$/,"").replace(/\?.*$/,"").replace(/\/[^\/]+$/,"/"),o.p=t})(),(()=>{var t={479:0};o.f.j=(e,n)=>{var r=o.o(t,e)?t[e]:void 0;if(0!==r)if(r)n.push(r[2]);else{var i=new Promise((n,o)=>r=t[e]=[n,o]);n.push(r[2]=i);var a=o.p+o.u(e),s=new Error;o.l(a,n=>{if(o.o(t,e)&&(0!==(r=t[e])&&(t[e]=void 0),r)){var i=n&&("load"===n.type?"missing":n.type),a=n&&n.target&&n.target.src;s.message="Loading chunk "+e+" failed.\n("+i+": "+a+")",s.name="ChunkLoadError",s.type=i,s.request=a,r[1](s)}},"chunk-"+e,e)}};var e=(e,n)=>{var r,i,[a,s,c]=n,l=0;if(a.some(e=>0!==t[e])){for(r in s)o.o(s,r)&&(o.m[r]=s[r]);c&&c(o)}for(e&&e(n);l<a.length;l++)i=a[l],o.o(t,i)&&t[i]&&t[i][0](),t[i]=0},n=self.moderationWebpackJsonp=self.moderationWebpackJsonp||[];n.forEach(e.bind(null,0)),n.push=e.bind(null,n.push.bind(n))})(),(()=>{"use strict";const t=CMS.$;var e=o.n(t),n=o(255),r=o.n(n);o.p=o(601)("bundle.moderation");const i=()=>{let t=e()(".js-cms-moderation-diff-frame");return t.length||(t=e()('<iframe class="js-cms-moderation-diff-frame cms-moderation-diff-frame"></iframe>'),e()("#cms-top").append(t)),t[0]};let a,s,c;const l=t=>{t.preventDefault(),CMS.API.StructureBoard._toggleStructureBoard=c,e()(".cms-moderation-controls").hide(),e()(".cms-toolbar-right, .cms-toolbar-item-navigation").show(),CMS.API.StructureBoard._toggleStructureBoard=c,e()("html").removeClass("cms-moderation-overflow"),e()(".js-cms-moderation-control").removeClass("cms-btn-active"),e()(".js-cms-moderation-control-visual").addClass("cms-btn-active"),e()(i()).remove(),a=null,s=null},f=()=>(a||(CMS.API.Toolbar.showLoader(),a=e().ajax({url:window.location.pathname+"?toolbar_off"}).then(t=>t).then(t=>e().ajax({url:window.location.pathname+"?toolbar_off&preview"}).then(t=>t).then(e=>[t,e])).then(t=>(CMS.API.Toolbar.hideLoader(),t))),a),u=()=>{CMS.API.StructureBoard.hide(),s||(CMS.API.Toolbar.showLoader(),s=e().ajax({url:e()(".js-cms-moderation-view-diff").attr("href")}).then(t=>t).then(t=>(CMS.API.Toolbar.hideLoader(),t))),s.then(t=>{const n=i();var a=(new DOMParser).parseFromString(t,"text/html");e()(a).find("body").append(`<style>${o(414)}</style>`),e()(".cms-moderation-controls").show(),e()(".cms-toolbar-right, .cms-toolbar-item-navigation").hide(),c=CMS.API.StructureBoard._toggleStructureBoard.bind(CMS.API.StructureBoard),CMS.API.StructureBoard._toggleStructureBoard=e().noop,e()("html").addClass("cms-moderation-overflow"),r().set(n,a.documentElement.outerHTML)})};e()(function(){e()("#cms-top").append('\n        <div class="cms-moderation-controls" style="display: none">\n            <div class="cms-tooblar-item cms-toolbar-item-buttons">\n                <div class="cms-btn-group">\n                    <a href="#"\n                        class="cms-btn cms-btn-active js-cms-moderation-control js-cms-moderation-control-visual">\n                        Visual\n                    </a>\n                    <a href="#" class="cms-btn js-cms-moderation-control js-cms-moderation-control-source">\n                        Source\n                    </a>\n                </div>\n            </div>\n            <div class="cms-moderation-control-close">\n                <a href="#" class="js-cms-moderation-close">\n                    <span class="cms-icon cms-icon-close"></span>\n                </a>\n            </div>\n        </div>\n    '),e()(".js-cms-moderation-close").on("click",l),e()(".js-cms-moderation-control-visual").on("click",t=>{t.preventDefault();const n=e()(t.currentTarget);n.is(".cms-btn-active")||(e()(".js-cms-moderation-control").removeClass("cms-btn-active"),n.addClass("cms-btn-active"),u())}),e()(".js-cms-moderation-control-source").on("click",t=>{t.preventDefault();const n=e()(t.currentTarget);n.is(".cms-btn-active")||(e()(".js-cms-moderation-control").removeClass("cms-btn-active"),n.addClass("cms-btn-active"),Promise.all([o.e(646).then(o.bind(o,755)),f()]).then(([t,[n,o]])=>{const a=i(),s=t.default.diff(o,n);var c=(new DOMParser).parseFromString(s,"text/html");e()(c).find("head").append(`\n            <script>\n                ${t.default.js}\n            <\/script>\n            <style>\n                ${t.default.styles}\n            </style>\n        `),r().set(a,c.documentElement.outerHTML),e().ajax({url:window.location.pathname+"?edit&structure"})}))}),e()(".js-cms-moderation-view-diff").on("click",t=>{t.preventDefault(),e()(t.target).closest(".cms-dropdown-open").find(".cms-dropdown-toggle").trigger("pointerup"),u()}),window.parent&&window.parent!==window&&(window.top.location.href=window.location.href)})})()})();
\ No newline at end of file
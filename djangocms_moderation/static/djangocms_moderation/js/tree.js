@@ -0,0 +1,109 @@
+(function ($) {
+    if (!$) {
+        return;
+    }
+
+    // The changelist of a collection renders the first levels of its tree.
+    // The children of the other nodes are loaded when they are expanded,
+    // from the rows rendered by `ModerationRequestTreeAdmin.children_view`.
+    let childrenUrl;
+
+    let getChildRows = function getChildRows(row) {
+        return $('#result_list tbody tr[data-parent-id="' + $(row).attr('data-node-id') + '"]');
+    };
+
+    let setExpanded = function setExpanded(row, expanded) {
+        $(row).find('a.treebeard-collapse')
+            .toggleClass('treebeard-expanded', expanded)
+            .toggleClass('treebeard-collapsed', !expanded)
+            .text(expanded ? '-' : '+');
+    };
+
+    let collapse = function collapse(row) {
+        getChildRows(row).each(function (index, child) {
+            collapse(child);
+        }).hide();
+        setExpanded(row, false);
+    };
+
+    // Gives the loaded rows the attributes and markup treebeard-admin.js
+    // gives the rendered rows
+    let createRow = function createRow(context) {
+        let row = $(context.html);
+        let firstCell = row.find('td,th').not('.action-checkbox').first();
+
+        Object.entries(context).forEach(function ([key, value]) {
+            if (key !== 'html') {
+                row.attr(`data-${key}`, value);
+            }
+        });
+        if (context['has-children']) {
+            firstCell.prepend('<a href="#" class="treebeard-collapse treebeard-collapsed">+</a>');
+        }
+        if (context.level > 1) {
+            firstCell.prepend('<span class="spacer">&nbsp;</span>'.repeat(context.level - 1));
+        }
+        firstCell.prepend('<span class="drag-handler"></span>');
+        return row[0];
+    };
+
+    let expand = function expand(row) {
+        let $row = $(row);
+
+        setExpanded(row, true);
+        if ($row.attr('data-children-loaded') === '1') {
+            getChildRows(row).show();
+            return;
+        }
+        $row.attr('data-children-loaded', '1');
+        $.getJSON(childrenUrl, { parent: $row.attr('data-path') })
+            .done(function (data) {
+                let rows = data.rows.map(createRow);
+
+                if (!rows.length) {
+                    $row.find('a.treebeard-collapse').remove();
+                }
+                $row.after(rows);
+                $(document).trigger('moderation:rows-added', [rows]);
+            })
+            .fail(function () {
+                $row.attr('data-children-loaded', '0');
+                setExpanded(row, false);
+            });
+    };
+
+    $(function () {
+        childrenUrl = $('#moderation-tree-children-url').val();
+        if (!childrenUrl) {
+            return;
+        }
+
+        // In the capture phase, before the click handlers treebeard-admin.js
+        // binds on the rendered toggles, which only show and hide the rows
+        // already rendered and stop the click there
+        document.getElementById('result_list').addEventListener('click', function (e) {
+            let toggle = $(e.target).closest('a.treebeard-collapse')[0];
+
+            if (!toggle) {
+                return;
+            }
+            e.preventDefault();
+            e.stopPropagation();
+            let row = $(toggle).closest('tr')[0];
+
+            if ($(toggle).hasClass('treebeard-collapsed')) {
+                expand(row);
+            } else {
+                collapse(row);
+            }
+        }, true);
+
+        // After treebeard-admin.js, which reads the tree context into the
+        // rows in its own ready handler
+        setTimeout(function () {
+            $('#result_list tbody tr[data-children-loaded="0"]').each(function (index, row) {
+                setExpanded(row, false);
+            });
+        });
+    });
+})((typeof django !== 'undefined' && django.jQuery) || (typeof CMS !== 'undefined' && CMS.$) || false);
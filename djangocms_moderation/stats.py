@@ -0,0 +1,118 @@
+"""
+Statistics of the moderation backlog, for monitoring.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, Min, OuterRef, Q, Subquery
+from django.utils import timezone
+
+from . import conf, constants
+from .helpers import get_pending_required_steps
+from .models import (
+    ModerationCollection,
+    ModerationRequest,
+    ModerationRequestAction,
+    WorkflowStep,
+)
+
+
+STATS_CACHE_KEY = "djangocms_moderation_stats"
+
+
+def _get_pending_requests_by_step():
+    """
+    Active requests of the collections in review, grouped by the first
+    required step of their workflow which has not been approved yet.
+    Requests with all the required steps approved are grouped under `None`.
+    """
+    next_step = get_pending_required_steps().order_by("order").values("pk")[:1]
+    last_action = ModerationRequestAction.objects.filter(
+        moderation_request=OuterRef("pk")
+    ).order_by("-date_taken", "-pk").values("action")[:1]
+    return (
+        ModerationRequest.objects.filter(is_active=True, collection__status=constants.IN_REVIEW)
+        .annotate(next_step=Subquery(next_step), last_action=Subquery(last_action))
+        .order_by()
+        .values("next_step")
+        .annotate(
+            count=Count("pk"),
+            rejected=Count("pk", filter=Q(last_action=constants.ACTION_REJECTED)),
+            oldest=Min("date_sent"),
+        )
+    )
+
+
+def _isoformat(date):
+    return date.isoformat() if date else None
+
+
+def get_moderation_stats():
+    """
+    Counts the collections per status, the pending requests per workflow
+    step and the actions taken in the last 24 hours, with a few GROUP BY
+    queries.
+    :return: <dict> which can be serialized to JSON
+    """
+    now = timezone.now()
+
+    collections = dict.fromkeys(dict(constants.STATUS_CHOICES), 0)
+    status_counts = ModerationCollection.objects.order_by().values("status").annotate(count=Count("pk"))
+    for row in status_counts:
+        collections[row["status"]] = row["count"]
+
+    rows = list(_get_pending_requests_by_step())
+    steps = WorkflowStep.objects.filter(
+        pk__in=[row["next_step"] for row in rows if row["next_step"]]
+    ).select_related("role", "workflow")
+    steps = {step.pk: step for step in steps}
+
+    pending_steps = []
+    awaiting_publishing = 0
+    for row in rows:
+        step = steps.get(row["next_step"])
+        if step is None:
+            awaiting_publishing += row["count"]
+            continue
+        pending_steps.append({
+            "workflow_id": step.workflow_id,
+            "workflow": step.workflow.name,
+            "step_id": step.pk,
+            "order": step.order,
+            "role": step.role.name,
+            "pending": row["count"],
+            "rejected": row["rejected"],
+            "oldest_date_sent": _isoformat(row["oldest"]),
+        })
+    pending_steps.sort(key=lambda item: (item["workflow"], item["order"]))
+
+    oldest = min((row["oldest"] for row in rows), default=None)
+    actions = ModerationRequestAction.objects.filter(
+        date_taken__gte=now - timedelta(days=1)
+    ).order_by().values("action").annotate(count=Count("pk"))
+
+    return {
+        "generated_at": now.isoformat(),
+        "collections": collections,
+        "pending_requests": {
+            "total": sum(row["count"] for row in rows),
+            "rejected": sum(row["rejected"] for row in rows),
+            "awaiting_publishing": awaiting_publishing,
+            "oldest_date_sent": _isoformat(oldest),
+            "oldest_age_seconds": int((now - oldest).total_seconds()) if oldest else None,
+        },
+        "steps": pending_steps,
+        "actions_last_24_hours": {row["action"]: row["count"] for row in actions},
+    }
+
+
+def get_cached_moderation_stats():
+    """
+    `get_moderation_stats`, cached for ``CMS_MODERATION_STATS_CACHE_TIMEOUT``
+    seconds so that monitoring polls don't query the database every time
+    """
+    stats = cache.get(STATS_CACHE_KEY)
+    if stats is None:
+        stats = get_moderation_stats()
+        cache.set(STATS_CACHE_KEY, stats, conf.STATS_CACHE_TIMEOUT)
+    return stats
@@ -16,3 +16,12 @@ TREEBEARD_NEW_ADMIN_TREE = hasattr(admin_tree, "tree_context")
 @register.simple_tag
 def treebeard_new_admin_tree():
     return TREEBEARD_NEW_ADMIN_TREE
+
+
+@register.simple_tag
+def moderation_tree_context(cl):
+    """
+    The ``tree_context`` of the tree of a collection, see
+    `TreeChangeList.get_tree_context`
+    """
+    return cl.get_tree_context()
@@ -1,13 +1,19 @@
+import secrets
 from functools import lru_cache
+from itertools import islice
 from urllib.parse import parse_qs, urljoin
 
 from django.conf import settings
 from django.contrib.sites.models import Site
+from django.core.cache import caches
+from django.http import Http404
 from django.utils.module_loading import import_string
 from django.utils.translation import override as force_language
 
 from cms.utils.urlutils import admin_reverse
 
+from . import conf
+
 
 def get_absolute_url(location, site=None):
     if not site:
@@ -46,3 +52,57 @@ def extract_filter_param_from_changelist_url(request, keyname, parametername):
         return parameter_value[0]
     except (TypeError, IndexError):
         return None
+
+
+def _get_selection_cache_key(user, token):
+    return f"djangocms_moderation:selection:{user.pk}:{token}"
+
+
+def store_selection(user, ids):
+    """
+    Stores the list of selected object ids server-side and returns a short
+    token which can be passed around in URLs instead of the ids themselves.
+    The selection is only readable by the same `user`
+    """
+    ids = [int(pk) for pk in ids if str(pk).isdigit()]
+    token = secrets.token_urlsafe(12)
+    caches[conf.SELECTION_CACHE].set(
+        _get_selection_cache_key(user, token), ids, conf.SELECTION_TIMEOUT
+    )
+    return token
+
+
+def get_selection(user, token):
+    """
+    Returns the list of ids stored under `token` for `user`,
+    or None if the selection doesn't exist or has expired
+    """
+    if not token:
+        return None
+    return caches[conf.SELECTION_CACHE].get(_get_selection_cache_key(user, token))
+
+
+def get_selected_ids(request, legacy_param="ids"):
+    """
+    Returns the sorted ids selected for a bulk view. They are either stored
+    server-side under the `selection` token, or passed directly as a comma
+    separated list in `legacy_param`
+    """
+    token = request.GET.get("selection")
+    if token:
+        ids = get_selection(request.user, token)
+        if ids is None:
+            raise Http404
+    else:
+        ids = request.GET.get(legacy_param, "").split(",")
+        ids = [int(pk) for pk in ids if pk.isdigit()]
+    return sorted(set(ids))
+
+
+def chunked(iterable, size):
+    """
+    Splits `iterable` into lists of at most `size` items
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
@@ -1,27 +1,45 @@
 from urllib.parse import quote
 
 from django.contrib import admin, messages
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import PermissionDenied
 from django.db import transaction
-from django.http import Http404, HttpResponseRedirect
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import method_decorator
 from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils.translation import gettext_lazy as _, ngettext
-from django.views.generic import FormView
+from django.views.generic import FormView, TemplateView
 
 from cms.models import PageContent
+from cms.toolbar.utils import get_object_preview_url
 from cms.utils.urlutils import add_url_parameters
 
 from djangocms_versioning.models import Version
 
+from . import conf
+from .audit import FORMATS, export_audit_trail, get_audit_rows, parse_audit_date
+from .diff import get_version_diff
 from .forms import (
     CancelCollectionForm,
     CollectionItemsForm,
     SubmitCollectionForModerationForm,
 )
-from .models import ConfirmationPage, ModerationCollection
-from .utils import get_admin_url
+from .helpers import get_requests_awaiting_review
+from .models import ConfirmationPage, ModerationCollection, ModerationRequest
+from .snapshots import get_preview_snapshot
+from .state import get_active_requests, get_etag, get_state, parse_object_key
+from .stats import get_cached_moderation_stats
+from .utils import get_admin_url, get_selected_ids
 
 
 from . import constants  # isort:skip
@@ -39,8 +57,7 @@ class CollectionItemsView(FormView):
 
     def get_initial(self):
         initial = super().get_initial()
-        ids = self.request.GET.get("version_ids", "").split(",")
-        ids = [int(x) for x in ids if x.isdigit()]
+        ids = get_selected_ids(self.request, legacy_param="version_ids")
         versions = Version.objects.filter(pk__in=ids)
         initial["versions"] = versions
 
@@ -53,16 +70,15 @@ class CollectionItemsView(FormView):
         versions = form.cleaned_data["versions"]
         collection = form.cleaned_data["collection"]
 
-        total_added = 0
-        for version in versions:
-            include_children = (
-                isinstance(version.content, PageContent)
-                and version.created_by == self.request.user
-            )
-            moderation_request, added_items = collection.add_version(
-                version, include_children=include_children
-            )
-            total_added += added_items
+        # Nested children are only looked up for the user's own pages
+        page_content_type = ContentType.objects.get_for_model(PageContent)
+        versions = list(versions)
+        pages = {
+            version.pk for version in versions
+            if version.content_type_id == page_content_type.pk
+            and version.created_by_id == self.request.user.pk
+        }
+        total_added = collection.add_versions(versions, include_children=pages)
 
         messages.success(
             self.request,
@@ -73,6 +89,16 @@ class CollectionItemsView(FormView):
             )
             % {"count": total_added},
         )
+        if form.ineligible_versions:
+            messages.warning(
+                self.request,
+                ngettext(
+                    "%(count)d item was not added to moderation collection",
+                    "%(count)d items were not added to moderation collection",
+                    len(form.ineligible_versions),
+                )
+                % {"count": len(form.ineligible_versions)},
+            )
 
         return self._get_success_redirect()
 
@@ -257,3 +283,160 @@ class CancelCollection(FormView):
 
 
 cancel_collection = CancelCollection.as_view()
+
+
+class ReviewerInbox(TemplateView):
+    """
+    Requests of all the collections in review awaiting the current user's
+    review. Paginated on the primary key (keyset pagination), so deep pages
+    cost the same as the first one.
+    """
+    template_name = "djangocms_moderation/reviewer_inbox.html"
+    paginate_by = 50
+
+    def get_after(self):
+        try:
+            return int(self.request.GET.get("after", 0))
+        except ValueError:
+            return 0
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        after = self.get_after()
+        moderation_requests = list(
+            get_requests_awaiting_review(self.request.user)
+            .filter(pk__gt=after)
+            .select_related("collection__author", "version__content_type")
+            .prefetch_related("version__content")
+            .order_by("pk")[:self.paginate_by + 1]
+        )
+        next_url = None
+        if len(moderation_requests) > self.paginate_by:
+            moderation_requests = moderation_requests[:self.paginate_by]
+            next_url = f"{self.request.path}?after={moderation_requests[-1].pk}"
+
+        changelist_url = reverse("admin:djangocms_moderation_moderationrequest_changelist")
+        for moderation_request in moderation_requests:
+            moderation_request.collection_url = (
+                f"{changelist_url}?moderation_request__collection__id={moderation_request.collection_id}"
+            )
+        context.update(
+            admin.site.each_context(self.request),
+            opts=ModerationRequest._meta,
+            title=_("My pending reviews"),
+            moderation_requests=moderation_requests,
+            first_url=self.request.path if after else None,
+            next_url=next_url,
+        )
+        return context
+
+
+reviewer_inbox = ReviewerInbox.as_view()
+
+
+def moderation_stats(request):
+    """
+    Statistics of the moderation backlog as JSON, for monitoring.
+    Only available to staff users, through the admin.
+    """
+    return JsonResponse(get_cached_moderation_stats())
+
+
+def audit_trail(request, collection_id=None):
+    """
+    Streams the audit trail of a collection, or of the actions taken in the
+    date range given by the `start` and `end` parameters, as CSV or, with
+    `format=jsonl`, JSON lines
+    """
+    if not request.user.has_perm("djangocms_moderation.view_moderationcollection"):
+        raise PermissionDenied
+    if collection_id is not None:
+        get_object_or_404(ModerationCollection, pk=collection_id)
+
+    output_format = request.GET.get("format", "csv")
+    if output_format not in FORMATS:
+        return HttpResponseBadRequest(f"Unknown format: {output_format}")
+    try:
+        start, end = (
+            parse_audit_date(request.GET[name]) if request.GET.get(name) else None
+            for name in ("start", "end")
+        )
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+
+    rows = get_audit_rows(collection_id=collection_id, start=start, end=end)
+    filename = f"moderation-audit-{collection_id}" if collection_id else "moderation-audit"
+    return StreamingHttpResponse(
+        export_audit_trail(rows, output_format, chunk_size=conf.AUDIT_EXPORT_CHUNK_SIZE),
+        content_type=FORMATS[output_format][1],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{output_format}"'},
+    )
+
+
+def _get_list(request, name):
+    return [
+        value
+        for values in request.GET.getlist(name)
+        for value in values.split(",")
+        if value
+    ]
+
+
+def moderation_state(request):
+    """
+    Moderation state of the `version` ids and of the content objects given
+    as `object` keys, "<content_type_id>:<object_id>", comma separated or
+    repeated, as JSON. Returns 304 without reading the actions when the
+    state hasn't changed since the ETag sent by the client, which
+    keeps it itself as the admin responses are never cached.
+    """
+    if not request.user.has_perm("djangocms_moderation.view_moderationrequest"):
+        raise PermissionDenied
+    try:
+        version_ids = [int(pk) for pk in _get_list(request, "version")]
+        object_keys = [parse_object_key(key) for key in _get_list(request, "object")]
+    except ValueError:
+        return HttpResponseBadRequest("Invalid version or object")
+    if len(version_ids) + len(object_keys) > conf.STATE_MAX_ITEMS:
+        return HttpResponseBadRequest(f"At most {conf.STATE_MAX_ITEMS} versions and objects")
+
+    requests = get_active_requests(version_ids, object_keys)
+    etag = get_etag(requests)
+    # Without Last-Modified, as the state goes back to an earlier date when
+    # the latest request leaves the set
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse(get_state(requests))
+    response["ETag"] = etag
+    return response
+
+
+def version_diff(request, version_id):
+    """
+    Visual diff of a version under moderation against the published version
+    of its content, shared by the reviewers through the cache
+    """
+    if not request.user.has_perm("djangocms_moderation.view_moderationrequest"):
+        raise PermissionDenied
+    moderation_request = get_object_or_404(
+        ModerationRequest.objects.select_related("version", "collection"),
+        version=version_id,
+        is_active=True,
+    )
+    return HttpResponse(get_version_diff(request, moderation_request))
+
+
+def preview_snapshot(request, version_id):
+    """
+    Serves the preview snapshot of a version in review, or redirects to its
+    preview when it has none
+    """
+    if not request.user.has_perm("djangocms_moderation.view_moderationrequest"):
+        raise PermissionDenied
+    moderation_request = get_object_or_404(
+        ModerationRequest.objects.select_related("version"), version=version_id, is_active=True
+    )
+    snapshot = get_preview_snapshot(moderation_request.version_id)
+    if snapshot is None:
+        return HttpResponseRedirect(get_object_preview_url(moderation_request.version.content))
+    return HttpResponse(snapshot)
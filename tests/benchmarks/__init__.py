@@ -0,0 +1,5 @@
+"""
+Benchmarks of the moderation hot paths, see `__main__` for how to run them.
+
+They are not collected by the test runner.
+"""
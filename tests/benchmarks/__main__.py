@@ -0,0 +1,190 @@
+"""
+Runs the benchmark scenarios and prints a JSON report.
+
+    python -m tests.benchmarks --sizes 10,100,1000 --output benchmarks.json
+
+For every scenario and size the report holds the wall time and the number
+of queries of the measured call. The growth of the query count between the
+smallest and the largest size is reported as an exponent: about 0 for a
+constant number of queries, 1 for linear and 2 for quadratic growth. The
+command fails if an exponent is above ``--max-query-growth``.
+
+With ``--explain`` the report also holds the query plans of the hottest
+lookups on a collection of the largest size, see `tests.benchmarks.plans`.
+With ``--instantiate N`` it holds the time to build N moderation requests
+from rows next to the time stock Django takes, see
+`tests.benchmarks.instantiation`.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+
+def parse_args(argv, scenarios):
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks")
+    parser.add_argument(
+        "--sizes",
+        default="10,100,1000",
+        help="Comma separated data set sizes, from 10 to 10000 (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        dest="scenarios",
+        choices=sorted(scenarios),
+        help="Only run the given scenario, can be repeated",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Measure each scenario this many times and keep the fastest run",
+    )
+    parser.add_argument(
+        "--max-query-growth",
+        type=float,
+        default=1.2,
+        help="Fail if the query count grows faster than size ** N (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Add the query plans of the hottest lookups to the report",
+    )
+    parser.add_argument(
+        "--instantiate",
+        type=int,
+        metavar="N",
+        help="Add the time to build N moderation requests from rows to the report",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+    args.sizes = sorted(int(size) for size in args.sizes.split(","))
+    return args
+
+
+def measure(scenario, size):
+    from django.core.cache import cache
+    from django.db import transaction
+
+    from djangocms_moderation.instrumentation import track_queries
+
+    with transaction.atomic():
+        run = scenario(size)
+        with track_queries() as stats:
+            start = time.perf_counter()
+            run()
+            wall_time = time.perf_counter() - start
+        transaction.set_rollback(True)
+    cache.clear()
+    return {
+        "wall_time": round(wall_time, 6),
+        "db_time": round(stats.time, 6),
+        "queries": stats.count,
+        "duplicate_queries": stats.duplicate_count,
+    }
+
+
+def explain_plans(size):
+    from django.contrib.auth.models import User
+    from django.db import transaction
+
+    from .factories import make_collection_in_review, make_reviewer_group, make_workflow
+    from .plans import explain
+
+    with transaction.atomic():
+        author = User.objects.create_superuser("admin", "admin@example.com", "admin")
+        workflow = make_workflow(make_reviewer_group(2))
+        collection = make_collection_in_review(size, author, workflow, approved=True)
+        plans = explain(collection.moderation_requests.last())
+        transaction.set_rollback(True)
+    return plans
+
+
+def growth(results, key):
+    """
+    Exponent of the growth of `results[key]` between the smallest and the
+    largest size.
+    """
+    first, last = results[0], results[-1]
+    if last["size"] == first["size"] or not first[key] or not last[key]:
+        return None
+    return round(
+        math.log(last[key] / first[key]) / math.log(last["size"] / first["size"]), 2
+    )
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    import django
+    from django.apps import apps
+    from django.conf import settings
+    from django.test.utils import setup_test_environment
+
+    django.setup()
+    setup_test_environment()
+    # Like the test suite, create the tables without running the migrations
+    settings.MIGRATION_MODULES = {app.label: None for app in apps.get_app_configs()}
+
+    from django.db import connection
+
+    connection.creation.create_test_db(verbosity=0)
+
+
+def main(argv=None):
+    setup_django()
+    from .scenarios import SCENARIOS
+
+    args = parse_args(argv, SCENARIOS)
+    report = {
+        "python": platform.python_version(),
+        "sizes": args.sizes,
+        "scenarios": {},
+    }
+    failures = []
+    for name in args.scenarios or SCENARIOS:
+        results = []
+        for size in args.sizes:
+            runs = [measure(SCENARIOS[name], size) for _ in range(args.repeat)]
+            result = min(runs, key=lambda run: run["wall_time"])
+            results.append(dict(size=size, **result))
+            print(f"{name} [{size}]: {result}", file=sys.stderr)
+        query_growth = growth(results, "queries")
+        report["scenarios"][name] = {
+            "description": SCENARIOS[name].__doc__,
+            "results": results,
+            "query_growth": query_growth,
+            "time_growth": growth(results, "wall_time"),
+        }
+        if query_growth is not None and query_growth > args.max_query_growth:
+            failures.append(name)
+    if args.explain:
+        report["plans"] = explain_plans(args.sizes[-1])
+    if args.instantiate:
+        from .instantiation import instantiation
+
+        report["instantiation"] = instantiation(args.instantiate)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if failures:
+        failures = ", ".join(failures)
+        print(
+            f"Query count grows faster than size ** {args.max_query_growth}: {failures}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Builders for the large data sets used by the benchmarks.
+
+The regular factories in `tests.utils.factories` save one object at a time,
+which is too slow to build collections of thousands of requests, so most of
+the objects are created here with `bulk_create`.
+"""
+from django.contrib.auth.models import Group, User
+from django.contrib.contenttypes.models import ContentType
+
+from djangocms_versioning import constants as versioning_constants
+from djangocms_versioning.models import Version
+
+from djangocms_moderation import constants
+from djangocms_moderation.models import (
+    ModerationCollection,
+    ModerationRequest,
+    ModerationRequestAction,
+    ModerationRequestTreeNode,
+    Role,
+    Workflow,
+)
+from tests.utils.factories import PlaceholderFactory, PollPluginFactory
+from tests.utils.moderated_polls.models import Poll, PollContent
+
+
+def make_users(size, prefix="user"):
+    User.objects.bulk_create(
+        User(username=f"{prefix}-{i}", email=f"{prefix}-{i}@example.com")
+        for i in range(size)
+    )
+    return User.objects.filter(username__startswith=f"{prefix}-")
+
+
+def make_reviewer_group(size, name="reviewers"):
+    """
+    A role assigned to a group of `size` users
+    """
+    group = Group.objects.create(name=name)
+    group.user_set.add(*make_users(size, prefix=name))
+    return Role.objects.create(name=name, group=group)
+
+
+def make_workflow(role, name="Benchmark workflow"):
+    workflow = Workflow.objects.create(name=name)
+    workflow.steps.create(role=role, is_required=True, order=1)
+    return workflow
+
+
+def make_poll_versions(size, created_by, language="en"):
+    """
+    `size` draft poll versions, each of a different poll
+    """
+    polls = Poll.objects.bulk_create(Poll(name=f"Poll {i}") for i in range(size))
+    contents = PollContent.objects.bulk_create(
+        PollContent(poll=poll, language=language, text=poll.name) for poll in polls
+    )
+    content_type = ContentType.objects.get_for_model(PollContent)
+    return Version.objects.bulk_create(
+        Version(
+            content_type=content_type,
+            object_id=content.pk,
+            created_by=created_by,
+            number="1",
+            state=versioning_constants.DRAFT,
+        )
+        for content in contents
+    )
+
+
+def make_nested_page_version(size, created_by):
+    """
+    A page version with a tree of `size` moderated poll plugins: every other
+    poll is placed on the page, the others inside the previous poll.
+    """
+    from djangocms_versioning.test_utils.factories import PageVersionFactory
+
+    page_version = PageVersionFactory(created_by=created_by, content__language="en")
+    page_placeholder = PlaceholderFactory(source=page_version.content, slot="content")
+    poll_versions = make_poll_versions(size, created_by)
+    for i, version in enumerate(poll_versions):
+        if i % 2:
+            placeholder = PlaceholderFactory(source=poll_versions[i - 1].content, slot="content")
+        else:
+            placeholder = page_placeholder
+        PollPluginFactory(placeholder=placeholder, poll=version.content.poll)
+    return page_version
+
+
+def make_collection(size, author, workflow, status=constants.COLLECTING):
+    """
+    A collection of `size` moderation requests, each of a root tree node
+    """
+    collection = ModerationCollection.objects.create(
+        name=f"Collection of {size}", author=author, workflow=workflow, status=status,
+    )
+    moderation_requests = ModerationRequest.objects.bulk_create(
+        ModerationRequest(collection=collection, version=version, author=author, language="en")
+        for version in make_poll_versions(size, author)
+    )
+    ModerationRequestTreeNode.add_roots(moderation_requests)
+    return collection
+
+
+def make_collection_in_review(size, author, workflow, approved=False):
+    """
+    A collection of `size` requests submitted for review, optionally with
+    all the required steps approved
+    """
+    collection = make_collection(size, author, workflow, status=constants.IN_REVIEW)
+    moderation_requests = list(collection.moderation_requests.all())
+    step = workflow.first_step
+    actions = [
+        ModerationRequestAction(
+            moderation_request=moderation_request,
+            by_user=author,
+            to_role=step.role,
+            action=constants.ACTION_STARTED,
+        )
+        for moderation_request in moderation_requests
+    ]
+    if approved:
+        actions += [
+            ModerationRequestAction(
+                moderation_request=moderation_request,
+                by_user=author,
+                step_approved=step,
+                action=constants.ACTION_APPROVED,
+            )
+            for moderation_request in moderation_requests
+        ]
+    ModerationRequestAction.objects.bulk_create(actions)
+    return collection
+
+
+def make_collections(size, author, workflow, requests=1):
+    """
+    `size` collections of `requests` requests each
+    """
+    collections = ModerationCollection.objects.bulk_create(
+        ModerationCollection(
+            name=f"Collection {i}", author=author, workflow=workflow, status=constants.IN_REVIEW,
+        )
+        for i in range(size)
+    )
+    versions = iter(make_poll_versions(size * requests, author))
+    moderation_requests = ModerationRequest.objects.bulk_create(
+        ModerationRequest(collection=collection, version=next(versions), author=author, language="en")
+        for collection in collections
+        for _ in range(requests)
+    )
+    ModerationRequestTreeNode.add_roots(moderation_requests)
+    return collections
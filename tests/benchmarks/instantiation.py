@@ -0,0 +1,68 @@
+"""
+Cost of building model instances from database rows.
+
+Changelists and bulk views load thousands of moderation requests, so
+anything added to model instantiation is paid for every row. The report
+compares the time to build the rows like a queryset does with the time
+stock Django needs for the same rows, calling `Model.__init__` directly.
+"""
+import time
+
+from django.db import DEFAULT_DB_ALIAS, models
+from django.utils import timezone
+
+from djangocms_moderation.models import ModerationRequest
+
+
+def _row(model):
+    values = {
+        "id": 1,
+        "collection_id": 1,
+        "version_id": 1,
+        "language": "en",
+        "is_active": True,
+        "date_sent": timezone.now(),
+        "generation": 0,
+        "compliance_number": None,
+        "author_id": 1,
+        "title": "Page",
+        "content_type_id": 1,
+        "version_number": "1",
+    }
+    field_names = [field.attname for field in model._meta.concrete_fields]
+    return field_names, [values[name] for name in field_names]
+
+
+def _stock_from_db(model, db, field_names, values):
+    # `Model.from_db()` without the `__init__` of the model class
+    instance = model.__new__(model)
+    models.Model.__init__(instance, *values)
+    instance._state.adding = False
+    instance._state.db = db
+    return instance
+
+
+def instantiation(count, model=ModerationRequest):
+    """
+    Seconds to build `count` instances of `model` from rows, and the same
+    for stock Django
+    """
+    field_names, values = _row(model)
+
+    start = time.perf_counter()
+    for _ in range(count):
+        model.from_db(DEFAULT_DB_ALIAS, field_names, values)
+    model_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(count):
+        _stock_from_db(model, DEFAULT_DB_ALIAS, field_names, values)
+    stock_time = time.perf_counter() - start
+
+    return {
+        "model": model._meta.label,
+        "count": count,
+        "time": round(model_time, 6),
+        "stock_time": round(stock_time, 6),
+        "ratio": round(model_time / stock_time, 2),
+    }
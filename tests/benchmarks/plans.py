@@ -0,0 +1,67 @@
+"""
+Query plans of the hottest moderation lookups.
+
+Each plan function takes a moderation request of a data set built by a
+scenario and returns the queryset of the lookup. The report holds the output
+of `QuerySet.explain()` for the configured database, with and without the
+indexes of the moderation models, which shows which lookups they serve.
+Run the benchmarks with PostgreSQL settings for the PostgreSQL plans.
+"""
+from django.db import connection
+
+from djangocms_moderation.models import ModerationRequest, ModerationRequestAction
+from tests.utils.base import drop_indexes
+
+
+PLANS = {}
+
+
+def plan(func):
+    PLANS[func.__name__] = func
+    return func
+
+
+@plan
+def active_request(moderation_request):
+    """`get_active_moderation_request`, uses `moderation_one_active_request`"""
+    # Like `get()`, without ordering
+    return ModerationRequest.objects.filter(
+        version=moderation_request.version_id, is_active=True
+    ).order_by()
+
+
+@plan
+def pending_steps(moderation_request):
+    """`get_pending_steps`, uses `moderation_action_approved_idx`"""
+    return moderation_request.get_pending_steps()
+
+
+@plan
+def last_action(moderation_request):
+    """`get_last_action`, uses `moderation_action_date_idx`"""
+    return moderation_request.actions.reverse()[:1]
+
+
+def _explain(queryset, label):
+    # Like `QuerySet.explain()`, but the SQL differs per label so that SQLite
+    # does not reuse a statement prepared before the indexes were dropped
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"{connection.ops.explain_query_prefix()} {sql} /* {label} */", params)
+        return "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+
+
+def explain(moderation_request):
+    """
+    The plans of the lookups with and without the indexes. Must run in a
+    transaction which is rolled back afterwards, to restore the indexes.
+    """
+    plans = {
+        name: {"description": func.__doc__, "indexed": _explain(func(moderation_request), "indexed")}
+        for name, func in PLANS.items()
+    }
+    drop_indexes(ModerationRequest)
+    drop_indexes(ModerationRequestAction)
+    for name, func in PLANS.items():
+        plans[name]["unindexed"] = _explain(func(moderation_request), "unindexed")
+    return plans
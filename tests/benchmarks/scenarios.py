@@ -0,0 +1,141 @@
+"""
+Benchmark scenarios.
+
+A scenario is a function which takes the size of the data set, builds it
+and returns the callable to measure. Each scenario runs in a transaction
+which is rolled back afterwards.
+"""
+from django.contrib.auth.models import User
+from django.test import Client
+from django.urls import reverse
+
+from djangocms_moderation.models import ModerationCollection
+from djangocms_moderation.utils import store_selection
+
+from .factories import (
+    make_collection,
+    make_collection_in_review,
+    make_collections,
+    make_nested_page_version,
+    make_reviewer_group,
+    make_workflow,
+)
+
+
+# Size of the reviewer group of the workflows, except for the scenarios
+# scaling the group itself
+REVIEWERS = 25
+
+SCENARIOS = {}
+
+
+def scenario(func):
+    SCENARIOS[func.__name__] = func
+    return func
+
+
+def _make_superuser(username="admin"):
+    return User.objects.create_superuser(username, f"{username}@example.com", "admin")
+
+
+def _make_client(user):
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def _expect(response, *status_codes):
+    if response.status_code not in status_codes:
+        raise AssertionError(f"Unexpected response status {response.status_code}")
+    return response
+
+
+def _tree_action_url(collection, url_name, user):
+    node_ids = collection.moderation_requests.values_list(
+        "moderationrequesttreenode", flat=True
+    )
+    token = store_selection(user, node_ids)
+    return f"{reverse(url_name)}?selection={token}&collection_id={collection.pk}"
+
+
+@scenario
+def add_version_nested(size):
+    """Add a page version with `size` nested moderated polls to a collection"""
+    author = _make_superuser()
+    workflow = make_workflow(make_reviewer_group(REVIEWERS))
+    collection = ModerationCollection.objects.create(
+        name="Collection", author=author, workflow=workflow,
+    )
+    page_version = make_nested_page_version(size, author)
+    return lambda: collection.add_version(page_version, include_children=True)
+
+
+@scenario
+def submit_for_review(size):
+    """Submit a collection of `size` requests for review"""
+    author = _make_superuser()
+    workflow = make_workflow(make_reviewer_group(REVIEWERS))
+    collection = make_collection(size, author, workflow)
+    return lambda: collection.submit_for_review(by_user=author)
+
+
+@scenario
+def approved_view(size):
+    """Approve all the `size` requests of a collection in review"""
+    author = _make_superuser()
+    role = make_reviewer_group(REVIEWERS)
+    collection = make_collection_in_review(size, author, make_workflow(role))
+    reviewer = role.group.user_set.first()
+    reviewer.is_staff = reviewer.is_superuser = True
+    reviewer.save()
+    url = _tree_action_url(
+        collection, "admin:djangocms_moderation_moderationrequest_approve", reviewer,
+    )
+    client = _make_client(reviewer)
+    return lambda: _expect(client.post(url), 302)
+
+
+@scenario
+def published_view(size):
+    """Publish all the `size` approved requests of a collection"""
+    author = _make_superuser()
+    workflow = make_workflow(make_reviewer_group(REVIEWERS))
+    collection = make_collection_in_review(size, author, workflow, approved=True)
+    url = _tree_action_url(
+        collection, "admin:djangocms_moderation_moderationrequest_publish", author,
+    )
+    client = _make_client(author)
+    return lambda: _expect(client.post(url), 302)
+
+
+@scenario
+def tree_changelist(size):
+    """List the requests of a collection of `size` requests"""
+    author = _make_superuser()
+    workflow = make_workflow(make_reviewer_group(REVIEWERS))
+    collection = make_collection_in_review(size, author, workflow)
+    url = reverse("admin:djangocms_moderation_moderationrequest_changelist")
+    url = f"{url}?moderation_request__collection__id={collection.pk}"
+    client = _make_client(author)
+    return lambda: _expect(client.get(url), 200)
+
+
+@scenario
+def collection_changelist(size):
+    """List `size` collections in review"""
+    author = _make_superuser()
+    workflow = make_workflow(make_reviewer_group(REVIEWERS))
+    make_collections(size, author, workflow)
+    url = reverse("admin:djangocms_moderation_moderationcollection_changelist")
+    client = _make_client(author)
+    return lambda: _expect(client.get(url), 200)
+
+
+@scenario
+def collection_reviewers(size):
+    """Reviewers of a collection of `size` requests reviewed by a group of `size` users"""
+    author = _make_superuser()
+    role = make_reviewer_group(size)
+    collection = make_collection_in_review(size, author, make_workflow(role))
+    return lambda: ModerationCollection.objects.reviewers(collection)
+
@@ -0,0 +1,178 @@
+// Checks that expanding a node rendered by the server loads its children
+// from the children endpoint, although treebeard-admin.js binds its own
+// click handler on the rendered toggles. Run by tests/test_admin.py with
+// node, against a minimal stand-in of the DOM and of jQuery.
+const assert = require('assert');
+const fs = require('fs');
+const path = require('path');
+
+const createElement = (tagName, attributes = {}, className = '') => ({
+    tagName,
+    attributes,
+    className,
+    parentNode: null,
+    listeners: [],
+    addEventListener(type, listener, capture) {
+        this.listeners.push({ type, listener, capture: Boolean(capture) });
+    },
+});
+
+const resultList = createElement('TABLE', { id: 'result_list' });
+const row = createElement('TR', { 'data-node-id': '2', 'data-path': '00010001', 'data-children-loaded': '0' });
+const toggle = createElement('A', {}, 'treebeard-collapse treebeard-expanded');
+row.parentNode = resultList;
+toggle.parentNode = row;
+
+const matches = (element, selector) => {
+    if (selector === 'tr') {
+        return element.tagName === 'TR';
+    }
+    if (selector === 'a.treebeard-collapse') {
+        return element.tagName === 'A' && element.className.split(' ').includes('treebeard-collapse');
+    }
+    return false;
+};
+
+const wrap = elements => ({
+    0: elements[0],
+    length: elements.length,
+    closest(selector) {
+        let element = elements[0];
+
+        while (element && !matches(element, selector)) {
+            element = element.parentNode;
+        }
+        return wrap(element ? [element] : []);
+    },
+    find(selector) {
+        return wrap(elements[0] === row && selector === 'a.treebeard-collapse' ? [toggle] : []);
+    },
+    hasClass(name) {
+        return elements[0].className.split(' ').includes(name);
+    },
+    toggleClass(name, state) {
+        elements.forEach(element => {
+            const names = element.className.split(' ').filter(other => other !== name);
+
+            element.className = (state ? names.concat(name) : names).join(' ');
+        });
+        return this;
+    },
+    text() {
+        return this;
+    },
+    attr(name, value) {
+        if (value === undefined) {
+            return elements[0].attributes[name];
+        }
+        elements.forEach(element => {
+            element.attributes[name] = String(value);
+        });
+        return this;
+    },
+    each(callback) {
+        elements.forEach((element, index) => callback(index, element));
+        return this;
+    },
+    on(type, selector, handler) {
+        elements.forEach(element => {
+            element.addEventListener(type, event => {
+                if (matches(event.target, selector)) {
+                    handler(Object.assign({}, event, { currentTarget: event.target }));
+                }
+            });
+        });
+        return this;
+    },
+    val() {
+        return '/admin/djangocms_moderation/moderationrequesttreenode/children/';
+    },
+});
+
+const requests = [];
+const readyHandlers = [];
+const $ = selector => {
+    if (typeof selector === 'function') {
+        readyHandlers.push(selector);
+        return undefined;
+    }
+    if (selector && selector.tagName) {
+        return wrap([selector]);
+    }
+    if (selector === '#moderation-tree-children-url') {
+        return wrap([{}]);
+    }
+    if (selector === '#result_list tbody tr[data-children-loaded="0"]') {
+        return wrap([row]);
+    }
+    return wrap([]);
+};
+$.getJSON = (url, data) => {
+    requests.push({ url, data });
+    const promise = { done: () => promise, fail: () => promise };
+
+    return promise;
+};
+
+global.django = { jQuery: $ };
+global.document = { getElementById: id => (id === 'result_list' ? resultList : null) };
+const timeouts = [];
+global.setTimeout = callback => timeouts.push(callback);
+
+const scriptPath = path.join(__dirname, '../../djangocms_moderation/static/djangocms_moderation/js/tree.js');
+eval(fs.readFileSync(scriptPath, 'utf8'));
+readyHandlers.forEach(handler => handler());
+timeouts.forEach(callback => callback());
+
+// What treebeard-admin.js binds on the rendered toggles
+let treebeardClicks = 0;
+toggle.addEventListener('click', event => {
+    treebeardClicks += 1;
+    event.preventDefault();
+    event.stopPropagation();
+});
+
+// Capture listeners of the ancestors first, then the listeners of the
+// target, then the other listeners of the ancestors
+const click = target => {
+    let stopped = false;
+    const event = {
+        type: 'click',
+        target,
+        preventDefault() {},
+        stopPropagation() {
+            stopped = true;
+        },
+    };
+    const ancestors = [];
+
+    for (let element = target.parentNode; element; element = element.parentNode) {
+        ancestors.unshift(element);
+    }
+    ancestors.forEach(element => {
+        element.listeners.filter(({ capture }) => capture).forEach(({ listener }) => {
+            if (!stopped) {
+                listener(event);
+            }
+        });
+    });
+    if (!stopped) {
+        target.listeners.forEach(({ listener }) => listener(event));
+    }
+    ancestors.reverse().forEach(element => {
+        element.listeners.filter(({ capture }) => !capture).forEach(({ listener }) => {
+            if (!stopped) {
+                listener(event);
+            }
+        });
+    });
+};
+
+assert.ok(toggle.className.split(' ').includes('treebeard-collapsed'));
+click(toggle);
+
+assert.strictEqual(treebeardClicks, 0);
+assert.deepStrictEqual(requests, [
+    { url: '/admin/djangocms_moderation/moderationrequesttreenode/children/', data: { parent: '00010001' } },
+]);
+assert.ok(toggle.className.split(' ').includes('treebeard-expanded'));
@@ -1,8 +1,19 @@
+import json
+import re
+import shutil
+import subprocess
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.models import Permission, User
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.http import QueryDict
 from django.test.client import RequestFactory
 from django.urls import reverse
+from django.utils.http import urlencode
 
 from cms.utils.urlutils import admin_reverse
 
@@ -13,15 +24,27 @@ from djangocms_moderation.admin import (
     ModerationCollectionAdmin,
     ModerationRequestAdmin,
     ModerationRequestTreeAdmin,
+    RequestCommentAdmin,
 )
 from djangocms_moderation.constants import ACTION_REJECTED
-from djangocms_moderation.models import ModerationCollection, ModerationRequest
+from djangocms_moderation.instrumentation import track_queries
+from djangocms_moderation.models import (
+    CollectionComment,
+    ConfirmationFormSubmission,
+    ConfirmationPage,
+    ModerationCollection,
+    ModerationRequest,
+    ModerationRequestTreeNode,
+    RequestComment,
+    Workflow,
+)
 
 from .utils.base import BaseTestCase, MockRequest
 from .utils.factories import (
     ModerationCollectionFactory,
     PollVersionFactory,
     RootModerationRequestTreeNodeFactory,
+    UserFactory,
     WorkflowFactory,
 )
 
@@ -97,6 +120,195 @@ class ModerationAdminTestCase(BaseTestCase):
         self.assertContains(response, str(self.mr1.version.content))
         self.assertContains(response, str(self.mr2.version.content))
 
+    def _get_tree_context(self, response):
+        return [
+            (row["node-id"], row["parent-id"], row["level"], row["children-loaded"])
+            for row in json.loads(
+                re.search(
+                    r'<script id="tree-context" type="application/json">(.*?)</script>',
+                    response.content.decode(),
+                ).group(1)
+            )
+        ]
+
+    @mock.patch("djangocms_moderation.conf.TREE_LEVELS", None)
+    def test_changelist_tree_starts_at_the_requests_of_the_collection(self):
+        child = self.mr1n.add_child(moderation_request=self.mr2)
+
+        with self.login_user_context(self.user):
+            response = self.client.get(self.url_with_filter)
+
+        self.assertEqual(
+            self._get_tree_context(response),
+            [
+                (str(self.mr1n.pk), 0, 1, 1),
+                (str(child.pk), self.mr1n.pk, 2, 1),
+                (str(self.mr2n.pk), 0, 1, 1),
+            ],
+        )
+
+    def test_changelist_renders_the_first_levels_of_the_tree(self):
+        child = self.mr1n.add_child(moderation_request=self.mr2)
+        child.add_child(moderation_request=self.mr1)
+
+        with self.login_user_context(self.user):
+            response = self.client.get(self.url_with_filter)
+            with mock.patch("djangocms_moderation.conf.TREE_LEVELS", 2):
+                two_levels = self.client.get(self.url_with_filter)
+
+        self.assertEqual(
+            self._get_tree_context(response),
+            [(str(self.mr1n.pk), 0, 1, 0), (str(self.mr2n.pk), 0, 1, 0)],
+        )
+        self.assertEqual(
+            self._get_tree_context(two_levels),
+            [
+                (str(self.mr1n.pk), 0, 1, 1),
+                (str(child.pk), self.mr1n.pk, 2, 0),
+                (str(self.mr2n.pk), 0, 1, 1),
+            ],
+        )
+
+    @mock.patch("djangocms_moderation.conf.TREE_LEVELS", None)
+    def test_changelist_pages_over_the_requests_at_the_top_of_the_tree(self):
+        child = self.mr1n.add_child(moderation_request=self.mr2)
+        grandchild = child.add_child(moderation_request=self.mr1)
+        tree_admin = admin.site._registry[ModerationRequestTreeNode]
+
+        with self.login_user_context(self.user), mock.patch.object(tree_admin, "list_per_page", 1):
+            first_page = self.client.get(self.url_with_filter)
+            second_page = self.client.get(self.url_with_filter + "&p=2")
+
+        self.assertEqual(first_page.context["cl"].result_count, 2)
+        self.assertEqual(
+            [node.pk for node in first_page.context["cl"].result_list],
+            [self.mr1n.pk, child.pk, grandchild.pk],
+        )
+        self.assertEqual([node.pk for node in second_page.context["cl"].result_list], [self.mr2n.pk])
+
+    @mock.patch("djangocms_moderation.conf.TREE_LEVELS", None)
+    def test_changelist_sorted_by_title_lists_the_descendants_below_their_request(self):
+        child = self.mr1n.add_child(moderation_request=self.mr2)
+        ModerationRequest.objects.filter(pk=self.mr1.pk).update(title="Bravo")
+        ModerationRequest.objects.filter(pk=self.mr2.pk).update(title="Alpha")
+
+        with self.login_user_context(self.user):
+            list_display = self.client.get(self.url_with_filter).context["cl"].list_display
+            title = list_display.index("get_title")
+            ascending = self.client.get(f"{self.url_with_filter}&o={title}")
+            descending = self.client.get(f"{self.url_with_filter}&o=-{title}")
+
+        self.assertEqual(
+            [node.pk for node in ascending.context["cl"].result_list],
+            [self.mr2n.pk, self.mr1n.pk, child.pk],
+        )
+        self.assertEqual(
+            [node.pk for node in descending.context["cl"].result_list],
+            [self.mr1n.pk, child.pk, self.mr2n.pk],
+        )
+
+    @mock.patch("djangocms_moderation.conf.TREE_LEVELS", 1)
+    def test_changelist_searched_lists_the_matching_nodes_flat(self):
+        child = self.mr1n.add_child(moderation_request=self.mr2)
+        grandchild = child.add_child(moderation_request=self.mr1)
+        ModerationRequest.objects.filter(pk=self.mr1.pk).update(title="Bravo")
+        ModerationRequest.objects.filter(pk=self.mr2.pk).update(title="Alpha")
+        tree_admin = admin.site._registry[ModerationRequestTreeNode]
+
+        with self.login_user_context(self.user):
+            searched = self.client.get(f"{self.url_with_filter}&q=brav")
+            with mock.patch.object(tree_admin, "list_per_page", 1):
+                second_page = self.client.get(f"{self.url_with_filter}&q=alph&p=2")
+
+        # Nested requests which match are listed, without their parents
+        self.assertEqual(
+            [node.pk for node in searched.context["cl"].result_list],
+            [self.mr1n.pk, grandchild.pk],
+        )
+        self.assertEqual(
+            self._get_tree_context(searched),
+            [(str(self.mr1n.pk), 0, 1, 1), (str(grandchild.pk), 0, 1, 1)],
+        )
+        self.assertEqual(second_page.context["cl"].result_count, 2)
+        self.assertEqual([node.pk for node in second_page.context["cl"].result_list], [self.mr2n.pk])
+
+    def test_content_type_column_shows_the_type_it_is_sorted_by(self):
+        tree_admin = admin.site._registry[ModerationRequestTreeNode]
+
+        self.assertEqual(
+            tree_admin.get_content_type(self.mr1n),
+            ContentType.objects.get_for_id(self.mr1.content_type_id),
+        )
+        self.assertEqual(tree_admin.get_content_type(self.mr1n), self.mr1.version.content_type)
+
+    def test_collections_are_searched_by_the_titles_of_their_requests(self):
+        ModerationRequest.objects.filter(pk=self.mr1.pk).update(title="Bravo")
+        ModerationCollectionFactory(author=self.user, workflow=self.wf)
+        url = reverse("admin:djangocms_moderation_moderationcollection_changelist")
+
+        with self.login_user_context(self.user):
+            response = self.client.get(url, {"q": "brav"})
+
+        self.assertEqual(list(response.context["cl"].result_list), [self.collection])
+
+    def test_changelist_count_is_cached_under_the_generation_of_the_collection(self):
+        cache.clear()
+        with self.login_user_context(self.user):
+            self.client.get(self.url_with_filter)
+            RootModerationRequestTreeNodeFactory(moderation_request__collection=self.collection)
+            cached = self.client.get(self.url_with_filter)
+            ModerationCollection.objects.filter(pk=self.collection.pk).touch()
+            touched = self.client.get(self.url_with_filter)
+
+        self.assertEqual(cached.context["cl"].result_count, 2)
+        self.assertEqual(len(cached.context["cl"].result_list), 3)
+        self.assertEqual(touched.context["cl"].result_count, 3)
+
+    def test_children_view(self):
+        child = self.mr1n.add_child(moderation_request=self.mr2)
+        grandchild = child.add_child(moderation_request=self.mr1)
+        url = "{}?{}".format(
+            reverse("admin:djangocms_moderation_moderationrequesttreenode_children"),
+            urlencode({"moderation_request__collection__id": self.collection.pk, "parent": child.path}),
+        )
+
+        with self.login_user_context(self.user):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        [row] = response.json()["rows"]
+        self.assertEqual(
+            {key: value for key, value in row.items() if key != "html"},
+            {
+                "node-id": str(grandchild.pk),
+                "parent-id": child.pk,
+                "level": 3,
+                "has-children": 0,
+                "children-loaded": 0,
+                "path": grandchild.path,
+            },
+        )
+        self.assertTrue(row["html"].startswith("<tr>"))
+        self.assertIn(f'value="{grandchild.pk}"', row["html"])
+        self.assertIn(str(self.mr1.version.content), row["html"])
+
+    def test_children_view_requires_a_parent(self):
+        url = "{}?moderation_request__collection__id={}".format(
+            reverse("admin:djangocms_moderation_moderationrequesttreenode_children"), self.collection.pk,
+        )
+
+        with self.login_user_context(self.user):
+            self.assertEqual(self.client.get(url).status_code, 400)
+            self.assertEqual(self.client.get(url + "&parent=ZZZZ").status_code, 404)
+
+    @skipUnless(shutil.which("node"), "node is not installed")
+    def test_rendered_nodes_load_their_children_on_expand(self):
+        script = Path(__file__).parent / "js" / "tree_toggle.js"
+
+        result = subprocess.run(["node", str(script)], capture_output=True, text=True, check=False)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+
     def test_delete_selected_action_visibility(self):
         mock_request = MockRequest()
         mock_request.user = self.user
@@ -411,6 +623,43 @@ class ModerationAdminTestCase(BaseTestCase):
         )
 
 
+    def test_change_view_query_count_does_not_depend_on_actions(self):
+        confirmation_page = ConfirmationPage.objects.create(name="Checklist")
+
+        def approve(step):
+            self.mr1.actions.create(
+                by_user=self.user, to_user=self.user2, action=constants.ACTION_APPROVED, step_approved=step,
+            )
+            ConfirmationFormSubmission.objects.create(
+                moderation_request=self.mr1, for_step=step, by_user=self.user, confirmation_page=confirmation_page,
+            )
+
+        url = reverse("admin:djangocms_moderation_moderationrequest_change", args=(self.mr1.pk,))
+        self.client.force_login(self.user)
+        approve(self.wf1st1)
+        # The first request of a user creates their CMS settings
+        self.client.get(url)
+        with track_queries() as few:
+            self.client.get(url)
+
+        approve(self.wf1st2)
+        approve(self.wf1st3)
+        with track_queries() as many:
+            response = self.client.get(url)
+
+        self.assertEqual(few.count, many.count)
+        for step in (self.wf1st1, self.wf1st2, self.wf1st3):
+            submission = self.mr1.form_submissions.get(for_step=step)
+            self.assertContains(
+                response,
+                '<a href="{}" target="_blank">{}</a>'.format(
+                    reverse("admin:djangocms_moderation_confirmationformsubmission_change", args=(submission.pk,)),
+                    step.role.name,
+                ),
+                html=True,
+            )
+
+
 class ModerationAdminChangelistConfigurationTestCase(BaseTestCase):
     def setUp(self):
         self.wf = WorkflowFactory(name="Workflow Test")
@@ -494,6 +743,21 @@ class ModerationAdminChangelistConfigurationTestCase(BaseTestCase):
         self.assertContains(result, '<script src="/static/adminsortable2/js/adminsortable2.min.js"></script>')
         self.assertContains(result, '<input type="hidden" name="steps-0-id"')
 
+    def test_admin_forms_use_the_choices_from_the_settings(self):
+        request = RequestFactory().get("/")
+        request.user = self.get_superuser()
+        for model, field_name, choices in (
+            (Workflow, "compliance_number_backend", conf.COMPLIANCE_NUMBER_BACKENDS),
+            (ConfirmationPage, "template", conf.CONFIRMATION_PAGE_TEMPLATES),
+            (ModerationRequest, "language", settings.LANGUAGES),
+        ):
+            with self.subTest(model=model):
+                form = admin.site._registry[model].get_form(request)
+                form_choices = [choice for choice in form.base_fields[field_name].choices if choice[0]]
+                self.assertEqual(form_choices, list(choices))
+                # The model field is left alone
+                self.assertFalse(model._meta.get_field(field_name).choices)
+
     def test_moderated_models_cannot_be_published(self):
         from djangocms_versioning.exceptions import ConditionFailed
 
@@ -501,3 +765,81 @@ class ModerationAdminChangelistConfigurationTestCase(BaseTestCase):
 
         with self.assertRaises(ConditionFailed):
             version.check_publish(self.get_superuser())
+
+
+class CommentAdminTestCase(BaseTestCase):
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.request_comments_url = "{}?moderation_request__id__exact={}".format(
+            reverse("admin:djangocms_moderation_requestcomment_changelist"),
+            self.moderation_request1.pk,
+        )
+
+    def _add_request_comments(self, count):
+        return [
+            RequestComment.objects.create(
+                moderation_request=self.moderation_request1,
+                author=UserFactory(),
+                message=f"Comment {i}",
+            )
+            for i in range(count)
+        ]
+
+    def test_collection_changelist_shows_comment_count(self):
+        for i in range(2):
+            CollectionComment.objects.create(collection=self.collection1, author=self.user, message=str(i))
+
+        response = self.client.get(reverse("admin:djangocms_moderation_moderationcollection_changelist"))
+
+        self.assertContains(response, '<span class="cms-moderation-comment-count">2</span>', html=True)
+        collection = response.context["cl"].result_list.get(pk=self.collection1.pk)
+        self.assertEqual(collection.comment_count, 2)
+        self.assertIsNotNone(collection.last_comment_date)
+
+    def test_tree_changelist_shows_comment_count(self):
+        RootModerationRequestTreeNodeFactory(moderation_request=self.moderation_request1)
+        self._add_request_comments(3)
+
+        response = self.client.get(
+            "{}?moderation_request__collection__id={}".format(
+                reverse("admin:djangocms_moderation_moderationrequest_changelist"), self.collection1.pk,
+            )
+        )
+
+        self.assertContains(response, '<span class="cms-moderation-comment-count">3</span>', html=True)
+
+    def test_request_comments_changelist_query_count_does_not_depend_on_comments(self):
+        self._add_request_comments(2)
+        # The first request of a user creates their CMS settings
+        self.client.get(self.request_comments_url)
+        with track_queries() as few:
+            self.client.get(self.request_comments_url)
+
+        self._add_request_comments(10)
+        with track_queries() as many:
+            response = self.client.get(self.request_comments_url)
+
+        self.assertEqual(len(response.context["cl"].result_list), 12)
+        self.assertEqual(few.count, many.count)
+
+    @mock.patch.object(RequestCommentAdmin, "list_per_page", 2)
+    def test_request_comments_cursor_pagination(self):
+        comments = self._add_request_comments(3)
+
+        response = self.client.get(self.request_comments_url)
+
+        cl = response.context["cl"]
+        self.assertEqual(cl.result_list, comments[:2])
+        self.assertIsNone(cl.first_url)
+        self.assertEqual(
+            QueryDict(cl.next_url[1:]).dict(),
+            {"moderation_request__id__exact": str(self.moderation_request1.pk), "after": str(comments[1].pk)},
+        )
+        self.assertContains(response, "Next page")
+
+        response = self.client.get(reverse("admin:djangocms_moderation_requestcomment_changelist") + cl.next_url)
+
+        cl = response.context["cl"]
+        self.assertEqual(cl.result_list, comments[2:])
+        self.assertIsNone(cl.next_url)
+        self.assertIsNotNone(cl.first_url)
@@ -11,9 +11,13 @@ from cms.test_utils.util.context_managers import signal_tester
 
 from djangocms_versioning.constants import DRAFT, PUBLISHED
 from djangocms_versioning.models import Version
+from djangocms_versioning.test_utils.factories import PageVersionFactory
 
 from djangocms_moderation import constants
 from djangocms_moderation.admin import ModerationRequestTreeAdmin
+from djangocms_moderation.admin_actions import (
+    convert_queryset_to_version_queryset,
+)
 from djangocms_moderation.constants import ACTION_REJECTED
 from djangocms_moderation.models import (
     ModerationRequest,
@@ -23,6 +27,7 @@ from djangocms_moderation.models import (
 from djangocms_moderation.signals import published
 
 from .utils import factories
+from .utils.moderated_polls.models import PollContent
 
 
 def get_url_data(cls, action):
@@ -156,6 +161,29 @@ class ApproveSelectedTest(CMSTestCase):
         )
         self.assertFalse(notify_moderators_mock.called)
 
+    @mock.patch("django.contrib.messages.warning")
+    @mock.patch("django.contrib.messages.success")
+    @mock.patch("djangocms_moderation.admin.notify_collection_moderators")
+    @mock.patch("djangocms_moderation.admin.notify_collection_author")
+    def test_approve_selected_reports_lost_races(self, notify_author_mock, notify_moderators_mock,
+                                                 success_mock, warning_mock):
+        self.client.force_login(self.role1.user)
+        data = get_url_data(self, "approve_selected")
+        response = self.client.post(self.url, data)
+
+        # The requests looked approvable when the view checked them, but the
+        # step of request 1 was approved already, and request 2 is approved
+        # through its first node by the time its second node is reached
+        with mock.patch.object(ModerationRequest, "user_can_take_moderation_action", return_value=True):
+            response = self.client.post(response.url)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(success_mock.call_args[0][1], "1 request successfully approved")
+        self.assertEqual(warning_mock.call_args[0][1], "2 requests were already actioned")
+        self.assertEqual(
+            self.moderation_request1.actions.filter(action=constants.ACTION_APPROVED).count(), 2
+        )
+
     @mock.patch("django.contrib.messages.success")
     @mock.patch("djangocms_moderation.admin.notify_collection_moderators")
     def test_approve_selected_sends_correct_emails_to_moderators(self, notify_moderators_mock, messages_mock):
@@ -432,6 +460,20 @@ class ApproveSelectedTest(CMSTestCase):
             'awaiting other reviewers',
         )
 
+    def test_approve_selected_stores_selection_server_side(self):
+        self.client.force_login(self.role1.user)
+        data = get_url_data(self, "approve_selected")
+        response = self.client.post(self.url, data)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("selection=", response.url)
+        self.assertNotIn("ids=", response.url)
+
+        # The selection can't be used by another user
+        self.client.force_login(self.role2.user)
+        response = self.client.get(response.url)
+        self.assertEqual(response.status_code, 404)
+
     def test_approve_view_when_using_get(self):
         self.client.force_login(self.role1.user)
         # Choose the approve_selected action from the dropdown
@@ -447,6 +489,20 @@ class ApproveSelectedTest(CMSTestCase):
             'admin/djangocms_moderation/moderationrequest/approve_confirmation.html'
         )
 
+    def test_approve_view_context_can_be_iterated_again(self):
+        self.client.force_login(self.role1.user)
+        url = reverse("admin:djangocms_moderation_moderationrequest_approve")
+        url += "?ids=%d,%d&collection_id=%d" % (self.root2.pk, self.root1.pk, self.collection.pk)
+
+        response = self.client.get(url)
+
+        queryset = response.context["queryset"]
+        self.assertEqual(len(queryset), 2)
+        # In the order of the ids of the tree nodes
+        expected = [self.moderation_request1, self.moderation_request2]
+        self.assertEqual(list(queryset), expected)
+        self.assertEqual(list(queryset), expected)
+
 
 class RejectSelectedTest(CMSTestCase):
 
@@ -1227,5 +1283,31 @@ class DeletedSelectedTransactionTest(TransactionTestCase):
 
         # Check neither the tree nodes nor the requests have been deleted.
         # The db transaction should have rolled back.
-        self.assertEqual(ModerationRequestTreeNode.objects.all().count(), 3)
+        self.assertEqual(ModerationRequestTreeNode.objects.filter(moderation_request__isnull=False).count(), 3)
         self.assertEqual(ModerationRequest.objects.all().count(), 2)
+
+
+class ConvertQuerysetToVersionQuerysetTest(CMSTestCase):
+
+    def test_returns_versions_of_selected_content(self):
+        poll_versions = [factories.PollVersionFactory() for _ in range(3)]
+        other_version = factories.PollVersionFactory()
+        # A version of another content type with a clashing object id
+        page_version = PageVersionFactory()
+        page_version.object_id = poll_versions[0].object_id
+        page_version.save()
+        queryset = PollContent._base_manager.filter(
+            pk__in=[v.object_id for v in poll_versions]
+        )
+
+        with self.assertNumQueries(1):
+            versions = list(convert_queryset_to_version_queryset(queryset))
+
+        self.assertCountEqual(versions, poll_versions)
+        self.assertNotIn(other_version, versions)
+
+    def test_returns_no_versions_for_empty_queryset(self):
+        factories.PollVersionFactory()
+        queryset = PollContent._base_manager.none()
+
+        self.assertFalse(convert_queryset_to_version_queryset(queryset).exists())
@@ -0,0 +1,188 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from django.utils import timezone
+
+from djangocms_moderation import constants
+from djangocms_moderation.audit import (
+    AUDIT_COLUMNS,
+    export_audit_trail,
+    get_audit_rows,
+    parse_audit_date,
+)
+from djangocms_moderation.instrumentation import track_queries
+from djangocms_moderation.models import (
+    ConfirmationFormSubmission,
+    ConfirmationPage,
+    ModerationRequestAction,
+)
+
+from .utils import factories
+from .utils.base import BaseTestCase
+
+
+class AuditTrailTestCase(BaseTestCase):
+    def setUp(self):
+        self.collection = factories.ModerationCollectionFactory(
+            author=self.user, workflow=self.wf1, status=constants.ARCHIVED
+        )
+        self.moderation_request = factories.ModerationRequestFactory(
+            collection=self.collection, compliance_number="ABC-1"
+        )
+        self.started = self.moderation_request.actions.create(
+            by_user=self.user, to_role=self.role1, action=constants.ACTION_STARTED
+        )
+        self.approved = self.moderation_request.actions.create(
+            by_user=self.user,
+            to_user=self.user2,
+            action=constants.ACTION_APPROVED,
+            step_approved=self.wf1st1,
+            message="Looks good",
+        )
+        ConfirmationFormSubmission.objects.create(
+            moderation_request=self.moderation_request,
+            for_step=self.wf1st1,
+            by_user=self.user,
+            data=json.dumps([{"label": "Checked?", "answer": "Yes"}]),
+            confirmation_page=ConfirmationPage.objects.create(name="Checklist"),
+        )
+
+    def _add_actions(self, count):
+        ModerationRequestAction.objects.bulk_create(
+            ModerationRequestAction(
+                moderation_request=self.moderation_request, by_user=self.user, action=constants.ACTION_REJECTED
+            )
+            for _ in range(count)
+        )
+
+    def test_get_audit_rows(self):
+        rows = list(get_audit_rows(collection_id=self.collection.pk))
+
+        self.assertEqual([row["action_id"] for row in rows], [self.started.pk, self.approved.pk])
+        row = rows[1]
+        version = self.moderation_request.version
+        self.assertEqual(
+            {column: row[column] for column in AUDIT_COLUMNS if column != "date_taken"},
+            {
+                "collection_id": self.collection.pk,
+                "collection": self.collection.name,
+                "collection_status": constants.ARCHIVED,
+                "workflow": "Workflow 1",
+                "request_id": self.moderation_request.pk,
+                "version_id": version.pk,
+                "content_type": "cms.pagecontent",
+                "object_id": version.object_id,
+                "language": "en",
+                "compliance_number": "ABC-1",
+                "action_id": self.approved.pk,
+                "action": constants.ACTION_APPROVED,
+                "by_user_name": "test",
+                "to_user_name": "test2",
+                # The next step
+                "to_role_name": "Role 2",
+                "step_approved_role": "Role 1",
+                "is_archived": False,
+                "message": "Looks good",
+                "form_submission": '[{"label": "Checked?", "answer": "Yes"}]',
+            },
+        )
+        self.assertEqual(rows[0]["to_role_name"], "Role 1")
+        self.assertIsNone(rows[0]["form_submission"])
+
+    def test_get_audit_rows_of_a_date_range(self):
+        ModerationRequestAction.objects.filter(pk=self.started.pk).update(
+            date_taken=timezone.now() - timedelta(days=10)
+        )
+
+        rows = get_audit_rows(self.collection.pk, start=timezone.now() - timedelta(days=1))
+        self.assertEqual([row["action_id"] for row in rows], [self.approved.pk])
+        rows = get_audit_rows(self.collection.pk, end=timezone.now() - timedelta(days=1))
+        self.assertEqual([row["action_id"] for row in rows], [self.started.pk])
+
+    def test_parse_audit_date(self):
+        self.assertEqual(parse_audit_date("2024-01-02").date().isoformat(), "2024-01-02")
+        self.assertTrue(timezone.is_aware(parse_audit_date("2024-01-02T10:00")))
+        with self.assertRaises(ValueError):
+            parse_audit_date("yesterday")
+
+    def test_export_runs_one_query_whatever_the_size(self):
+        with track_queries() as stats:
+            lines = list(export_audit_trail(get_audit_rows(self.collection.pk), "jsonl", chunk_size=2))
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(stats.count, 1)
+
+        self._add_actions(10)
+        with track_queries() as stats:
+            lines = list(export_audit_trail(get_audit_rows(self.collection.pk), "jsonl", chunk_size=2))
+        self.assertEqual(len(lines), 12)
+        self.assertEqual(stats.count, 1)
+        self.assertEqual(json.loads(lines[1])["step_approved_role"], "Role 1")
+
+    def test_collection_audit_trail_view(self):
+        url = reverse("admin:cms_moderation_collection_audit_trail", args=(self.collection.pk,))
+
+        with self.login_user_context(self.user):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn(f'filename="moderation-audit-{self.collection.pk}.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([row["action"] for row in rows], [constants.ACTION_STARTED, constants.ACTION_APPROVED])
+        self.assertEqual(rows[1]["to_user_name"], "test2")
+
+    def test_audit_trail_view_in_jsonl(self):
+        url = reverse("admin:cms_moderation_audit_trail")
+        start = (timezone.now() - timedelta(days=1)).date().isoformat()
+
+        with self.login_user_context(self.user):
+            response = self.client.get(url, {"format": "jsonl", "start": start})
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertIn(self.approved.pk, [row["action_id"] for row in rows])
+
+    def test_audit_trail_view_validates_the_parameters(self):
+        url = reverse("admin:cms_moderation_audit_trail")
+
+        with self.login_user_context(self.user):
+            self.assertEqual(self.client.get(url, {"format": "xml"}).status_code, 400)
+            self.assertEqual(self.client.get(url, {"start": "yesterday"}).status_code, 400)
+            response = self.client.get(reverse("admin:cms_moderation_collection_audit_trail", args=(0,)))
+            self.assertEqual(response.status_code, 404)
+
+    def test_audit_trail_view_requires_the_view_permission(self):
+        user = factories.UserFactory(is_staff=True)
+        url = reverse("admin:cms_moderation_audit_trail")
+
+        self.client.force_login(user)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command("moderation_audit", "--collection", str(self.collection.pk), stdout=out)
+
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual([int(row["action_id"]) for row in rows], [self.started.pk, self.approved.pk])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "audit.jsonl")
+            call_command(
+                "moderation_audit", "--collection", str(self.collection.pk), "--format", "jsonl", "--output", path
+            )
+            with open(path) as f:
+                rows = [json.loads(line) for line in f]
+        self.assertEqual(rows[1]["compliance_number"], "ABC-1")
+
+        with self.assertRaisesMessage(CommandError, "Invalid date"):
+            call_command("moderation_audit", "--start", "yesterday")
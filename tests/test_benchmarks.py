@@ -0,0 +1,61 @@
+from unittest import skipUnless
+
+from django.db import connection
+
+from cms.test_utils.testcases import CMSTestCase
+
+from .benchmarks.__main__ import explain_plans, growth, measure
+from .benchmarks.instantiation import instantiation
+from .benchmarks.plans import PLANS
+from .benchmarks.scenarios import SCENARIOS
+
+
+class BenchmarksTestCase(CMSTestCase):
+    def test_scenarios_run(self):
+        """
+        Smoke test the benchmark scenarios on tiny data sets, so they
+        don't break unnoticed
+        """
+        for name, scenario in SCENARIOS.items():
+            with self.subTest(name):
+                result = measure(scenario, 2)
+                self.assertGreater(result["queries"], 0)
+
+    def test_growth(self):
+        results = [{"size": 10, "queries": 5}, {"size": 1000, "queries": 500}]
+        self.assertEqual(growth(results, "queries"), 1.0)
+        results = [{"size": 10, "queries": 100}, {"size": 1000, "queries": 1000000}]
+        self.assertEqual(growth(results, "queries"), 2.0)
+        results = [{"size": 10, "queries": 7}, {"size": 1000, "queries": 7}]
+        self.assertEqual(growth(results, "queries"), 0.0)
+
+    def test_instantiation(self):
+        result = instantiation(100)
+
+        self.assertEqual(result["model"], "djangocms_moderation.ModerationRequest")
+        self.assertEqual(result["count"], 100)
+        self.assertGreater(result["stock_time"], 0)
+
+    def test_plans(self):
+        plans = explain_plans(20)
+
+        self.assertEqual(set(plans), set(PLANS))
+        for name, plan in plans.items():
+            with self.subTest(name):
+                self.assertTrue(plan["indexed"])
+                self.assertTrue(plan["unindexed"])
+        # The indexes are restored
+        self.assertEqual(plans, explain_plans(20))
+
+    @skipUnless(connection.vendor == "sqlite", "The index names are read from the SQLite plans")
+    def test_plans_use_indexes(self):
+        plans = explain_plans(20)
+
+        for name, index in (
+            ("active_request", "moderation_one_active_request"),
+            ("pending_steps", "moderation_action_approved_idx"),
+            ("last_action", "moderation_action_date_idx"),
+        ):
+            with self.subTest(name):
+                self.assertIn(f"USING INDEX {index}", plans[name]["indexed"])
+                self.assertNotIn(index, plans[name]["unindexed"])
@@ -145,6 +145,7 @@ class CMSToolbarsTestCase(CMSTestCase):
                 toolbar.toolbar,
             )
         )
+        self.assertTrue(self._button_exists("View diff", toolbar.toolbar))
 
     def test_page_in_collection_moderating(self):
         version = PageVersionFactory()
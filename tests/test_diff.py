@@ -0,0 +1,136 @@
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+from djangocms_versioning.constants import PUBLISHED
+from djangocms_versioning.models import Version
+from djangocms_versioning.test_utils.factories import PageVersionFactory
+
+from djangocms_moderation import constants, diff
+from djangocms_moderation.diff import diff_html, get_published_version
+from djangocms_moderation.models import ModerationCollection
+
+from .utils import factories
+from .utils.base import BaseTestCase
+
+
+class DiffHtmlTestCase(BaseTestCase):
+    def test_unchanged_markup(self):
+        html = "<html><body><p>Hello world</p></body></html>"
+
+        self.assertEqual(diff_html(html, html), html)
+
+    def test_changed_text(self):
+        result = diff_html(
+            "<p>Hello old world</p><p>Bye</p>",
+            "<p>Hello new world</p><p>Bye</p><p>Welcome</p>",
+        )
+
+        self.assertEqual(
+            result,
+            '<p>Hello <del class="cms-diff">old</del><ins class="cms-diff">new</ins> world</p>'
+            '<p>Bye</p><p><ins class="cms-diff">Welcome</ins></p>',
+        )
+
+    def test_head_and_scripts_are_not_marked(self):
+        result = diff_html(
+            "<head><title>Old</title></head><script>var a = 1;</script>",
+            "<head><title>New</title></head><script>var a = 2;</script>",
+        )
+
+        self.assertEqual(result, "<head><title>New</title></head><script>var a = 2;</script>")
+
+
+class VersionDiffTestCase(BaseTestCase):
+    def setUp(self):
+        cache.clear()
+        self.published = PageVersionFactory(state=PUBLISHED, content__language="en")
+        self.draft = PageVersionFactory(
+            content__page=self.published.content.page, content__language="en"
+        )
+        self.collection1.add_version(self.draft)
+        self.url = reverse("admin:cms_moderation_version_diff", args=(self.draft.pk,))
+
+    def test_get_published_version(self):
+        self.assertEqual(get_published_version(self.draft), self.published)
+        self.assertIsNone(get_published_version(factories.PageVersionFactory()))
+
+    def test_diff_is_rendered_once_and_shared(self):
+        with mock.patch.object(
+            diff, "render_content", side_effect=["<p>Published</p>", "<p>Draft</p>"]
+        ) as render_content:
+            with self.login_user_context(self.user):
+                response = self.client.get(self.url)
+            with self.login_user_context(self.user2):
+                self.assertEqual(self.client.get(self.url).content, response.content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.content.decode(),
+            '<p><del class="cms-diff">Published</del><ins class="cms-diff">Draft</ins></p>',
+        )
+        self.assertEqual(
+            [call.args[1] for call in render_content.call_args_list],
+            [self.published.content, self.draft.content],
+        )
+
+    def test_diff_is_computed_again_when_a_version_changes(self):
+        render_content = mock.patch.object(diff, "render_content", return_value="<p>Page</p>")
+        with render_content as render_content, self.login_user_context(self.user):
+            self.client.get(self.url)
+            Version.objects.filter(pk=self.published.pk).update(modified=timezone.now())
+            self.client.get(self.url)
+            # Resubmitted after changes
+            moderation_request = self.collection1.moderation_requests.get(version=self.draft)
+            moderation_request.actions.create(by_user=self.user, action=constants.ACTION_RESUBMITTED)
+            self.client.get(self.url)
+
+        self.assertEqual(render_content.call_count, 6)
+
+    def test_diff_is_kept_when_the_collection_changes(self):
+        render_content = mock.patch.object(diff, "render_content", return_value="<p>Page</p>")
+        with render_content as render_content, self.login_user_context(self.user):
+            self.client.get(self.url)
+            # Another request of the collection is actioned
+            ModerationCollection.objects.filter(pk=self.collection1.pk).touch()
+            self.moderation_request1.actions.create(by_user=self.user, action=constants.ACTION_RESUBMITTED)
+            self.client.get(self.url)
+
+        self.assertEqual(render_content.call_count, 2)
+
+    def test_large_diffs_are_not_cached(self):
+        render_content = mock.patch.object(diff, "render_content", return_value="<p>Page</p>")
+        max_size = mock.patch("djangocms_moderation.conf.DIFF_MAX_SIZE", 5)
+        with render_content as render_content, max_size, self.login_user_context(self.user):
+            self.client.get(self.url)
+            self.client.get(self.url)
+
+        self.assertEqual(render_content.call_count, 4)
+
+    def test_render_content_without_toolbar(self):
+        request = RequestFactory().get(self.url, {"edit": ""})
+        request.user = self.user
+        request.session = {}
+
+        with mock.patch("cms.views.render_object_preview", return_value=HttpResponse("<p>Page</p>")) as render:
+            self.assertEqual(diff.render_content(request, self.draft.content), "<p>Page</p>")
+
+        [(render_request, content_type_id, object_id), _kwargs] = render.call_args
+        self.assertEqual(object_id, self.draft.content.pk)
+        self.assertEqual(content_type_id, ContentType.objects.get_for_model(self.draft.content).pk)
+        self.assertFalse(render_request.toolbar.show_toolbar)
+        self.assertNotIn("edit", render_request.GET)
+        self.assertIn("edit", request.GET)
+
+    def test_version_without_moderation_request(self):
+        url = reverse("admin:cms_moderation_version_diff", args=(self.published.pk,))
+
+        with self.login_user_context(self.user):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 404)
@@ -200,6 +200,40 @@ class CollectionItemsFormTestCase(AssertQueryMixin, BaseTestCase):
         self.assertFalse(form.is_valid())
         self.assertIn("versions", form.errors)
 
+    def test_ineligible_versions_are_reported_with_a_reason(self):
+        pg_version = PageVersionFactory(created_by=self.user)
+        pg_version_user2 = PageVersionFactory(created_by=self.user2)
+        data = {
+            "collection": self.collection1.pk,
+            "versions": [self.pg1_version, pg_version, pg_version_user2],
+        }
+        form = CollectionItemsForm(data=data, user=self.user)
+        self.assertTrue(form.is_valid())
+        self.assertEqual(
+            [(version, str(reason)) for version, reason in form.ineligible_versions],
+            [
+                (self.pg1_version, "Part of another active moderation request"),
+                (pg_version_user2, "Locked by another user"),
+            ],
+        )
+
+    def test_eligibility_is_checked_in_bulk(self):
+        ModerationRequest.objects.all().delete()
+        versions = [PageVersionFactory(created_by=self.user) for _ in range(5)]
+
+        def validate(versions):
+            form = CollectionItemsForm(
+                data={"collection": self.collection1.pk, "versions": versions},
+                user=self.user,
+            )
+            self.assertTrue(form.is_valid())
+
+        with self.assertNumQueries(3):
+            validate(versions[:1])
+        # The number of queries doesn't depend on the number of versions
+        with self.assertNumQueries(3):
+            validate(versions)
+
     def test_collection_choice_should_be_limited_to_current_user_and_collecting_status(
         self
     ):
@@ -15,6 +15,7 @@ from djangocms_moderation.helpers import (
     get_moderated_children_from_placeholder,
     get_moderation_button_title_and_url,
     get_page_or_404,
+    get_requests_awaiting_review,
     is_obj_version_unlocked,
 )
 from djangocms_moderation.models import (
@@ -160,6 +161,34 @@ class ModerationButtonLinkAndUrlTestCase(BaseTestCase):
         self.assertEqual(url, self.expected_url)
 
 
+class RequestsAwaitingReviewTestCase(BaseTestCase):
+    def setUp(self):
+        ModerationCollection.objects.update(status=IN_REVIEW)
+
+    def test_get_requests_awaiting_review(self):
+        self.assertQuerySetEqual(
+            get_requests_awaiting_review(self.user).order_by("pk"),
+            [self.moderation_request1, self.moderation_request5],
+        )
+        # The group role of an optional step, once the required steps are approved
+        self.assertQuerySetEqual(get_requests_awaiting_review(self.user2), [self.moderation_request3])
+        self.assertQuerySetEqual(get_requests_awaiting_review(self.user3), [self.moderation_request3])
+
+    def test_get_requests_awaiting_review_matches_the_model(self):
+        moderation_requests = ModerationRequest.objects.filter(is_active=True)
+        for user in (self.user, self.user2, self.user3):
+            with self.subTest(user=user.username):
+                self.assertEqual(
+                    set(get_requests_awaiting_review(user)),
+                    {mr for mr in moderation_requests if mr.user_can_take_moderation_action(user)},
+                )
+
+    def test_collections_not_in_review_are_ignored(self):
+        ModerationCollection.objects.update(status=COLLECTING)
+
+        self.assertFalse(get_requests_awaiting_review(self.user).exists())
+
+
 class ModeratedChildrenTestCase(CMSTestCase):
     def setUp(self):
         self.user = self.get_superuser()
@@ -0,0 +1,91 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+
+from djangocms_moderation import constants
+from djangocms_moderation.instrumentation import (
+    fingerprint,
+    instrument,
+    track_queries,
+)
+from djangocms_moderation.models import ModerationRequest
+
+from .utils.base import BaseTestCase
+
+
+class InstrumentationTestCase(BaseTestCase):
+    def test_fingerprint(self):
+        self.assertEqual(
+            fingerprint('SELECT "id"\n  FROM "user" WHERE "id" IN (%s, %s, %s)'),
+            'SELECT "id" FROM "user" WHERE "id" IN (...)',
+        )
+        self.assertEqual(
+            fingerprint('SELECT "id" FROM "user" WHERE "id" IN (%s)'),
+            fingerprint('SELECT "id" FROM "user" WHERE "id" IN (%s, %s)'),
+        )
+
+    def test_track_queries(self):
+        with track_queries() as stats:
+            for pk in (self.user.pk, self.user2.pk):
+                User.objects.get(pk=pk)
+            list(ModerationRequest.objects.all())
+
+        self.assertEqual(stats.count, 3)
+        self.assertEqual(stats.duplicate_count, 1)
+        self.assertEqual(list(stats.duplicates.values()), [2])
+        self.assertGreater(stats.time, 0)
+
+    def test_instrument_logs_only_when_enabled(self):
+        @instrument("count_users")
+        def count_users():
+            return User.objects.count()
+
+        users = User.objects.count()
+
+        with self.assertNoLogs("djangocms_moderation.instrumentation"):
+            self.assertEqual(count_users(), users)
+
+        with (
+            mock.patch("djangocms_moderation.conf.QUERY_LOGGING", True),
+            self.assertLogs("djangocms_moderation.instrumentation", "INFO") as logs,
+        ):
+            self.assertEqual(count_users(), users)
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertTrue(logs.records[0].getMessage().startswith("count_users: 1 queries, 0 duplicates"))
+        self.assertEqual(logs.records[0].query_count, 1)
+
+    def test_instrument_logs_recursive_calls_once(self):
+        @instrument("countdown")
+        def countdown(n):
+            User.objects.exists()
+            if n:
+                countdown(n - 1)
+
+        with (
+            mock.patch("djangocms_moderation.conf.QUERY_LOGGING", True),
+            self.assertLogs("djangocms_moderation.instrumentation", "DEBUG") as logs,
+        ):
+            countdown(2)
+
+        self.assertEqual(
+            [record.getMessage().split(",")[0] for record in logs.records],
+            ["countdown: 3 queries", 'countdown: 3 x SELECT %s AS "a" FROM "auth_user" LIMIT 1'],
+        )
+
+    def test_update_status_query_budget(self):
+        self.moderation_request1.actions.create(by_user=self.user, action=constants.ACTION_STARTED)
+
+        with self.assertQueryBudget(10, max_duplicates=1):
+            self.moderation_request1.update_status(constants.ACTION_APPROVED, self.user)
+
+    def test_query_budget_exceeded(self):
+        message = "2 queries run, budget is 1. Duplicates:\n2 x SELECT"
+        with self.assertRaisesMessage(AssertionError, message), self.assertQueryBudget(1):
+            User.objects.get(pk=self.user.pk)
+            User.objects.get(pk=self.user2.pk)
+
+        message = "1 duplicate queries, budget is 0"
+        with self.assertRaisesMessage(AssertionError, message), self.assertQueryBudget(5, max_duplicates=0):
+            User.objects.get(pk=self.user.pk)
+            User.objects.get(pk=self.user2.pk)
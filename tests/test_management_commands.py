@@ -1,13 +1,34 @@
+import gzip
+import json
+import os
+import tempfile
+from datetime import timedelta
 from io import StringIO
+from unittest.mock import patch
 
 from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
 
 from cms.test_utils.testcases import CMSTestCase
 
 from djangocms_moderation import constants
-from djangocms_moderation.models import Role
+from djangocms_moderation.consistency import CHECKS
+from djangocms_moderation.models import (
+    CollectionComment,
+    ConfirmationFormSubmission,
+    ConfirmationPage,
+    ModerationCollection,
+    ModerationRequest,
+    ModerationRequestAction,
+    ModerationRequestTreeNode,
+    RequestComment,
+    Role,
+    Workflow,
+)
 
 from .utils import factories
+from .utils.base import drop_indexes
 
 
 class FixStatesTestCase(CMSTestCase):
@@ -136,3 +157,325 @@ class FixStatesTestCase(CMSTestCase):
         call_command("moderation_fix_states", "--perform-fix", stdout=out)
 
         self.assertIn("No inconsistent ModerationRequest objects found", out.getvalue())
+
+    def _call_command(self, *args):
+        out = StringIO()
+        call_command("moderation_fix_states", *args, stdout=out)
+        return out.getvalue()
+
+    def _json_report(self, *args):
+        return json.loads(self._call_command("--json", *args))["checks"]
+
+    def test_json_report(self):
+        self.collection2_moderation_request2.is_active = True
+        self.collection2_moderation_request2.save()
+
+        report = self._json_report()
+
+        self.assertEqual(
+            report["published_active_requests"],
+            {
+                "description": "Active requests in archived collections whose version is published",
+                "model": "ModerationRequest",
+                "found": 1,
+                "repaired": 0,
+                "ids": [self.collection2_moderation_request2.pk],
+            },
+        )
+        self.assertEqual(list(report), ["published_active_requests"])
+
+        report = self._json_report("--perform-fix", "--check", "published_active_requests")
+
+        self.assertEqual(list(report), ["published_active_requests"])
+        self.assertEqual(report["published_active_requests"]["repaired"], 1)
+        self.collection2_moderation_request2.refresh_from_db()
+        self.assertFalse(self.collection2_moderation_request2.is_active)
+
+    def test_only_the_published_check_runs_by_default(self):
+        # Drift repaired by another check
+        collection = factories.ModerationCollectionFactory(author=self.user, status=constants.IN_REVIEW)
+        moderation_request = factories.ModerationRequestFactory(collection=collection)
+        factories.RootModerationRequestTreeNodeFactory(moderation_request=moderation_request)
+
+        self._call_command("--perform-fix")
+
+        self.assertFalse(moderation_request.actions.exists())
+        self.assertEqual(set(self._json_report("--all")), {check.name for check in CHECKS})
+
+        self._call_command("--perform-fix", "--all")
+
+        self.assertTrue(moderation_request.actions.exists())
+
+    def test_repairs_in_batches(self):
+        ModerationRequest.objects.update(is_active=True)
+
+        output = self._call_command("--perform-fix", "--batch-size", "1", "--chunk-size", "1")
+
+        self.assertIn("Inconsistent ModerationRequest objects found: 4", output)
+        self.assertFalse(ModerationRequest.objects.filter(is_active=True).exists())
+
+    def test_multiple_active_requests(self):
+        # The drift is only possible on databases without partial unique constraints
+        drop_indexes(ModerationRequest, "moderation_one_active_request")
+        version = self.collection1_moderation_request1.version
+        ModerationRequest.objects.filter(pk=self.collection1_moderation_request1.pk).update(is_active=True)
+        newer = factories.ModerationRequestFactory(
+            collection=factories.ModerationCollectionFactory(author=self.user),
+            version=version,
+            is_active=True,
+        )
+        factories.RootModerationRequestTreeNodeFactory(moderation_request=newer)
+
+        report = self._json_report("--check", "multiple_active_requests")
+        self.assertEqual(
+            report["multiple_active_requests"]["ids"], [self.collection1_moderation_request1.pk]
+        )
+
+        self._call_command("--perform-fix", "--check", "multiple_active_requests")
+
+        self.assertEqual(
+            list(ModerationRequest.objects.filter(version=version, is_active=True)), [newer]
+        )
+
+    def test_orphan_tree_nodes(self):
+        root = ModerationRequestTreeNode.objects.get(
+            moderation_request=self.collection1_moderation_request1
+        )
+        child = root.add_child(moderation_request=self.collection1_moderation_request2)
+        grandchild = child.add_child(moderation_request=self.collection1_moderation_request2)
+        # Remove the root without its descendants
+        ModerationRequestTreeNode.objects.filter(pk=root.pk)._raw_delete(using="default")
+
+        report = self._json_report("--check", "orphan_tree_nodes")
+        self.assertEqual(report["orphan_tree_nodes"]["ids"], [child.pk])
+
+        self._call_command("--perform-fix", "--check", "orphan_tree_nodes")
+
+        self.assertFalse(
+            ModerationRequestTreeNode.objects.filter(pk__in=[child.pk, grandchild.pk]).exists()
+        )
+
+    def test_requests_without_tree_node(self):
+        ModerationRequestTreeNode.objects.filter(
+            moderation_request=self.collection2_moderation_request1
+        ).delete()
+
+        report = self._json_report("--perform-fix", "--check", "requests_without_tree_node")
+
+        self.assertEqual(report["requests_without_tree_node"]["repaired"], 1)
+        node = ModerationRequestTreeNode.objects.get(moderation_request=self.collection2_moderation_request1)
+        self.assertIn(node, self.collection2.get_root_nodes())
+
+    def test_requests_without_content_fields(self):
+        moderation_request = self.collection1_moderation_request1
+        ModerationRequest.objects.filter(pk=moderation_request.pk).update(
+            title="", content_type=None, version_number=""
+        )
+
+        report = self._json_report("--perform-fix", "--check", "requests_without_content_fields")
+
+        self.assertEqual(report["requests_without_content_fields"]["repaired"], 1)
+        moderation_request.refresh_from_db()
+        self.assertEqual(moderation_request.title, str(moderation_request.version.content))
+        self.assertEqual(moderation_request.content_type_id, moderation_request.version.content_type_id)
+        self.assertEqual(moderation_request.version_number, str(moderation_request.version.number))
+
+    def test_missing_started_actions(self):
+        collection = factories.ModerationCollectionFactory(author=self.user, status=constants.IN_REVIEW)
+        collection.workflow.steps.create(role=self.role1, is_required=True, order=1)
+        moderation_request = factories.ModerationRequestFactory(collection=collection)
+        factories.RootModerationRequestTreeNodeFactory(moderation_request=moderation_request)
+
+        report = self._json_report("--check", "missing_started_actions")
+        self.assertEqual(report["missing_started_actions"]["ids"], [moderation_request.pk])
+
+        self._call_command("--perform-fix", "--check", "missing_started_actions")
+
+        action = moderation_request.get_first_action()
+        self.assertEqual(action.action, constants.ACTION_STARTED)
+        self.assertEqual(action.by_user, self.user)
+        self.assertEqual(action.to_role, self.role1)
+        self.assertEqual(action.date_taken, moderation_request.date_sent)
+
+    def test_collections_to_archive(self):
+        ModerationCollection.objects.filter(pk=self.collection1.pk).update(status=constants.IN_REVIEW)
+        ModerationRequest.objects.filter(collection=self.collection1).update(is_active=True)
+        report = self._json_report("--check", "collections_to_archive")
+        # The requests were finished without the required approval
+        self.assertEqual(report["collections_to_archive"]["found"], 0)
+
+        for moderation_request in self.collection1.moderation_requests.all():
+            moderation_request.update_status(constants.ACTION_APPROVED, self.user)
+        ModerationCollection.objects.filter(pk=self.collection1.pk).update(status=constants.IN_REVIEW)
+
+        report = self._json_report("--perform-fix", "--check", "collections_to_archive")
+
+        self.assertEqual(report["collections_to_archive"]["ids"], [self.collection1.pk])
+        self.collection1.refresh_from_db()
+        self.assertEqual(self.collection1.status, constants.ARCHIVED)
+
+    def test_missing_compliance_numbers(self):
+        moderation_request = self.collection1_moderation_request1
+        moderation_request.update_status(constants.ACTION_APPROVED, self.user)
+        report = self._json_report("--check", "missing_compliance_numbers")
+        self.assertEqual(report["missing_compliance_numbers"]["found"], 0)
+
+        Workflow.objects.filter(pk=self.collection1.workflow_id).update(
+            requires_compliance_number=True,
+            compliance_number_backend="djangocms_moderation.backends.sequential_number_backend",
+        )
+        report = self._json_report("--perform-fix", "--check", "missing_compliance_numbers")
+
+        self.assertEqual(report["missing_compliance_numbers"]["ids"], [moderation_request.pk])
+        moderation_request.refresh_from_db()
+        self.assertEqual(moderation_request.compliance_number, str(moderation_request.pk))
+
+
+class ModerationStatsTestCase(CMSTestCase):
+    def test_command_output(self):
+        user = factories.UserFactory()
+        collection = factories.ModerationCollectionFactory(author=user, status=constants.IN_REVIEW)
+        role = Role.objects.create(name="Reviewers", user=user)
+        collection.workflow.steps.create(role=role, is_required=True, order=1)
+        moderation_request = factories.ModerationRequestFactory(collection=collection, is_active=True)
+        moderation_request.actions.create(by_user=user, action=constants.ACTION_STARTED)
+
+        out = StringIO()
+        call_command("moderation_stats", stdout=out)
+
+        self.assertIn("IN_REVIEW: 1", out.getvalue())
+        self.assertIn("Pending requests: 1", out.getvalue())
+        self.assertIn(f"{collection.workflow.name} / 1. Reviewers: 1", out.getvalue())
+        self.assertIn("start: 1", out.getvalue())
+
+        out = StringIO()
+        call_command("moderation_stats", "--json", stdout=out)
+
+        self.assertEqual(json.loads(out.getvalue())["pending_requests"]["total"], 1)
+
+
+class ModerationArchiveTestCase(CMSTestCase):
+    def setUp(self):
+        self.user = factories.UserFactory()
+        role = Role.objects.create(name="Role 1", user=self.user)
+        self.collection = factories.ModerationCollectionFactory(author=self.user, status=constants.ARCHIVED)
+        step = self.collection.workflow.steps.create(role=role, is_required=True, order=1)
+        self.moderation_request = factories.ModerationRequestFactory(collection=self.collection, is_active=False)
+        root = factories.RootModerationRequestTreeNodeFactory(moderation_request=self.moderation_request)
+        root.add_child(
+            moderation_request=factories.ModerationRequestFactory(collection=self.collection, is_active=False)
+        )
+        self.moderation_request.actions.create(by_user=self.user, action=constants.ACTION_STARTED)
+        self.moderation_request.actions.create(
+            by_user=self.user, action=constants.ACTION_APPROVED, step_approved=step
+        )
+        RequestComment.objects.create(moderation_request=self.moderation_request, author=self.user, message="OK")
+        CollectionComment.objects.create(collection=self.collection, author=self.user, message="Done")
+        ConfirmationFormSubmission.objects.create(
+            moderation_request=self.moderation_request,
+            for_step=step,
+            by_user=self.user,
+            confirmation_page=ConfirmationPage.objects.create(name="Checklist"),
+        )
+        # Collections which are kept: a recent archived one and an old one in review
+        self.recent_collection = factories.ModerationCollectionFactory(status=constants.ARCHIVED)
+        self.collection_in_review = factories.ModerationCollectionFactory(status=constants.IN_REVIEW)
+        ModerationCollection.objects.exclude(pk=self.recent_collection.pk).update(
+            date_modified=timezone.now() - timedelta(days=400)
+        )
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "archive.jsonl.gz")
+
+    def _counts(self):
+        return {
+            model.__name__: model.objects.count()
+            for model in (
+                ModerationCollection,
+                CollectionComment,
+                ModerationRequest,
+                ModerationRequestAction,
+                RequestComment,
+                ConfirmationFormSubmission,
+                ModerationRequestTreeNode,
+            )
+        }
+
+    def test_days_are_required(self):
+        with self.assertRaisesMessage(CommandError, "Pass --days"):
+            call_command("moderation_archive", stdout=StringIO())
+
+    def test_dry_run(self):
+        out = StringIO()
+        call_command("moderation_archive", "--days", "365", "--dry-run", stdout=out)
+
+        self.assertIn("1 collections would be archived", out.getvalue())
+        self.assertTrue(ModerationCollection.objects.filter(pk=self.collection.pk).exists())
+
+    @patch("djangocms_moderation.conf.RETENTION_DAYS", 365)
+    def test_archive_and_restore(self):
+        counts = self._counts()
+        tree = list(ModerationRequestTreeNode.objects.order_by("path").values_list("moderation_request", "depth"))
+
+        out = StringIO()
+        call_command("moderation_archive", "--output", self.path, "--batch-size", "1", stdout=out)
+
+        self.assertIn(f"Archived 1 collections to {self.path}", out.getvalue())
+        self.assertEqual(
+            set(ModerationCollection.objects.values_list("pk", flat=True)),
+            {self.recent_collection.pk, self.collection_in_review.pk},
+        )
+        self.assertEqual(
+            self._counts(),
+            {"ModerationCollection": 2, **{name: 0 for name in list(counts)[1:]}},
+        )
+        with gzip.open(self.path, "rt") as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line["collection"] for line in lines], [self.collection.pk])
+
+        # A new collection may take the paths of the archived tree nodes
+        new_node = factories.RootModerationRequestTreeNodeFactory()
+        out = StringIO()
+        call_command("moderation_archive", "--restore", self.path, stdout=out)
+
+        self.assertIn("Restored 1 collections", out.getvalue())
+        counts["ModerationCollection"] += 1
+        counts["ModerationRequest"] += 1
+        # The node of the new collection and its root
+        counts["ModerationRequestTreeNode"] += 2
+        self.assertEqual(self._counts(), counts)
+        self.assertEqual(self.moderation_request.actions.count(), 2)
+        self.assertEqual(
+            list(
+                ModerationRequestTreeNode.objects.exclude(collection=new_node.collection)
+                .order_by("path")
+                .values_list("moderation_request", "depth")
+            ),
+            tree,
+        )
+        root = ModerationRequestTreeNode.objects.get(moderation_request=self.moderation_request)
+        self.assertEqual(root.get_children().count(), 1)
+
+        # Restoring twice skips the existing collections
+        out = StringIO()
+        call_command("moderation_archive", "--restore", self.path, stdout=out)
+
+        self.assertIn(f"Skipped the existing collections: [{self.collection.pk}]", out.getvalue())
+
+    def test_restore_reports_the_collections_which_cannot_be_restored(self):
+        call_command("moderation_archive", "--days", "365", "--output", self.path, stdout=StringIO())
+        self.user.delete()
+
+        out = StringIO()
+        call_command("moderation_archive", "--restore", self.path, stdout=out)
+
+        self.assertIn("Restored 0 collections", out.getvalue())
+        self.assertIn(f"Could not restore the collections: [{self.collection.pk}]", out.getvalue())
+        self.assertFalse(ModerationCollection.objects.filter(pk=self.collection.pk).exists())
+
+    def test_existing_files_are_not_overwritten(self):
+        open(self.path, "w").close()
+
+        with self.assertRaisesMessage(CommandError, "exists already"):
+            call_command("moderation_archive", "--days", "365", "--output", self.path, stdout=StringIO())
+        self.assertTrue(ModerationCollection.objects.filter(pk=self.collection.pk).exists())
@@ -0,0 +1,106 @@
+from unittest import mock
+
+from djangocms_versioning.test_utils.factories import PageVersionFactory
+
+from djangocms_moderation import constants, metrics
+from djangocms_moderation.admin_actions import publish_version
+from djangocms_moderation.models import ModerationCollection
+
+from .utils.base import BaseTestCase
+from .utils.factories import PlaceholderFactory, PollPluginFactory, PollVersionFactory
+
+
+def failing_backend(kind, name, value, tags):
+    raise OSError("Metrics stack unreachable")
+
+
+@mock.patch("djangocms_moderation.conf.METRICS_BACKEND", "djangocms_moderation.metrics.memory_backend")
+class MetricsTestCase(BaseTestCase):
+    def setUp(self):
+        metrics.memory_backend.clear()
+
+    def test_null_backend_is_the_default(self):
+        with mock.patch("djangocms_moderation.conf.METRICS_BACKEND", "djangocms_moderation.metrics.null_backend"):
+            metrics.increment("moderation.test")
+        self.assertEqual(metrics.memory_backend.metrics, [])
+
+    def test_timer_and_increment(self):
+        with metrics.timer("moderation.test", workflow=1) as tags:
+            tags["items"] = 3
+        metrics.increment("moderation.test", 2, workflow=1)
+
+        (kind, name, value, tags), counter = metrics.memory_backend.metrics
+        self.assertEqual((kind, name, tags), (metrics.TIMER, "moderation.test", {"workflow": 1, "items": 3}))
+        self.assertGreaterEqual(value, 0)
+        self.assertEqual(counter, (metrics.COUNTER, "moderation.test", 2, {"workflow": 1}))
+
+    def test_backend_errors_are_logged(self):
+        with (
+            mock.patch("djangocms_moderation.conf.METRICS_BACKEND", "tests.test_metrics.failing_backend"),
+            self.assertLogs("djangocms_moderation.metrics", "ERROR") as logs,
+        ):
+            self.moderation_request1.update_status(constants.ACTION_APPROVED, self.user)
+
+        self.assertEqual(self.moderation_request1.actions.last().action, constants.ACTION_APPROVED)
+        self.assertIn("Could not emit the counter moderation.actions", logs.output[0])
+        self.assertIn("Could not emit the timer moderation.update_status", logs.output[1])
+
+    def test_timed(self):
+        @metrics.timed("moderation.test", lambda value: {"value": value})
+        def double(value):
+            return value * 2
+
+        self.assertEqual(double(3), 6)
+        [(kind, _, _, tags)] = metrics.memory_backend.filter("moderation.test")
+        self.assertEqual((kind, tags), (metrics.TIMER, {"value": 3}))
+
+    def test_submit_for_review(self):
+        collection = ModerationCollection.objects.create(
+            author=self.user, name="Collection", workflow=self.wf1
+        )
+        collection.add_version(PageVersionFactory(created_by=self.user))
+        collection.add_version(PageVersionFactory(created_by=self.user))
+
+        collection.submit_for_review(by_user=self.user)
+
+        [(_, _, _, tags)] = metrics.memory_backend.filter("moderation.submit_for_review")
+        self.assertEqual(tags, {"workflow": self.wf1.pk})
+        self.assertEqual(
+            metrics.memory_backend.filter("moderation.requests_submitted"),
+            [(metrics.COUNTER, "moderation.requests_submitted", 2, {"workflow": self.wf1.pk})],
+        )
+        [(_, _, _, tags)] = metrics.memory_backend.filter("moderation.send_email")
+        self.assertEqual(tags["items"], 1)
+        self.assertEqual(tags["template"], "djangocms_moderation/emails/moderation-request/request.txt")
+
+    def test_update_status(self):
+        self.moderation_request1.update_status(constants.ACTION_APPROVED, self.user)
+
+        tags = {"action": constants.ACTION_APPROVED, "workflow": self.wf1.pk}
+        [(_, _, _, timer_tags)] = metrics.memory_backend.filter("moderation.update_status", metrics.TIMER)
+        self.assertEqual(timer_tags, tags)
+        self.assertEqual(
+            metrics.memory_backend.filter("moderation.actions"),
+            [(metrics.COUNTER, "moderation.actions", 1, tags)],
+        )
+
+    def test_publish_version(self):
+        version = PageVersionFactory(created_by=self.user)
+
+        self.assertTrue(publish_version(version, self.user))
+        self.assertFalse(publish_version(version, self.user))
+
+        published = [tags["published"] for _, _, _, tags in metrics.memory_backend.filter("moderation.publish_version")]
+        self.assertEqual(published, [True, False])
+
+    def test_nested_children(self):
+        page_version = PageVersionFactory(created_by=self.user, content__language="en")
+        placeholder = PlaceholderFactory(source=page_version.content)
+        for _ in range(2):
+            poll_version = PollVersionFactory(created_by=self.user, content__language="en")
+            PollPluginFactory(placeholder=placeholder, poll=poll_version.content.poll)
+
+        self.collection1.add_version(page_version, include_children=True)
+
+        items = [tags["items"] for _, _, _, tags in metrics.memory_backend.filter("moderation.nested_children")]
+        self.assertIn(2, items)
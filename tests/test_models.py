@@ -1,12 +1,20 @@
 import json
+from importlib import import_module
 from unittest.mock import patch
 
 from django.contrib.auth.models import Permission, User
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.db import IntegrityError, connection, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.test import TestCase, skipUnlessDBFeature
 from django.urls import reverse
 
+from djangocms_versioning.models import Version
+from djangocms_versioning.test_utils.factories import PageVersionFactory
+
 from djangocms_moderation import constants
+from djangocms_moderation.exceptions import AlreadyActioned
+from djangocms_moderation.instrumentation import track_queries
 from djangocms_moderation.models import (
     ConfirmationFormSubmission,
     ConfirmationPage,
@@ -75,6 +83,10 @@ class WorkflowTest(BaseTestCase):
     def test_first_step(self):
         self.assertEqual(self.wf1.first_step, self.wf1st1)
 
+    @patch("djangocms_moderation.conf.DEFAULT_COMPLIANCE_NUMBER_BACKEND", "backends.custom")
+    def test_default_compliance_number_backend_comes_from_settings(self):
+        self.assertEqual(Workflow().compliance_number_backend, "backends.custom")
+
 
 class WorkflowStepTest(BaseTestCase):
     def test_get_next(self):
@@ -94,6 +106,20 @@ class ModerationRequestTest(AssertQueryMixin, BaseTestCase):
         self.assertFalse(self.moderation_request2.has_pending_step())
         self.assertTrue(self.moderation_request3.has_pending_step())
 
+    @skipUnlessDBFeature("supports_partial_indexes")
+    def test_one_active_request_per_version(self):
+        # Inactive requests of the same version are fine
+        ModerationRequest.objects.create(
+            version=self.pg1_version, language="en", collection=self.collection2,
+            is_active=False, author=self.collection2.author,
+        )
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ModerationRequest.objects.create(
+                version=self.pg1_version, language="en", collection=self.collection2,
+                author=self.collection2.author,
+            )
+
     def test_required_pending_steps(self):
         self.assertTrue(self.moderation_request1.has_required_pending_steps())
         self.assertFalse(self.moderation_request2.has_required_pending_steps())
@@ -290,13 +316,80 @@ class ModerationRequestTest(AssertQueryMixin, BaseTestCase):
         self.assertEqual(len(self.moderation_request1.actions.all()), 2)
 
     def test_update_status_action_resubmitted(self):
+        self.moderation_request1.update_status(
+            action=constants.ACTION_REJECTED, by_user=self.user
+        )
         self.moderation_request1.update_status(
             action=constants.ACTION_RESUBMITTED,
             by_user=self.user,
             message="Resubmitting",
         )
         self.assertTrue(self.moderation_request1.is_active)
-        self.assertEqual(len(self.moderation_request1.actions.all()), 2)
+        self.assertEqual(len(self.moderation_request1.actions.all()), 3)
+
+    def test_content_fields_are_copied_from_the_version(self):
+        self.assertEqual(self.moderation_request1.title, str(self.pg1_version.content))
+        self.assertEqual(self.moderation_request1.content_type_id, self.pg1_version.content_type_id)
+        self.assertEqual(self.moderation_request1.version_number, str(self.pg1_version.number))
+
+    def test_content_fields_are_refreshed_on_resubmission(self):
+        version = factories.PollVersionFactory(content__text="Draft")
+        moderation_request, _added = self.collection1.add_version(version)
+        moderation_request.update_status(action=constants.ACTION_REJECTED, by_user=self.user)
+        type(version.content)._base_manager.filter(pk=version.object_id).update(text="Reworked")
+        moderation_request = ModerationRequest.objects.get(pk=moderation_request.pk)
+
+        moderation_request.update_status(action=constants.ACTION_RESUBMITTED, by_user=self.user)
+
+        moderation_request.refresh_from_db()
+        self.assertEqual(moderation_request.title, "Reworked")
+
+    def test_content_fields_of_existing_requests_are_filled_by_the_migration(self):
+        name = "0029_fill_request_content_fields"
+        migration = import_module(f"djangocms_moderation.migrations.{name}")
+        # The tests run without migrations
+        with self.settings(MIGRATION_MODULES={}):
+            loader = MigrationLoader(connection)
+        apps = loader.project_state(("djangocms_moderation", name), at_end=False).apps
+        ModerationRequest.objects.update(title="", content_type=None, version_number="")
+
+        with patch.object(migration, "BATCH_SIZE", 1):
+            migration._fill_content_fields(apps, None)
+
+        self.moderation_request1.refresh_from_db()
+        self.test_content_fields_are_copied_from_the_version()
+        self.assertFalse(ModerationRequest.objects.filter(content_type__isnull=True).exists())
+
+    def test_update_status_revalidates_the_action(self):
+        # A lost race: the request changed since the user was allowed to act
+        with self.assertRaises(AlreadyActioned):
+            self.moderation_request1.update_status(
+                action=constants.ACTION_RESUBMITTED, by_user=self.user
+            )
+        self.moderation_request1.update_status(
+            action=constants.ACTION_APPROVED, by_user=self.user
+        )
+        with self.assertRaises(AlreadyActioned):
+            # The step of role 1 is approved already
+            self.moderation_request1.update_status(
+                action=constants.ACTION_APPROVED, by_user=self.user
+            )
+        self.moderation_request1.update_status(
+            action=constants.ACTION_REJECTED, by_user=self.user2
+        )
+        for action in (constants.ACTION_APPROVED, constants.ACTION_REJECTED):
+            with self.subTest(action=action), self.assertRaises(AlreadyActioned):
+                self.moderation_request1.update_status(action=action, by_user=self.user3)
+        self.assertEqual(self.moderation_request1.actions.count(), 3)
+
+    @skipUnlessDBFeature("has_select_for_update")
+    def test_update_status_locks_the_request(self):
+        with track_queries() as stats:
+            self.moderation_request1.update_status(
+                action=constants.ACTION_APPROVED, by_user=self.user
+            )
+
+        self.assertTrue(any("FOR UPDATE" in sql for sql in stats.fingerprints))
 
     def test_compliance_number_is_generated(self):
         self.wf1.requires_compliance_number = True
@@ -367,7 +460,7 @@ class ModerationRequestTest(AssertQueryMixin, BaseTestCase):
         mock_uuid.return_value = "abc123"
 
         request = ModerationRequest.objects.create(
-            version=self.pg4_version,
+            version=PageVersionFactory(),
             language="en",
             is_active=True,
             collection=self.collection1,
@@ -385,7 +478,7 @@ class ModerationRequestTest(AssertQueryMixin, BaseTestCase):
         )
         self.wf2.save()
         request = ModerationRequest.objects.create(
-            version=self.pg1_version,
+            version=PageVersionFactory(),
             language="en",
             collection=self.collection2,
             author=self.collection2.author,
@@ -404,7 +497,7 @@ class ModerationRequestTest(AssertQueryMixin, BaseTestCase):
         self.wf2.save()
 
         request = ModerationRequest.objects.create(
-            version=self.pg1_version,
+            version=PageVersionFactory(),
             language="en",
             collection=self.collection2,
             author=self.collection2.author,
@@ -472,6 +565,10 @@ class ConfirmationPageTest(BaseTestCase):
         url = reverse("admin:cms_moderation_confirmation_page", args=(self.cp.pk,))
         self.assertEqual(self.cp.get_absolute_url(), url)
 
+    @patch("djangocms_moderation.conf.DEFAULT_CONFIRMATION_PAGE_TEMPLATE", "custom.html")
+    def test_default_template_comes_from_settings(self):
+        self.assertEqual(ConfirmationPage().template, "custom.html")
+
     def test_is_valid_returns_false_when_no_form_submission(self):
         result = self.cp.is_valid(
             active_request=self.moderation_request1, for_step=self.wf1st1
@@ -523,6 +620,9 @@ class ModerationCollectionTest(BaseTestCase):
         self.collection2 = ModerationCollection.objects.create(
             author=self.user, name="My collection 2", workflow=self.wf1
         )
+        # Versions without an active request elsewhere
+        self.version1 = PageVersionFactory()
+        self.version2 = PageVersionFactory()
 
     def test_job_id(self):
         self.assertEqual(str(self.collection1.pk), self.collection1.job_id)
@@ -584,7 +684,7 @@ class ModerationCollectionTest(BaseTestCase):
         self.assertTrue(self.collection1.should_be_archived())
 
         ModerationRequest.objects.create(
-            version=self.pg1_version,
+            version=self.version1,
             collection=self.collection1,
             is_active=True,
             author=self.collection1.author,
@@ -602,7 +702,7 @@ class ModerationCollectionTest(BaseTestCase):
         self.assertFalse(self.collection1.allow_submit_for_review(user=self.user))
 
         ModerationRequest.objects.create(
-            version=self.pg1_version,
+            version=self.version1,
             collection=self.collection1,
             is_active=True,
             author=self.collection1.author,
@@ -618,13 +718,13 @@ class ModerationCollectionTest(BaseTestCase):
     @patch("djangocms_moderation.models.notify_collection_moderators")
     def test_submit_for_review(self, mock_ncm):
         ModerationRequest.objects.create(
-            version=self.pg1_version,
+            version=self.version1,
             language="en",
             collection=self.collection1,
             author=self.collection1.author,
         )
         ModerationRequest.objects.create(
-            version=self.pg3_version,
+            version=self.version2,
             language="en",
             collection=self.collection1,
             author=self.collection1.author,
@@ -656,13 +756,13 @@ class ModerationCollectionTest(BaseTestCase):
 
     def test_cancel(self):
         active_request = ModerationRequest.objects.create(
-            version=self.pg1_version,
+            version=self.version1,
             collection=self.collection1,
             is_active=True,
             author=self.collection1.author,
         )
         ModerationRequest.objects.create(
-            version=self.pg3_version,
+            version=self.version2,
             collection=self.collection1,
             is_active=False,
             author=self.collection1.author,
@@ -689,6 +789,8 @@ class AddVersionTestCase(AssertQueryMixin, TestCase):
 
     def setUp(self):
         self.collection = factories.ModerationCollectionFactory()
+        # The nodes of the requests, without the roots of the collections
+        self.nodes = ModerationRequestTreeNode.objects.filter(depth__gt=1)
 
     def test_add_version_as_parent(self):
         version = factories.PollVersionFactory()
@@ -698,9 +800,9 @@ class AddVersionTestCase(AssertQueryMixin, TestCase):
         self.assertEqual(ModerationRequest.objects.all().count(), 1)
         self.assertEqual(ModerationRequest.objects.get(), moderation_request)
         self.assertEqual(moderation_request.version, version)
-        self.assertEqual(ModerationRequestTreeNode.objects.all().count(), 1)
+        self.assertEqual(self.nodes.all().count(), 1)
         self.assertEqual(
-            ModerationRequestTreeNode.objects.get().moderation_request,
+            self.nodes.get().moderation_request,
             moderation_request
         )
         self.assertEqual(added_items, 1)
@@ -718,9 +820,9 @@ class AddVersionTestCase(AssertQueryMixin, TestCase):
             moderation_request
         )
         self.assertEqual(moderation_request.version, version)
-        self.assertEqual(ModerationRequestTreeNode.objects.all().count(), 2)
+        self.assertEqual(self.nodes.all().count(), 2)
         self.assertEqual(
-            ModerationRequestTreeNode.objects.exclude(pk=parent.pk).get().moderation_request,
+            self.nodes.exclude(pk=parent.pk).get().moderation_request,
             moderation_request
         )
         self.assertEqual(added_items, 1)
@@ -744,9 +846,9 @@ class AddVersionTestCase(AssertQueryMixin, TestCase):
             [parent.moderation_request.pk, child.moderation_request.pk],
             transform=lambda o: o.pk
         )
-        self.assertEqual(ModerationRequestTreeNode.objects.all().count(), 2)
+        self.assertEqual(self.nodes.all().count(), 2)
         self.assertQuerySetEqual(
-            ModerationRequestTreeNode.objects.all(),
+            self.nodes.all(),
             [parent.pk, child.pk],
             transform=lambda o: o.pk
         )
@@ -773,12 +875,12 @@ class AddVersionTestCase(AssertQueryMixin, TestCase):
             [root.moderation_request.pk, child.moderation_request.pk, parent.moderation_request.pk],
             transform=lambda o: o.pk
         )
-        all_nodes = ModerationRequestTreeNode.objects.all()
+        all_nodes = self.nodes.all()
         self.assertEqual(all_nodes.count(), 4)
         self.assertIn(parent, all_nodes)
         self.assertIn(child, all_nodes)
         self.assertIn(root, all_nodes)
-        added_node = ModerationRequestTreeNode.objects.exclude(
+        added_node = self.nodes.exclude(
             pk__in=[child.pk, parent.pk, root.pk]).get()
         self.assertEqual(added_node.moderation_request, child.moderation_request)
         self.assertEqual(added_items, 0)
@@ -796,7 +898,169 @@ class AddVersionTestCase(AssertQueryMixin, TestCase):
 
         self.assertEqual(ModerationRequest.objects.all().count(), 1)
         self.assertEqual(ModerationRequest.objects.get(), parent.moderation_request)
-        self.assertEqual(ModerationRequestTreeNode.objects.all().count(), 1)
-        self.assertEqual(ModerationRequestTreeNode.objects.get(), parent)
+        self.assertEqual(self.nodes.all().count(), 1)
+        self.assertEqual(self.nodes.get(), parent)
         self.assertEqual(added_items, 0)
         self.assertEqual(moderation_request, parent.moderation_request)
+
+
+class AddVersionsTestCase(AssertQueryMixin, TestCase):
+
+    def setUp(self):
+        self.collection = factories.ModerationCollectionFactory()
+        # The nodes of the requests, without the roots of the collections
+        self.nodes = ModerationRequestTreeNode.objects.filter(depth__gt=1)
+
+    def test_add_versions_as_roots(self):
+        existing_root = factories.RootModerationRequestTreeNodeFactory(
+            moderation_request__collection=self.collection)
+        versions = [factories.PollVersionFactory() for _ in range(3)]
+
+        added_items = self.collection.add_versions(versions)
+
+        self.assertEqual(added_items, 3)
+        moderation_requests = self.collection.moderation_requests.filter(version__in=versions)
+        self.assertQuerySetEqual(
+            moderation_requests,
+            [version.pk for version in versions],
+            transform=lambda o: o.version_id,
+            ordered=False,
+        )
+        for moderation_request in moderation_requests:
+            self.assertEqual(moderation_request.author, self.collection.author)
+        root_nodes = self.collection.get_root_nodes()
+        self.assertEqual(root_nodes.count(), 4)
+        # New roots are added after the existing ones, in the given order
+        self.assertEqual(root_nodes.first(), existing_root)
+        self.assertEqual(
+            [node.moderation_request.version for node in root_nodes[1:]],
+            versions,
+        )
+        # The tree is still consistent, so single inserts keep working
+        moderation_request, added_items = self.collection.add_version(
+            factories.PollVersionFactory()
+        )
+        self.assertEqual(root_nodes.last().moderation_request, moderation_request)
+
+    def test_add_versions_skips_versions_already_added(self):
+        version = factories.PollVersionFactory()
+        parent = factories.RootModerationRequestTreeNodeFactory(
+            moderation_request__collection=self.collection,
+            moderation_request__version=version
+        )
+        new_version = factories.PollVersionFactory()
+
+        added_items = self.collection.add_versions([version, new_version])
+
+        self.assertEqual(added_items, 1)
+        self.assertEqual(ModerationRequest.objects.count(), 2)
+        self.assertEqual(self.nodes.count(), 2)
+        self.assertEqual(
+            self.nodes.filter(
+                moderation_request=parent.moderation_request
+            ).get(),
+            parent,
+        )
+
+    def test_add_versions_adds_root_for_request_only_present_as_child(self):
+        version = factories.PollVersionFactory()
+        parent = factories.RootModerationRequestTreeNodeFactory(
+            moderation_request__collection=self.collection)
+        child = factories.ChildModerationRequestTreeNodeFactory(
+            parent=parent,
+            moderation_request__version=version,
+            moderation_request__collection=self.collection
+        )
+
+        added_items = self.collection.add_versions([version])
+
+        self.assertEqual(added_items, 0)
+        self.assertEqual(
+            self.collection.get_root_nodes().filter(
+                moderation_request=child.moderation_request
+            ).count(),
+            1,
+        )
+
+    def test_add_versions_copies_the_content_fields(self):
+        versions = [factories.PollVersionFactory() for _ in range(2)]
+
+        # Without their content, which is fetched at once
+        self.collection.add_versions(Version.objects.filter(pk__in=[version.pk for version in versions]))
+
+        self.assertQuerySetEqual(
+            self.collection.moderation_requests.order_by("version"),
+            [(str(version.content), version.content_type_id, str(version.number)) for version in versions],
+            transform=lambda mr: (mr.title, mr.content_type_id, mr.version_number),
+        )
+
+    def test_add_versions_query_count_does_not_depend_on_number_of_versions(self):
+        versions = [factories.PollVersionFactory() for _ in range(7)]
+        # The first versions added create the root node of the collection
+        self.collection.add_versions(versions[:1])
+
+        with self.assertNumQueries(11):
+            self.collection.add_versions(versions[1:3])
+        with self.assertNumQueries(11):
+            self.collection.add_versions(versions[3:])
+
+    def test_add_versions_ignores_duplicates(self):
+        version = factories.PollVersionFactory()
+
+        added_items = self.collection.add_versions([version, version])
+
+        self.assertEqual(added_items, 1)
+        self.assertEqual(self.nodes.count(), 1)
+
+    def test_add_versions_skips_versions_with_an_active_request_elsewhere(self):
+        versions = [factories.PollVersionFactory() for _ in range(2)]
+        # Added to another collection after the versions were validated
+        factories.ModerationRequestFactory(version=versions[0], is_active=True)
+
+        added_items = self.collection.add_versions(versions)
+
+        self.assertEqual(added_items, 1)
+        self.assertEqual(
+            [node.moderation_request.version for node in self.collection.get_root_nodes()],
+            versions[1:],
+        )
+
+    def test_add_versions_includes_children_of_the_given_versions(self):
+        versions = [factories.PollVersionFactory() for _ in range(2)]
+
+        with patch.object(
+            ModerationCollection, "_add_nested_children", return_value=0
+        ) as add_nested_children:
+            self.collection.add_versions(versions, include_children={versions[1].pk})
+
+        [(version, _), _kwargs] = add_nested_children.call_args
+        self.assertEqual(add_nested_children.call_count, 1)
+        self.assertEqual(version, versions[1])
+
+    def test_collections_have_separate_trees(self):
+        other_collection = factories.ModerationCollectionFactory()
+        other_collection.add_versions([factories.PollVersionFactory() for _ in range(2)])
+        versions = [factories.PollVersionFactory() for _ in range(2)]
+
+        self.collection.add_versions(versions[:1])
+        self.collection.add_version(versions[1])
+
+        root = ModerationRequestTreeNode.get_collection_root(self.collection.pk)
+        other_root = ModerationRequestTreeNode.get_collection_root(other_collection.pk)
+        self.assertEqual(ModerationRequestTreeNode.get_root_nodes().count(), 2)
+        self.assertEqual(root.get_children_count(), 2)
+        self.assertEqual(
+            [node.moderation_request.version for node in root.get_children()],
+            versions,
+        )
+        self.assertEqual(
+            list(self.collection.get_root_nodes()), list(root.get_children())
+        )
+        self.assertEqual(other_root.get_children_count(), 2)
+        self.assertEqual(
+            set(other_root.get_children().values_list("collection", flat=True)),
+            {other_collection.pk},
+        )
+
+    def test_add_versions_with_no_versions(self):
+        self.assertEqual(self.collection.add_versions([]), 0)
@@ -0,0 +1,165 @@
+from datetime import date, datetime, timedelta, timezone
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+
+from djangocms_moderation import constants
+from djangocms_moderation.models import (
+    ModerationRequestAction,
+    WorkflowRollup,
+    WorkflowStepRollup,
+)
+from djangocms_moderation.rollups import rebuild_rollups, update_rollups
+
+from .utils import factories
+from .utils.base import BaseTestCase
+
+
+SUBMITTED = datetime(2026, 3, 10, 9, tzinfo=timezone.utc)
+
+
+class RollupsTestCase(BaseTestCase):
+    def setUp(self):
+        self.workflow = factories.WorkflowFactory()
+        self.step1 = self.workflow.steps.create(role=self.role1, is_required=True, order=1)
+        self.step2 = self.workflow.steps.create(role=self.role2, is_required=True, order=2)
+        collection = factories.ModerationCollectionFactory(
+            author=self.user, workflow=self.workflow, status=constants.IN_REVIEW
+        )
+        self.moderation_request = factories.ModerationRequestFactory(collection=collection)
+
+    def _act(self, action, hours, step=None):
+        action = ModerationRequestAction.objects.create(
+            moderation_request=self.moderation_request,
+            action=action,
+            by_user=self.user,
+            step_approved=step,
+        )
+        ModerationRequestAction.objects.filter(pk=action.pk).update(
+            date_taken=SUBMITTED + timedelta(hours=hours)
+        )
+        return action
+
+    def _review(self):
+        self._act(constants.ACTION_STARTED, 0)
+        self._act(constants.ACTION_APPROVED, 1, self.step1)
+        self._act(constants.ACTION_REJECTED, 3)
+        self._act(constants.ACTION_RESUBMITTED, 4)
+        self._act(constants.ACTION_APPROVED, 5, self.step1)
+
+    def _get_rollups(self):
+        workflow = WorkflowRollup.objects.get(workflow=self.workflow)
+        steps = WorkflowStepRollup.objects.filter(step__workflow=self.workflow).order_by("step__order")
+        return (
+            (
+                workflow.month,
+                workflow.submitted,
+                workflow.first_reviews,
+                workflow.first_review_seconds,
+                workflow.rejected,
+                workflow.resubmitted,
+            ),
+            [(rollup.step_id, rollup.approvals, rollup.seconds) for rollup in steps],
+        )
+
+    def test_rollups_add_up_the_actions_by_workflow_step_and_month(self):
+        self._review()
+
+        update_rollups()
+
+        self.assertEqual(
+            self._get_rollups(),
+            ((date(2026, 3, 1), 1, 1, 3600, 1, 1), [(self.step1.pk, 2, 7200)]),
+        )
+        rollup = WorkflowRollup.objects.get(workflow=self.workflow)
+        self.assertEqual(rollup.average_first_review, timedelta(hours=1))
+        self.assertEqual(rollup.rework_rate, 1)
+
+    def test_rollups_without_window_functions(self):
+        self._review()
+
+        with mock.patch.object(connection.features, "supports_over_clause", False):
+            update_rollups()
+
+        self.assertEqual(
+            self._get_rollups(),
+            ((date(2026, 3, 1), 1, 1, 3600, 1, 1), [(self.step1.pk, 2, 7200)]),
+        )
+
+    def test_rollups_only_add_up_the_new_actions(self):
+        self._act(constants.ACTION_STARTED, 0)
+        self._act(constants.ACTION_APPROVED, 1, self.step1)
+        update_rollups()
+
+        self._act(constants.ACTION_APPROVED, 3, self.step2)
+        # Whatever the number of earlier actions
+        with self.assertNumQueries(12):
+            self.assertEqual(update_rollups(), 1)
+        self.assertEqual(update_rollups(), 0)
+
+        self.assertEqual(
+            self._get_rollups(),
+            (
+                (date(2026, 3, 1), 1, 1, 3600, 0, 0),
+                [(self.step1.pk, 1, 3600), (self.step2.pk, 1, 7200)],
+            ),
+        )
+
+    def test_rollups_are_added_up_in_batches(self):
+        self._review()
+
+        self.assertGreater(update_rollups(batch_size=2), 5)
+
+        self.assertEqual(
+            self._get_rollups(),
+            ((date(2026, 3, 1), 1, 1, 3600, 1, 1), [(self.step1.pk, 2, 7200)]),
+        )
+
+    def test_recent_actions_are_left_to_the_next_update(self):
+        update_rollups()
+        ModerationRequestAction.objects.create(
+            moderation_request=self.moderation_request,
+            action=constants.ACTION_STARTED,
+            by_user=self.user,
+        )
+
+        self.assertEqual(update_rollups(settle_seconds=60), 0)
+        self.assertEqual(update_rollups(), 1)
+
+    def test_rebuild(self):
+        self._review()
+        update_rollups()
+
+        rebuild_rollups()
+
+        self.assertFalse(WorkflowRollup.objects.exists())
+        update_rollups()
+        self.assertEqual(WorkflowRollup.objects.get(workflow=self.workflow).submitted, 1)
+
+    def test_command(self):
+        self._review()
+        stdout = StringIO()
+
+        call_command("moderation_rollups", "--settle-seconds", "0", stdout=stdout)
+        call_command("moderation_rollups", "--rebuild", "--settle-seconds", "0", stdout=stdout)
+
+        self.assertIn("Actions added to the rollups:", stdout.getvalue())
+        self.assertEqual(WorkflowRollup.objects.get(workflow=self.workflow).submitted, 1)
+
+    def test_admin_reports(self):
+        self._review()
+        update_rollups()
+
+        with self.login_user_context(self.user):
+            workflows = self.client.get(reverse("admin:djangocms_moderation_workflowrollup_changelist"))
+            steps = self.client.get(reverse("admin:djangocms_moderation_workflowsteprollup_changelist"))
+
+        self.assertContains(workflows, "2026-03")
+        self.assertContains(workflows, "1:00:00")
+        self.assertContains(workflows, "100%")
+        self.assertContains(
+            steps, '<td class="field-approvals">2</td><td class="field-get_average_time">1:00:00</td>'
+        )
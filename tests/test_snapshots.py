@@ -0,0 +1,104 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import reverse
+
+from djangocms_moderation import constants, signals, snapshots
+from djangocms_moderation.models import ModerationCollection
+from djangocms_moderation.snapshots import get_preview_snapshot, store_preview_snapshots
+
+from .utils import factories
+from .utils.base import BaseTestCase
+
+
+@mock.patch("djangocms_moderation.conf.PREVIEW_SNAPSHOTS", True)
+class PreviewSnapshotTestCase(BaseTestCase):
+    def setUp(self):
+        cache.clear()
+        self.collection = factories.ModerationCollectionFactory(author=self.user, workflow=self.wf1)
+        self.version = factories.PageVersionFactory(content__language="en")
+        self.collection.add_version(self.version)
+        self.url = reverse("admin:cms_moderation_preview_snapshot", args=(self.version.pk,))
+
+    def _submit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.collection.submit_for_review(by_user=self.user)
+
+    @mock.patch.object(snapshots, "render_content", return_value="<p>Snapshot</p>")
+    def test_snapshots_are_rendered_on_submission(self, render_content):
+        self._submit()
+
+        self.assertEqual(get_preview_snapshot(self.version.pk), "<p>Snapshot</p>")
+        [(request, content), _kwargs] = render_content.call_args
+        self.assertEqual(content, self.version.content)
+        self.assertEqual(request.user, self.user)
+
+        with self.login_user_context(self.user2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.content, b"<p>Snapshot</p>")
+
+    @mock.patch.object(snapshots, "render_content", return_value="<p>Snapshot</p>")
+    def test_snapshots_are_optional(self, render_content):
+        with mock.patch("djangocms_moderation.conf.PREVIEW_SNAPSHOTS", False):
+            self._submit()
+
+        render_content.assert_not_called()
+        self.assertIsNone(get_preview_snapshot(self.version.pk))
+
+    @mock.patch.object(snapshots, "render_content", return_value="<p>Snapshot</p>")
+    def test_snapshot_is_deleted_on_rejection_and_rendered_on_resubmission(self, render_content):
+        self._submit()
+        moderation_request = self.collection.moderation_requests.get()
+
+        moderation_request.update_status(constants.ACTION_REJECTED, self.user2)
+        self.assertIsNone(get_preview_snapshot(self.version.pk))
+
+        render_content.return_value = "<p>Changed</p>"
+        with self.captureOnCommitCallbacks(execute=True):
+            moderation_request.update_status(constants.ACTION_RESUBMITTED, self.user)
+            signals.submitted_for_review.send(
+                sender=ModerationCollection,
+                collection=self.collection,
+                moderation_requests=[moderation_request],
+                user=self.user,
+                rework=True,
+            )
+        self.assertEqual(get_preview_snapshot(self.version.pk), "<p>Changed</p>")
+
+    @mock.patch.object(snapshots, "render_content", side_effect=ValueError)
+    def test_versions_which_cannot_be_rendered_have_no_snapshot(self, render_content):
+        with self.assertLogs("djangocms_moderation.snapshots", "ERROR"):
+            stored = store_preview_snapshots([self.version], self.user)
+
+        self.assertEqual(stored, [])
+        self.assertIsNone(get_preview_snapshot(self.version.pk))
+
+    def test_versions_without_preview_are_skipped(self):
+        version = factories.PollVersionFactory()
+
+        self.assertEqual(store_preview_snapshots([version], self.user), [])
+
+    def test_snapshot_is_rendered_without_toolbar(self):
+        response = HttpResponse("<p>Page</p>")
+        with mock.patch("cms.views.render_object_preview", return_value=response) as render:
+            self.assertEqual(store_preview_snapshots([self.version], self.user), [self.version.pk])
+
+        [(request, *_args), _kwargs] = render.call_args
+        self.assertFalse(request.toolbar.show_toolbar)
+        self.assertEqual(request.LANGUAGE_CODE, "en")
+
+    def test_preview_without_snapshot_redirects_to_the_preview(self):
+        with self.login_user_context(self.user):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(f"/{self.version.content.pk}/", response["Location"])
+
+    def test_preview_of_a_version_not_in_moderation(self):
+        url = reverse("admin:cms_moderation_preview_snapshot", args=(factories.PageVersionFactory().pk,))
+
+        with self.login_user_context(self.user):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,128 @@
+from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+
+from djangocms_moderation import constants
+from djangocms_moderation.instrumentation import track_queries
+from djangocms_moderation.models import (
+    ModerationCollection,
+    ModerationRequest,
+    ModerationRequestAction,
+)
+from djangocms_moderation.state import get_active_requests, get_etag, parse_object_key
+
+from .utils import factories
+from .utils.base import BaseTestCase
+
+
+class ModerationStateTestCase(BaseTestCase):
+    def setUp(self):
+        self.url = reverse("admin:cms_moderation_state")
+        self.version = self.moderation_request1.version
+        self.moderation_request1.actions.create(by_user=self.user, action=constants.ACTION_STARTED)
+
+    def _generation(self):
+        return ModerationCollection.objects.get(pk=self.collection1.pk).generation
+
+    def _request_generation(self):
+        return ModerationRequest.objects.get(pk=self.moderation_request1.pk).generation
+
+    def _get(self, **headers):
+        return self.client.get(self.url, {"version": self.version.pk}, headers=headers)
+
+    def test_generation_is_bumped_on_changes(self):
+        generation = self._generation()
+
+        # Actions only bump the generation of their request
+        self.moderation_request1.update_status(constants.ACTION_APPROVED, self.user)
+        self.assertEqual(self._request_generation(), 1)
+        self.assertEqual(self._generation(), generation)
+
+        self.collection1.add_version(factories.PollVersionFactory())
+        self.assertEqual(self._generation(), generation + 1)
+
+        self.collection1.name = "Renamed"
+        self.collection1.save()
+        self.assertEqual(self._generation(), generation + 2)
+        # Saving a stale instance doesn't take the generation back
+        self.collection1.save()
+        self.assertEqual(self._generation(), generation + 3)
+
+    def test_parse_object_key(self):
+        self.assertEqual(parse_object_key("3:12"), (3, 12))
+        for value in ("3", "a:12", "3:"):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_object_key(value)
+
+    def test_get_etag_does_not_read_the_actions(self):
+        requests = get_active_requests([self.version.pk])
+
+        with track_queries() as stats:
+            etag = get_etag(requests)
+
+        self.assertEqual(stats.count, 1)
+        self.assertNotIn(ModerationRequestAction._meta.db_table, "".join(stats.fingerprints))
+
+        self.moderation_request1.update_status(constants.ACTION_APPROVED, self.user)
+        self.assertNotEqual(get_etag(requests), etag)
+
+    def test_state(self):
+        with self.login_user_context(self.user):
+            response = self._get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header("ETag"))
+        # The date of the state may go back when a request leaves it
+        self.assertFalse(response.has_header("Last-Modified"))
+        self.assertEqual(
+            response.json()["versions"],
+            {
+                str(self.version.pk): {
+                    "request": self.moderation_request1.pk,
+                    "collection": self.collection1.pk,
+                    "collection_status": self.collection1.status,
+                    "compliance_number": None,
+                    "last_action": constants.ACTION_STARTED,
+                    "is_approved": False,
+                }
+            },
+        )
+
+    def test_state_of_content_objects(self):
+        content_type = ContentType.objects.get_for_model(self.version.content)
+        key = f"{content_type.pk}:{self.version.object_id}"
+
+        with self.login_user_context(self.user):
+            response = self.client.get(self.url, {"object": f"{key},{content_type.pk}:0"})
+
+        self.assertEqual(response.json()["objects"], {key: self.version.pk})
+
+    def test_unchanged_state_is_not_modified(self):
+        with self.login_user_context(self.user):
+            etag = self._get()["ETag"]
+            with track_queries() as stats:
+                response = self._get(if_none_match=etag)
+
+            self.assertEqual(response.status_code, 304)
+            action_table = ModerationRequestAction._meta.db_table
+            self.assertNotIn(action_table, "".join(stats.fingerprints))
+
+            self.moderation_request1.update_status(constants.ACTION_APPROVED, self.user)
+            response = self._get(if_none_match=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(
+            response.json()["versions"][str(self.version.pk)]["last_action"], constants.ACTION_APPROVED
+        )
+
+    def test_invalid_parameters(self):
+        with self.login_user_context(self.user):
+            self.assertEqual(self.client.get(self.url, {"version": "a"}).status_code, 400)
+            self.assertEqual(self.client.get(self.url, {"object": "1"}).status_code, 400)
+            response = self.client.get(self.url, {"version": ",".join(["1"] * 201)})
+            self.assertEqual(response.status_code, 400)
+
+    def test_requires_the_view_permission(self):
+        self.client.force_login(factories.UserFactory(is_staff=True))
+
+        self.assertEqual(self._get().status_code, 403)
@@ -0,0 +1,79 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from djangocms_moderation import constants
+from djangocms_moderation.models import ModerationCollection
+from djangocms_moderation.stats import get_cached_moderation_stats, get_moderation_stats
+
+from .utils.base import BaseTestCase
+
+
+class ModerationStatsTestCase(BaseTestCase):
+    def setUp(self):
+        cache.clear()
+        ModerationCollection.objects.filter(
+            pk__in=[self.collection1.pk, self.collection2.pk, self.collection3.pk]
+        ).update(status=constants.IN_REVIEW)
+
+    def test_get_moderation_stats(self):
+        with self.assertNumQueries(4):
+            stats = get_moderation_stats()
+
+        self.assertEqual(
+            stats["collections"],
+            {constants.COLLECTING: 1, constants.IN_REVIEW: 3, constants.ARCHIVED: 0, constants.CANCELLED: 0},
+        )
+        pending = stats["pending_requests"]
+        self.assertEqual(pending["total"], 4)
+        self.assertEqual(pending["rejected"], 1)
+        self.assertEqual(pending["awaiting_publishing"], 2)
+        self.assertEqual(
+            pending["oldest_date_sent"], self.moderation_request1.date_sent.isoformat()
+        )
+        self.assertGreaterEqual(pending["oldest_age_seconds"], 0)
+        self.assertEqual(
+            [(step["workflow"], step["step_id"], step["pending"], step["rejected"]) for step in stats["steps"]],
+            [("Workflow 1", self.wf1st1.pk, 1, 0), ("Workflow 3", self.wf3st1.pk, 1, 1)],
+        )
+        self.assertEqual(
+            stats["actions_last_24_hours"],
+            {constants.ACTION_STARTED: 5, constants.ACTION_APPROVED: 3, constants.ACTION_REJECTED: 1},
+        )
+
+    def test_get_cached_moderation_stats(self):
+        stats = get_cached_moderation_stats()
+        ModerationCollection.objects.filter(pk=self.collection4.pk).update(status=constants.IN_REVIEW)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cached_moderation_stats(), stats)
+
+        cache.clear()
+        self.assertEqual(get_cached_moderation_stats()["collections"][constants.IN_REVIEW], 4)
+
+    @mock.patch("djangocms_moderation.conf.STATS_CACHE_TIMEOUT", 0)
+    def test_cache_timeout(self):
+        get_cached_moderation_stats()
+        ModerationCollection.objects.filter(pk=self.collection4.pk).update(status=constants.IN_REVIEW)
+
+        self.assertEqual(get_cached_moderation_stats()["collections"][constants.IN_REVIEW], 4)
+
+    def test_stats_view(self):
+        url = reverse("admin:cms_moderation_stats")
+
+        with self.login_user_context(self.user):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["pending_requests"]["total"], 4)
+
+    def test_stats_view_is_staff_only(self):
+        self.user.is_staff = False
+        self.user.save()
+        url = reverse("admin:cms_moderation_stats")
+
+        with self.login_user_context(self.user):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 302)
@@ -1,3 +1,4 @@
+from django.http import Http404
 from django.test.client import RequestFactory
 
 from djangocms_versioning.test_utils.factories import PageVersionFactory
@@ -49,6 +50,39 @@ class UtilsTestCase(BaseTestCase):
         )
         self.assertEqual(action_id, "2")
 
+    def test_store_and_get_selection(self):
+        token = utils.store_selection(self.user, ["3", "1", "x", 2])
+        self.assertEqual(utils.get_selection(self.user, token), [3, 1, 2])
+        # A selection can only be read by the user who made it
+        self.assertIsNone(utils.get_selection(self.user2, token))
+        self.assertIsNone(utils.get_selection(self.user, "unknown"))
+        self.assertIsNone(utils.get_selection(self.user, None))
+
+    def test_get_selected_ids(self):
+        token = utils.store_selection(self.user, [5, 3, 5])
+        request = self.rf.get("/", {"selection": token})
+        request.user = self.user
+        self.assertEqual(utils.get_selected_ids(request), [3, 5])
+
+        # The legacy comma separated parameter is still understood
+        request = self.rf.get("/", {"ids": "4,2,a"})
+        request.user = self.user
+        self.assertEqual(utils.get_selected_ids(request), [2, 4])
+
+        request = self.rf.get("/", {"version_ids": "7"})
+        request.user = self.user
+        self.assertEqual(utils.get_selected_ids(request, legacy_param="version_ids"), [7])
+
+        # Expired or unknown selections are not found
+        request = self.rf.get("/", {"selection": "expired"})
+        request.user = self.user
+        with self.assertRaises(Http404):
+            utils.get_selected_ids(request)
+
+    def test_chunked(self):
+        self.assertEqual(list(utils.chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(utils.chunked([], 2)), [])
+
     def test_get_active_moderation_request(self):
         self.assertEqual(
             self.moderation_request1,
@@ -10,6 +10,7 @@ from cms.utils.urlutils import add_url_parameters, admin_reverse
 
 from djangocms_versioning.test_utils.factories import PageVersionFactory
 
+from djangocms_moderation import constants
 from djangocms_moderation.models import (
     ModerationCollection,
     ModerationRequest,
@@ -70,7 +71,7 @@ class CollectionItemsViewAddingRequestsTestCase(CMSTestCase):
         self.assertIn("versions", response.context["form"].errors)
         # No new nodes were created on validation error
         self.assertEqual(ModerationRequest.objects.all().count(), 1)
-        self.assertEqual(ModerationRequestTreeNode.objects.all().count(), 1)
+        self.assertEqual(ModerationRequestTreeNode.objects.filter(collection=collection).count(), 0)
 
     def test_add_items_to_collection_no_return_url_set(self):
         user = self.get_superuser()
@@ -521,6 +522,27 @@ class CollectionItemsViewAddingRequestsTestCase(CMSTestCase):
         )
         self.assertEqual(stored_collection.filter(version=poll_version).count(), 1)
 
+    def test_adding_items_keeps_the_selection_order(self):
+        user = self.get_superuser()
+        collection = ModerationCollectionFactory(author=user)
+        poll_version = PollVersionFactory(created_by=user)
+        page_version = PageVersionFactory(created_by=user)
+        url = add_url_parameters(
+            get_admin_url(name="cms_moderation_items_to_collection", language="en", args=()),
+            collection_id=collection.pk,
+        )
+
+        with self.login_user_context(user):
+            self.client.post(
+                path=url,
+                data={"collection": collection.pk, "versions": [poll_version.pk, page_version.pk]},
+            )
+
+        self.assertEqual(
+            [node.moderation_request.version for node in collection.get_root_nodes()],
+            [poll_version, page_version],
+        )
+
     def test_adding_page_not_by_the_author_doesnt_trigger_nested_collection_mechanism(
         self
     ):
@@ -546,7 +568,8 @@ class CollectionItemsViewAddingRequestsTestCase(CMSTestCase):
             collection_id=collection.pk,
         )
         with self.login_user_context(user), mock.patch(
-            "djangocms_moderation.forms.is_obj_version_unlocked"
+            "djangocms_moderation.helpers.get_unlocked_version_ids",
+            return_value={page_version.pk},
         ):
             response = self.client.post(
                 path=url,
@@ -571,7 +594,7 @@ class CollectionItemsViewAddingRequestsTestCase(CMSTestCase):
         )
         self.assertEqual(mr1.count(), 0)
         self.assertEqual(
-            ModerationRequestTreeNode.objects.filter(moderation_request=mr1.first()).count(), 0
+            ModerationRequestTreeNode.objects.filter(moderation_request__in=mr1).count(), 0
         )
 
     def test_collection_with_redirect_url_query_redirect_sanitisation(self):
@@ -862,7 +885,7 @@ class CollectionItemsViewTest(AssertQueryMixin, CMSTestCase):
         self.assertEqual(nodes.count(), 6)
         # Now assert the tree structure...
         # Check root refers to correct version & has correct number of children
-        root = ModerationRequestTreeNode.get_root_nodes().get()
+        root = collection.get_root_nodes().get()
         self.assertEqual(root.moderation_request.version, page_version)
         self.assertEqual(root.get_children().count(), 2)
         # Check first child of root has correct tree
@@ -929,6 +952,48 @@ class CancelCollectionViewTest(BaseViewTestCase):
         self.assertEqual(self.collection_change_list_url, response.url)
 
 
+class ReviewerInboxViewTest(BaseViewTestCase):
+    def setUp(self):
+        super().setUp()
+        ModerationCollection.objects.update(status=constants.IN_REVIEW)
+        self.url = reverse("admin:cms_moderation_reviewer_inbox")
+
+    def test_lists_requests_awaiting_the_user(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context["moderation_requests"], [self.moderation_request1, self.moderation_request5]
+        )
+        collection_url = "{}?moderation_request__collection__id={}".format(
+            reverse("admin:djangocms_moderation_moderationrequest_changelist"), self.collection1.pk,
+        )
+        self.assertContains(response, collection_url)
+        self.assertIsNone(response.context["next_url"])
+
+    @mock.patch("djangocms_moderation.views.ReviewerInbox.paginate_by", 1)
+    def test_keyset_pagination(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.context["moderation_requests"], [self.moderation_request1])
+        next_url = response.context["next_url"]
+        self.assertEqual(next_url, f"{self.url}?after={self.moderation_request1.pk}")
+
+        response = self.client.get(next_url)
+
+        self.assertEqual(response.context["moderation_requests"], [self.moderation_request5])
+        self.assertIsNone(response.context["next_url"])
+        self.assertEqual(response.context["first_url"], self.url)
+
+    def test_empty_inbox(self):
+        self.client.force_login(self.user3)
+        ModerationCollection.objects.update(status=constants.COLLECTING)
+
+        response = self.client.get(self.url)
+
+        self.assertContains(response, "No requests are awaiting your review.")
+
+
 class ModerationRequestChangeListView(BaseViewTestCase):
     def setUp(self):
         super().setUp()
@@ -1023,7 +1088,7 @@ class TransactionCollectionItemsViewTestCase(TransactionTestCase):
 
         # Check neither the tree nodes nor the requests have been added.
         # The db transaction should have rolled back.
-        self.assertEqual(ModerationRequestTreeNode.objects.all().count(), 3)
+        self.assertEqual(ModerationRequestTreeNode.objects.filter(moderation_request__isnull=False).count(), 3)
         self.assertEqual(ModerationRequest.objects.all().count(), 2)
 
 
@@ -1093,7 +1158,7 @@ class CollectionItemsViewModerationIntegrationTest(CMSTestCase):
         # The correct amount of moderation requests has been created
         mr = ModerationRequest.objects.filter(collection=self.collection)
         # The tree structure for page_1_version is correct
-        root_1 = ModerationRequestTreeNode.get_root_nodes().get(moderation_request__version=self.page_1_version)
+        root_1 = self.collection.get_root_nodes().get(moderation_request__version=self.page_1_version)
         self.assertEqual(mr.count(), 4)
         # The correct amount of tree nodes has been created
         # Poll is repeated twice and will therefore have an additional node
@@ -1111,7 +1176,7 @@ class CollectionItemsViewModerationIntegrationTest(CMSTestCase):
             grandchild.moderation_request.version, self.poll_child_version)
 
         # The tree structure for page_2_version is correct
-        root_2 = ModerationRequestTreeNode.get_root_nodes().get(
+        root_2 = self.collection.get_root_nodes().get(
             moderation_request__version=self.page_2_version)
         self.assertEqual(root_2.get_children().count(), 1)
         child_2 = root_2.get_children().get()
@@ -1140,7 +1205,7 @@ class CollectionItemsViewModerationIntegrationTest(CMSTestCase):
         self._add_pages_to_collection()
 
         # Now remove page_2_version from the collection
-        page_2_root = ModerationRequestTreeNode.get_root_nodes().get(
+        page_2_root = self.collection.get_root_nodes().get(
             moderation_request__version=self.page_2_version)
         delete_url = "{}?ids={}&collection_id={}".format(
             reverse('admin:djangocms_moderation_moderationrequesttreenode_delete'),
@@ -1168,8 +1233,8 @@ class CollectionItemsViewModerationIntegrationTest(CMSTestCase):
             ModerationRequestTreeNode.objects.filter(moderation_request__collection=self.collection).count(),
             2
         )
-        self.assertEqual(ModerationRequestTreeNode.get_root_nodes().count(), 1)
-        root = ModerationRequestTreeNode.get_root_nodes().get()
+        self.assertEqual(self.collection.get_root_nodes().count(), 1)
+        root = self.collection.get_root_nodes().get()
         self.assertEqual(root.moderation_request.version, self.page_1_version)
         self.assertEqual(root.get_children().count(), 1)
         self.assertEqual(root.get_children().get().moderation_request.version, self.poll_version)
@@ -1195,7 +1260,7 @@ class CollectionItemsViewModerationIntegrationTest(CMSTestCase):
         self._add_pages_to_collection()
 
         # Now remove page_1_version from the collection
-        page_1_root = ModerationRequestTreeNode.get_root_nodes().get(
+        page_1_root = self.collection.get_root_nodes().get(
             moderation_request__version=self.page_1_version)
         delete_url = "{}?ids={}&collection_id={}".format(
             reverse('admin:djangocms_moderation_moderationrequesttreenode_delete'),
@@ -1223,8 +1288,8 @@ class CollectionItemsViewModerationIntegrationTest(CMSTestCase):
             ModerationRequestTreeNode.objects.filter(moderation_request__collection=self.collection).count(),
             1
         )
-        self.assertEqual(ModerationRequestTreeNode.get_root_nodes().count(), 1)
-        root = ModerationRequestTreeNode.get_root_nodes().get()
+        self.assertEqual(self.collection.get_root_nodes().count(), 1)
+        root = self.collection.get_root_nodes().get()
         self.assertEqual(root.moderation_request.version, self.page_2_version)
         self.assertEqual(root.get_children().count(), 0)
 
@@ -1250,7 +1315,7 @@ class CollectionItemsViewModerationIntegrationTest(CMSTestCase):
         self._add_pages_to_collection()
 
         # Now remove poll_version from the collection
-        page_1_root = ModerationRequestTreeNode.get_root_nodes().get(
+        page_1_root = self.collection.get_root_nodes().get(
             moderation_request__version=self.page_1_version)
         page_1_root_children = page_1_root.get_children()
         if page_1_root_children.count() > 0:
@@ -1279,7 +1344,7 @@ class CollectionItemsViewModerationIntegrationTest(CMSTestCase):
             ModerationRequestTreeNode.objects.filter(moderation_request__collection=self.collection).count(),
             2
         )
-        self.assertEqual(ModerationRequestTreeNode.get_root_nodes().count(), 2)
+        self.assertEqual(self.collection.get_root_nodes().count(), 2)
         self.assertEqual(
             ModerationRequestTreeNode.objects.filter(moderation_request__version=self.page_1_version).count(),
             1
@@ -1312,7 +1377,7 @@ class CollectionItemsViewModerationIntegrationTest(CMSTestCase):
         self._add_pages_to_collection()
 
         # Now remove poll_version from the collection
-        page_1_root = ModerationRequestTreeNode.get_root_nodes().get(
+        page_1_root = self.collection.get_root_nodes().get(
             moderation_request__version=self.page_1_version)
         page_1_root_children = page_1_root.get_children()
         if page_1_root_children.count() > 0:
@@ -1341,10 +1406,10 @@ class CollectionItemsViewModerationIntegrationTest(CMSTestCase):
             ModerationRequestTreeNode.objects.filter(moderation_request__collection=self.collection).count(),
             3
         )
-        self.assertEqual(ModerationRequestTreeNode.get_root_nodes().count(), 2)
-        root_1 = ModerationRequestTreeNode.get_root_nodes().filter(
+        self.assertEqual(self.collection.get_root_nodes().count(), 2)
+        root_1 = self.collection.get_root_nodes().filter(
             moderation_request__version=self.page_1_version).get()
-        root_2 = ModerationRequestTreeNode.get_root_nodes().filter(
+        root_2 = self.collection.get_root_nodes().filter(
             moderation_request__version=self.page_2_version).get()
         self.assertEqual(root_1.get_children().count(), 1)
         self.assertEqual(root_2.get_children().count(), 0)
@@ -1372,7 +1437,7 @@ class CollectionItemsViewModerationIntegrationTest(CMSTestCase):
         self._add_pages_to_collection()
 
         # Now remove poll_version from the collection
-        page_2_root = ModerationRequestTreeNode.get_root_nodes().get(
+        page_2_root = self.collection.get_root_nodes().get(
             moderation_request__version=self.page_2_version)
         page_2_root_children = page_2_root.get_children()
         if page_2_root_children.count() > 0:
@@ -1401,10 +1466,10 @@ class CollectionItemsViewModerationIntegrationTest(CMSTestCase):
             ModerationRequestTreeNode.objects.filter(moderation_request__collection=self.collection).count(),
             3
         )
-        self.assertEqual(ModerationRequestTreeNode.get_root_nodes().count(), 2)
-        root_1 = ModerationRequestTreeNode.get_root_nodes().filter(
+        self.assertEqual(self.collection.get_root_nodes().count(), 2)
+        root_1 = self.collection.get_root_nodes().filter(
             moderation_request__version=self.page_1_version).get()
-        root_2 = ModerationRequestTreeNode.get_root_nodes().filter(
+        root_2 = self.collection.get_root_nodes().filter(
             moderation_request__version=self.page_2_version).get()
 
         self.assertEqual(root_1.get_children().count(), 1)
@@ -1,4 +1,7 @@
+from contextlib import contextmanager
+
 from django.contrib.auth.models import Group, User
+from django.db import connection
 
 from cms.test_utils.testcases import CMSTestCase
 
@@ -7,6 +10,7 @@ from djangocms_versioning.test_utils.factories import PageVersionFactory
 
 from djangocms_moderation import constants
 from djangocms_moderation.compact import DJANGO_4_1
+from djangocms_moderation.instrumentation import track_queries
 from djangocms_moderation.models import (
     ModerationCollection,
     ModerationRequest,
@@ -19,6 +23,26 @@ class MockRequest:
     GET = {}
 
 
+def drop_indexes(model, *names):
+    """Drops the indexes and constraints `names` of `model`, or all of them,
+    in the current transaction. Rolling the transaction back restores them.
+    """
+    # Not entered as a context manager, which SQLite refuses inside a
+    # transaction; dropping indexes defers no SQL
+    schema_editor = connection.schema_editor()
+    schema_editor.deferred_sql = []
+    for index in model._meta.indexes + model._meta.constraints:
+        if names and index.name not in names:
+            continue
+        if index.condition is not None and not connection.features.supports_partial_indexes:
+            # Never created
+            continue
+        if index in model._meta.indexes:
+            schema_editor.remove_index(model, index)
+        else:
+            schema_editor.remove_constraint(model, index)
+
+
 class AssertQueryMixin:
     """Mixin to append uppercase `assertQuerySetEqual` for TestCase class
     if django version below 4.2
@@ -29,7 +53,32 @@ class AssertQueryMixin:
             return self.assertQuerySetEqual(*args, **kwargs)
 
 
-class BaseTestCase(CMSTestCase):
+class AssertQueryBudgetMixin:
+    """Mixin to check that a block of code stays within a query budget,
+    listing the duplicated queries when it does not
+    """
+
+    @contextmanager
+    def assertQueryBudget(self, max_queries, max_duplicates=None):
+        with track_queries() as stats:
+            yield stats
+        duplicates = "\n".join(
+            f"{count} x {sql}" for sql, count in sorted(
+                stats.duplicates.items(), key=lambda item: -item[1]
+            )
+        )
+        self.assertLessEqual(
+            stats.count, max_queries,
+            f"{stats.count} queries run, budget is {max_queries}. Duplicates:\n{duplicates}",
+        )
+        if max_duplicates is not None:
+            self.assertLessEqual(
+                stats.duplicate_count, max_duplicates,
+                f"{stats.duplicate_count} duplicate queries, budget is {max_duplicates}:\n{duplicates}",
+            )
+
+
+class BaseTestCase(AssertQueryBudgetMixin, CMSTestCase):
     @classmethod
     def setUpTestData(cls):
         # create workflows
@@ -174,18 +174,21 @@ class ModerationRequestFactory(DjangoModelFactory):
 
 class RootModerationRequestTreeNodeFactory(DjangoModelFactory):
     moderation_request = factory.SubFactory(ModerationRequestFactory)
+    collection = factory.SelfAttribute("moderation_request.collection")
 
     class Meta:
         model = ModerationRequestTreeNode
 
     @classmethod
     def _create(cls, model_class, *args, **kwargs):
-        """Make sure this is the root of a tree"""
-        return model_class.add_root(*args, **kwargs)
+        """Make sure this is at the top of the tree of the collection"""
+        root = model_class.get_collection_root(kwargs["collection"].pk)
+        return root.add_child(*args, **kwargs)
 
 
 class ChildModerationRequestTreeNodeFactory(DjangoModelFactory):
     moderation_request = factory.SubFactory(ModerationRequestFactory)
+    collection = factory.SelfAttribute("moderation_request.collection")
     parent = factory.SubFactory(RootModerationRequestTreeNodeFactory)
 
     class Meta: